@@ -1,8 +1,58 @@
+import hashlib
+import os
+from dataclasses import asdict, replace
+from functools import partial
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from april_sound import (
+    BUILDING_VALUE,
+    DEPRECIATION_RECAPTURE_RATE,
+    SELLING_COSTS,
+    STRATEGIES,
+    ResultCache,
+    ScenarioParams,
+    cap_rate_table,
+    fingerprint,
+    percentile_bands,
+    roi_table,
+    run_scenario,
+    simulate_paths,
+    snapshot,
+    tax_shield_table,
+    year_one_tax_example,
+)
+from april_sound.charts import (
+    add_breakdown_columns,
+    backtest_chart,
+    breakdown_chart,
+    exit_chart,
+    monte_carlo_chart,
+    monthly_chart,
+    portfolio_chart,
+    refurb_spend_chart,
+    sweep_animation,
+    tax_savings_chart,
+    wealth_band_chart,
+)
+from april_sound.backtest import backtest, backtest_summary, load_history
+from april_sound.breakeven import PAIRS, crossover_table, threshold_table
+from april_sound.comps import CompStore
+from april_sound.graph import SIMULATION_NODES, ModelGraph
+from april_sound.liquidation import exit_matrix, optimal_exits
+from april_sound.monthly import Financing, amortization_table, run_monthly
+from april_sound.optimizer import OBJECTIVES, UpliftCurve, optimize_refurb
+from april_sound.portfolio import evaluate_portfolio, load_properties, portfolio_totals, property_ranking
+from april_sound.prefetch import Prefetcher, neighbor_params
+from april_sound.profiler import RerunProfiler
+from april_sound.sampling import range_bands
+from april_sound.sensitivity import INPUT_RANGES, step_sweep, strategy_difference, sweep_grid, tornado
+from april_sound.valuation import CONDITION_GRADES, VIEW_GRADES, CompValuer
+
 # --- PAGE CONFIG ---
 st.set_page_config(
     page_title="144 April Point Investment Analysis",
@@ -11,6 +61,12 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# --- PROFILER ---
+# Opt-in per-section timings: add ?profile=1 to the URL or set APP_PROFILE=1
+profiler = RerunProfiler(
+    enabled=st.query_params.get("profile") == "1" or os.environ.get("APP_PROFILE") == "1"
+)
+
 # --- CUSTOM CSS ---
 st.markdown("""
 <style>
@@ -82,893 +138,1599 @@ st.subheader("144 April Point Dr S, Montgomery, TX")
 st.markdown("**1,824 sq. ft. Waterside Townhouse | April Sound Community**")
 st.markdown("---")
 
-# --- SIDEBAR: INTERACTIVE VARIABLES ---
-st.sidebar.header("📊 Market Assumptions")
-st.sidebar.markdown("*Adjust these to model different scenarios*")
-
-market_return = st.sidebar.slider(
-    "Market Portfolio Return (%)",
-    min_value=0.0, max_value=15.0, value=6.0, step=0.5,
-    help="Expected annual return if cash is invested in the stock market. Applies to sale proceeds (Sell scenarios) and reinvested rental income (Rent scenarios)."
-) / 100
-
-appreciation = st.sidebar.slider(
-    "Property Appreciation (%)",
-    min_value=0.0, max_value=15.0, value=3.0, step=0.5,
-    help="Expected annual increase in property value. Montgomery County 2025 data: Home assessments up 9% YoY, Lake Conroe median prices up 4.4% YoY. Homes under 500k saw 1.9% growth. Default of 3% is conservative for this price range."
-) / 100
-
-rent_growth = st.sidebar.slider(
-    "Annual Rent Growth (%)",
-    min_value=0.0, max_value=10.0, value=2.5, step=0.25,
-    help="Expected annual increase in rental rates. Conroe historical average: 4-6% annual growth typical. 2024-2025 saw -1% to -3% due to new apartment supply. Default of 2.5% is conservative given recent softness."
-) / 100
-
-vacancy_rate = st.sidebar.slider(
-    "Vacancy Rate (%)",
-    min_value=0.0, max_value=100.0, value=5.0, step=1.0,
-    help="Percentage of the year the property is expected to be vacant (no rental income). A 5% vacancy means ~18 days/year without a tenant."
-) / 100
+# --- COMPARABLES ---
+@st.cache_resource
+def get_comp_store():
+    """Comps loaded, typed and indexed once for every session."""
+    return CompStore.from_file()
 
-st.sidebar.markdown("---")
 
-# --- PROPERTY VALUE RANGES ---
-st.sidebar.header("🏠 Property Values (As-Is)")
-val_as_is_col = st.sidebar.columns(3)
-with val_as_is_col[0]:
-    val_as_is_low = st.number_input("$ Low", min_value=100000, max_value=500000, value=340000, step=5000, key="val_as_is_low")
-with val_as_is_col[1]:
-    val_as_is = st.number_input("$ Base", min_value=100000, max_value=500000, value=365000, step=5000, key="val_as_is")
-with val_as_is_col[2]:
-    val_as_is_high = st.number_input("$ High", min_value=100000, max_value=500000, value=390000, step=5000, key="val_as_is_high")
-
-st.sidebar.header("🏗️ Property Values (Refurbished)", help="Based on two identical open water view comps: 143 April Point Dr S sold Jan 2025 for $485k ($266/sq ft), and 137 April Point Dr S sold Oct 2023 for $510k ($280/sq ft). Both are 1,824 sq ft, 3/2.5, renovated with open water views.")
-val_refurb_col = st.sidebar.columns(3)
-with val_refurb_col[0]:
-    val_refurb_low = st.number_input("$ Low", min_value=200000, max_value=700000, value=485000, step=5000, key="val_refurb_low")
-with val_refurb_col[1]:
-    val_refurb = st.number_input("$ Base", min_value=200000, max_value=700000, value=495000, step=5000, key="val_refurb")
-with val_refurb_col[2]:
-    val_refurb_high = st.number_input("$ High", min_value=200000, max_value=700000, value=510000, step=5000, key="val_refurb_high")
+comp_store = get_comp_store()
 
-st.sidebar.markdown("---")
 
-# --- RENT RANGES ---
-st.sidebar.header("💵 Monthly Rent (As-Is)")
-rent_as_is_col = st.sidebar.columns(3)
-with rent_as_is_col[0]:
-    rent_as_is_low = st.number_input("$ Low", min_value=1000, max_value=5000, value=2350, step=50, key="rent_as_is_low")
-with rent_as_is_col[1]:
-    rent_as_is = st.number_input("$ Base", min_value=1000, max_value=5000, value=2550, step=50, key="rent_as_is")
-with rent_as_is_col[2]:
-    rent_as_is_high = st.number_input("$ High", min_value=1000, max_value=5000, value=2750, step=50, key="rent_as_is_high")
-
-st.sidebar.header("💵 Monthly Rent (Refurbished)", help="Based on 140 April Point Dr S ($1.73/sq ft, renovated, water view). No direct open water view rental comps exist - owners tend to sell rather than rent these premium units. Estimate assumes modest 5% view premium. Conservative given lack of direct comps.")
-rent_refurb_col = st.sidebar.columns(3)
-with rent_refurb_col[0]:
-    rent_refurb_low = st.number_input("$ Low", min_value=1500, max_value=6000, value=3200, step=50, key="rent_refurb_low")
-with rent_refurb_col[1]:
-    rent_refurb = st.number_input("$ Base", min_value=1500, max_value=6000, value=3350, step=50, key="rent_refurb")
-with rent_refurb_col[2]:
-    rent_refurb_high = st.number_input("$ High", min_value=1500, max_value=6000, value=3500, step=50, key="rent_refurb_high")
+@st.cache_resource
+def get_comp_valuer():
+    """k-d trees over the comps, built once for every session."""
+    return CompValuer(get_comp_store())
 
-st.sidebar.markdown("---")
 
-# --- REFURBISHMENT COST RANGE ---
-st.sidebar.header("🔧 Refurbishment Budget")
-refurb_col = st.sidebar.columns(3)
-with refurb_col[0]:
-    refurb_cost_low = st.number_input("$ Low", min_value=0, max_value=150000, value=50000, step=5000, key="refurb_low")
-with refurb_col[1]:
-    refurb_cost = st.number_input("$ Base", min_value=0, max_value=150000, value=60000, step=5000, key="refurb_base")
-with refurb_col[2]:
-    refurb_cost_high = st.number_input("$ High", min_value=0, max_value=150000, value=75000, step=5000, key="refurb_high")
+# Sidebar ranges the comps can prefill: comp kind, refurbished, and the input's step and bounds
+COMP_RANGE_INPUTS = {
+    "val_as_is": ("sale", False, 5000, 100000, 500000),
+    "val_refurb": ("sale", True, 5000, 200000, 700000),
+    "rent_as_is": ("rental", False, 50, 1000, 5000),
+    "rent_refurb": ("rental", True, 50, 1500, 6000),
+}
 
-st.sidebar.markdown("---")
-st.sidebar.header("💰 Expense Assumptions")
-
-property_tax_rate = st.sidebar.slider(
-    "Property Tax Rate (%)",
-    min_value=0.5, max_value=3.0, value=1.2, step=0.1,
-    help="Annual property tax as % of property value"
-) / 100
-
-maintenance_rate = st.sidebar.slider(
-    "Maintenance Reserve (%)",
-    min_value=0.0, max_value=3.0, value=1.0, step=0.25,
-    help="Annual maintenance/repairs as % of property value"
-) / 100
-
-hoa_annual = st.sidebar.number_input(
-    "$ HOA + Social Fees (/year)",
-    min_value=0, max_value=10000, value=2000, step=100,
-    help="Annual POA and social club fees"
-)
 
-st.sidebar.markdown("---")
-st.sidebar.header("👤 Management Options")
+def comp_ranges(sqft, beds, baths, condition, view):
+    """Comp-estimated (low, base, high) for each COMP_RANGE_INPUTS key, on its input's step and bounds."""
+    valuer = get_comp_valuer()
+    ranges = {}
+    for key, (kind, refurbished, step, low, high) in COMP_RANGE_INPUTS.items():
+        estimate = valuer.estimate(kind, sqft, beds, baths, "Renovated" if refurbished else condition, view)
+        ranges[key] = tuple(int(min(max(round(x / step) * step, low), high)) for x in estimate)
+    return ranges
 
-self_managed = st.sidebar.checkbox(
-    "Self-Manage Property",
-    value=True,
-    help="If unchecked, 10% of gross rent goes to property manager"
-)
 
-management_fee = 0.0 if self_managed else 0.10
+# Defaults of the low/base/high inputs, seeded into session state so prefill_ranges can overwrite them
+RANGE_DEFAULTS = {
+    "val_as_is_low": 340000, "val_as_is": 365000, "val_as_is_high": 390000,
+    "val_refurb_low": 485000, "val_refurb": 495000, "val_refurb_high": 510000,
+    "rent_as_is_low": 2350, "rent_as_is": 2550, "rent_as_is_high": 2750,
+    "rent_refurb_low": 3200, "rent_refurb": 3350, "rent_refurb_high": 3500,
+}
 
-st.sidebar.markdown("---")
-st.sidebar.header("🏛️ Tax Assumptions")
-
-income_tax_rate = st.sidebar.slider(
-    "Marginal Income Tax Rate (%)",
-    min_value=10, max_value=37, value=22, step=1,
-    help="Federal marginal tax rate on rental income (22% is common)"
-) / 100
-
-cap_gains_tax = st.sidebar.slider(
-    "Capital Gains Tax Rate (%)",
-    min_value=0, max_value=25, value=15, step=1,
-    help="Federal long-term capital gains rate (0%, 15%, or 20% typical). NOTE: This rate is for reference only. The model assumes no capital gains tax on the property sale because: (1) Primary Residence Exemption - if you lived in the home 2 of the last 5 years, you can exclude up to 250k (single) or 500k (married) of gains; (2) For investment properties, the cost basis and any claimed depreciation would need to be tracked for accurate calculation."
-) / 100
-
-include_niit = st.sidebar.checkbox(
-    "Include NIIT (3.8%)",
-    value=False,
-    help="Net Investment Income Tax: An additional 3.8% tax on investment income (capital gains, dividends, rental income) for high earners. Applies if your Modified Adjusted Gross Income exceeds $200k (single) or $250k (married filing jointly). This gets added on top of your capital gains tax rate."
-)
 
-if include_niit:
-    cap_gains_tax += 0.038
+def prefill_ranges(ranges):
+    """Button callback: write comp-estimated ranges into the low/base/high inputs before they render."""
+    for key, (low, base, high) in ranges.items():
+        st.session_state[f"{key}_low"] = low
+        st.session_state[key] = base
+        st.session_state[f"{key}_high"] = high
 
-depreciation_recapture_rate = 0.25  # Fixed by IRS
 
-# --- FIXED PROPERTY SPECS ---
-building_value = 289437  # From Tax Records (excludes land)
-annual_depreciation = building_value / 27.5
-selling_costs = 0.06  # 6% closing costs
-
-# Combined expense rate
-expense_rate = property_tax_rate + maintenance_rate
-
-# --- CALCULATION ENGINE ---
-def run_scenario(val_asis, val_ref, rent_asis, rent_ref, refurb, years=25):
-    """Run all 4 investment scenarios with given parameters."""
-    data = []
-
-    # Starting positions for sell scenarios (no tax on sale since invested in market)
-    s3_gross = val_asis * (1 - selling_costs)
-    s4_gross = (val_ref * (1 - selling_costs)) - refurb
-
-    # Track cumulative cash for rental scenarios
-    cash_s1, cash_s2 = 0, 0
-
-    for y in range(years + 1):
-        # 1. Property Values (appreciate over time)
-        v_as_is = val_asis * (1 + appreciation) ** y
-        v_refurb = val_ref * (1 + appreciation) ** y
-
-        # 2. SELL & INVEST Scenarios (no tax on market gains per user request)
-        s3_portfolio = s3_gross * (1 + market_return) ** y
-        s4_portfolio = s4_gross * (1 + market_return) ** y
-
-        wealth_s3 = s3_portfolio
-        wealth_s4 = s4_portfolio
-
-        # 3. RENT & REINVEST Scenarios (with income tax and depreciation shield)
-        if y > 0:
-            # Calculate gross rent (before vacancy)
-            gross_rent_s1 = (rent_asis * 12) * (1 + rent_growth) ** (y - 1)
-            gross_rent_s2 = (rent_ref * 12) * (1 + rent_growth) ** (y - 1)
-
-            # Apply vacancy rate (lose this % of rent due to empty periods)
-            annual_rent_s1 = gross_rent_s1 * (1 - vacancy_rate)
-            annual_rent_s2 = gross_rent_s2 * (1 - vacancy_rate)
-
-            # Deduct management fee
-            net_rent_s1 = annual_rent_s1 * (1 - management_fee)
-            net_rent_s2 = annual_rent_s2 * (1 - management_fee)
-
-            # Operating expenses (tax deductible)
-            expenses_s1 = (v_as_is * expense_rate) + hoa_annual
-            expenses_s2 = (v_refurb * expense_rate) + hoa_annual
-
-            # Net Operating Income (before taxes)
-            noi_s1 = net_rent_s1 - expenses_s1
-            noi_s2 = net_rent_s2 - expenses_s2
-
-            # Taxable income = NOI - Depreciation (depreciation shield)
-            taxable_income_s1 = max(0, noi_s1 - annual_depreciation)
-            taxable_income_s2 = max(0, noi_s2 - annual_depreciation)
-
-            # Income tax on rental profit
-            tax_s1 = taxable_income_s1 * income_tax_rate
-            tax_s2 = taxable_income_s2 * income_tax_rate
-
-            # After-tax cash flow
-            after_tax_cf_s1 = noi_s1 - tax_s1
-            after_tax_cf_s2 = noi_s2 - tax_s2
-
-            # Reinvest after-tax cash flow at market rate (no tax on market gains)
-            cash_s1 = (cash_s1 * (1 + market_return)) + after_tax_cf_s1
-            cash_s2 = (cash_s2 * (1 + market_return)) + after_tax_cf_s2
-
-        # Total wealth = Property Value + Reinvested Cash
-        wealth_s1 = v_as_is + cash_s1
-        wealth_s2 = v_refurb + cash_s2 - (refurb if y == 0 else 0)
-
-        if y == 0:
-            wealth_s2 = val_ref - refurb
-
-        data.append({
-            "Year": y,
-            "Rent As-Is": wealth_s1,
-            "Refurb & Rent": wealth_s2,
-            "Sell As-Is": wealth_s3,
-            "Refurb & Sell": wealth_s4,
-            "Property Value (As-Is)": v_as_is,
-            "Property Value (Refurb)": v_refurb,
-            "Cash (As-Is)": cash_s1,
-            "Cash (Refurb)": cash_s2 - (refurb if y == 0 else 0),
-            "Portfolio (Sell As-Is)": s3_portfolio,
-            "Portfolio (Refurb & Sell)": s4_portfolio,
-        })
-
-    return pd.DataFrame(data)
+def comp_notes(rows, decimals=0):
+    """One "address (status, size, price, $/sq ft)" note per comp row, for help texts."""
+    return "; ".join(
+        f"{row.address} ({row.status}, {row.sqft:,.0f} sq ft, ${row.price:,.0f}, ${row.per_sqft:,.{decimals}f}/sq ft)"
+        for row in rows.itertuples()
+    )
 
-# Run calculations for base, low, and high scenarios
-df_base = run_scenario(val_as_is, val_refurb, rent_as_is, rent_refurb, refurb_cost)
 
-# Low scenario: pessimistic (lower values/rents, higher refurb cost)
-df_low = run_scenario(val_as_is_low, val_refurb_low, rent_as_is_low, rent_refurb_low, refurb_cost_high)
+refurb_sale_comps = comp_store.query(kind="sale", condition="Renovated", view="Open Water", subject=False)
+refurb_rent_comps = comp_store.query(kind="rental", condition="Renovated", view="Water View", subject=False)
 
-# High scenario: optimistic (higher values/rents, lower refurb cost)
-df_high = run_scenario(val_as_is_high, val_refurb_high, rent_as_is_high, rent_refurb_high, refurb_cost_low)
+# --- SIDEBAR: INTERACTIVE VARIABLES ---
+def sidebar_inputs():
+    """Render every sidebar input and return the values the model reads, by name."""
+    financing = None
+    mc_paths = market_vol = appreciation_vol = rent_growth_vol = vacancy_vol = None
+
+    st.sidebar.header("📊 Market Assumptions")
+    st.sidebar.markdown("*Adjust these to model different scenarios*")
+
+    market_return = st.sidebar.slider(
+        "Market Portfolio Return (%)",
+        min_value=0.0, max_value=15.0, value=6.0, step=0.5,
+        help="Expected annual return if cash is invested in the stock market. Applies to sale proceeds (Sell scenarios) and reinvested rental income (Rent scenarios)."
+    ) / 100
+
+    appreciation = st.sidebar.slider(
+        "Property Appreciation (%)",
+        min_value=0.0, max_value=15.0, value=3.0, step=0.5,
+        help="Expected annual increase in property value. Montgomery County 2025 data: Home assessments up 9% YoY, Lake Conroe median prices up 4.4% YoY. Homes under 500k saw 1.9% growth. Default of 3% is conservative for this price range."
+    ) / 100
+
+    rent_growth = st.sidebar.slider(
+        "Annual Rent Growth (%)",
+        min_value=0.0, max_value=10.0, value=2.5, step=0.25,
+        help="Expected annual increase in rental rates. Conroe historical average: 4-6% annual growth typical. 2024-2025 saw -1% to -3% due to new apartment supply. Default of 2.5% is conservative given recent softness."
+    ) / 100
+
+    vacancy_rate = st.sidebar.slider(
+        "Vacancy Rate (%)",
+        min_value=0.0, max_value=100.0, value=5.0, step=1.0,
+        help="Percentage of the year the property is expected to be vacant (no rental income). A 5% vacancy means ~18 days/year without a tenant."
+    ) / 100
+
+    st.sidebar.markdown("---")
+
+    # --- COMP VALUATION ---
+    subject = comp_store.subject("sale")
+    with st.sidebar.expander("🔎 Value From Comps"):
+        st.caption("Estimates the low/base/high values and rents from the nearest comparables "
+                   "(interquartile range and median, weighted by similarity).")
+        comp_col = st.columns(3)
+        with comp_col[0]:
+            subject_sqft = st.number_input("Sq Ft", min_value=500, max_value=6000, value=int(subject.sqft), step=25, key="comp_subject_sqft")
+        with comp_col[1]:
+            subject_beds = st.number_input("Beds", min_value=1, max_value=8, value=int(subject.beds), step=1, key="comp_subject_beds")
+        with comp_col[2]:
+            subject_baths = st.number_input("Baths", min_value=1.0, max_value=6.0, value=float(subject.baths), step=0.5, key="comp_subject_baths")
+        subject_condition = st.selectbox("Current Condition", list(CONDITION_GRADES), index=list(CONDITION_GRADES).index(subject.condition), key="comp_subject_condition")
+        subject_view = st.selectbox("View", list(VIEW_GRADES), index=list(VIEW_GRADES).index(subject.view), key="comp_subject_view")
+        ranges = comp_ranges(subject_sqft, subject_beds, subject_baths, subject_condition, subject_view)
+        st.markdown("\n".join(
+            f"- {label}: \\${low:,} / \\${base:,} / \\${high:,}"
+            for label, (low, base, high) in zip(
+                ["Value (As-Is)", "Value (Refurbished)", "Rent (As-Is)", "Rent (Refurbished)"], ranges.values()
+            )
+        ))
+        st.button("Prefill Values & Rents", on_click=prefill_ranges, args=(ranges,), key="comp_prefill", width="stretch")
+
+    # --- PROPERTY VALUE RANGES ---
+    for key, default in RANGE_DEFAULTS.items():
+        st.session_state.setdefault(key, default)
+    st.sidebar.header("🏠 Property Values (As-Is)")
+    val_as_is_col = st.sidebar.columns(3)
+    with val_as_is_col[0]:
+        val_as_is_low = st.number_input("$ Low", min_value=100000, max_value=500000, step=5000, key="val_as_is_low")
+    with val_as_is_col[1]:
+        val_as_is = st.number_input("$ Base", min_value=100000, max_value=500000, step=5000, key="val_as_is")
+    with val_as_is_col[2]:
+        val_as_is_high = st.number_input("$ High", min_value=100000, max_value=500000, step=5000, key="val_as_is_high")
+
+    st.sidebar.header("🏗️ Property Values (Refurbished)", help=f"Based on renovated open water view comps: {comp_notes(refurb_sale_comps)}.")
+    val_refurb_col = st.sidebar.columns(3)
+    with val_refurb_col[0]:
+        val_refurb_low = st.number_input("$ Low", min_value=200000, max_value=700000, step=5000, key="val_refurb_low")
+    with val_refurb_col[1]:
+        val_refurb = st.number_input("$ Base", min_value=200000, max_value=700000, step=5000, key="val_refurb")
+    with val_refurb_col[2]:
+        val_refurb_high = st.number_input("$ High", min_value=200000, max_value=700000, step=5000, key="val_refurb_high")
+
+    st.sidebar.markdown("---")
+
+    # --- RENT RANGES ---
+    st.sidebar.header("💵 Monthly Rent (As-Is)")
+    rent_as_is_col = st.sidebar.columns(3)
+    with rent_as_is_col[0]:
+        rent_as_is_low = st.number_input("$ Low", min_value=1000, max_value=5000, step=50, key="rent_as_is_low")
+    with rent_as_is_col[1]:
+        rent_as_is = st.number_input("$ Base", min_value=1000, max_value=5000, step=50, key="rent_as_is")
+    with rent_as_is_col[2]:
+        rent_as_is_high = st.number_input("$ High", min_value=1000, max_value=5000, step=50, key="rent_as_is_high")
+
+    st.sidebar.header("💵 Monthly Rent (Refurbished)", help=f"Based on renovated water view rentals: {comp_notes(refurb_rent_comps, 2)}. No direct open water view rental comps exist - owners tend to sell rather than rent these premium units. Estimate assumes modest 5% view premium. Conservative given lack of direct comps.")
+    rent_refurb_col = st.sidebar.columns(3)
+    with rent_refurb_col[0]:
+        rent_refurb_low = st.number_input("$ Low", min_value=1500, max_value=6000, step=50, key="rent_refurb_low")
+    with rent_refurb_col[1]:
+        rent_refurb = st.number_input("$ Base", min_value=1500, max_value=6000, step=50, key="rent_refurb")
+    with rent_refurb_col[2]:
+        rent_refurb_high = st.number_input("$ High", min_value=1500, max_value=6000, step=50, key="rent_refurb_high")
+
+    st.sidebar.markdown("---")
+
+    # --- REFURBISHMENT COST RANGE ---
+    st.sidebar.header("🔧 Refurbishment Budget")
+    refurb_col = st.sidebar.columns(3)
+    with refurb_col[0]:
+        refurb_cost_low = st.number_input("$ Low", min_value=0, max_value=150000, value=50000, step=5000, key="refurb_low")
+    with refurb_col[1]:
+        refurb_cost = st.number_input("$ Base", min_value=0, max_value=150000, value=60000, step=5000, key="refurb_base")
+    with refurb_col[2]:
+        refurb_cost_high = st.number_input("$ High", min_value=0, max_value=150000, value=75000, step=5000, key="refurb_high")
+
+    st.sidebar.markdown("---")
+    st.sidebar.header("💰 Expense Assumptions")
+
+    property_tax_rate = st.sidebar.slider(
+        "Property Tax Rate (%)",
+        min_value=0.5, max_value=3.0, value=1.2, step=0.1,
+        help="Annual property tax as % of property value"
+    ) / 100
+
+    maintenance_rate = st.sidebar.slider(
+        "Maintenance Reserve (%)",
+        min_value=0.0, max_value=3.0, value=1.0, step=0.25,
+        help="Annual maintenance/repairs as % of property value"
+    ) / 100
+
+    hoa_annual = st.sidebar.number_input(
+        "$ HOA + Social Fees (/year)",
+        min_value=0, max_value=10000, value=2000, step=100,
+        help="Annual POA and social club fees"
+    )
 
-# --- MAIN DASHBOARD UI ---
-tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Summary", "📈 Rate Assumptions", "🏘️ Comparables", "🏛️ Tax Considerations", "🏠 Property Specs"])
+    st.sidebar.markdown("---")
+    st.sidebar.header("👤 Management Options")
 
-# ============ TAB 1: SUMMARY ============
-with tab1:
-    st.header("25-Year Wealth Projection")
-    st.markdown("*Shaded bands show the range between low and high estimates*")
-
-    # Main Chart with uncertainty bands
-    fig = go.Figure()
-
-    colors = {
-        "Rent As-Is": "#1f77b4",      # Blue
-        "Refurb & Rent": "#2ca02c",   # Green
-        "Sell As-Is": "#ff7f0e",      # Orange
-        "Refurb & Sell": "#e377c2"    # Pink
-    }
+    self_managed = st.sidebar.checkbox(
+        "Self-Manage Property",
+        value=True,
+        help="If unchecked, 10% of gross rent goes to property manager"
+    )
 
-    # Add uncertainty bands (fill between low and high)
-    for col in ["Rent As-Is", "Refurb & Rent", "Sell As-Is", "Refurb & Sell"]:
-        # Upper bound (high scenario)
-        fig.add_trace(go.Scatter(
-            x=df_high['Year'],
-            y=df_high[col],
-            mode='lines',
-            line=dict(width=0),
-            showlegend=False,
-            hoverinfo='skip'
-        ))
+    management_fee = 0.0 if self_managed else 0.10
 
-        # Lower bound with fill to upper (creates the band)
-        hex_color = colors[col]
-        rgba_fill = f"rgba({int(hex_color[1:3], 16)}, {int(hex_color[3:5], 16)}, {int(hex_color[5:7], 16)}, 0.2)"
-        fig.add_trace(go.Scatter(
-            x=df_low['Year'],
-            y=df_low[col],
-            mode='lines',
-            line=dict(width=0),
-            fill='tonexty',
-            fillcolor=rgba_fill,
-            showlegend=False,
-            hoverinfo='skip'
-        ))
+    st.sidebar.markdown("---")
+    st.sidebar.header("🏛️ Tax Assumptions")
 
-    # Add main lines (base scenario)
-    for col in ["Rent As-Is", "Refurb & Rent", "Sell As-Is", "Refurb & Sell"]:
-        fig.add_trace(go.Scatter(
-            x=df_base['Year'],
-            y=df_base[col],
-            name=col,
-            mode='lines+markers',
-            line=dict(width=3, color=colors[col]),
-            marker=dict(size=6),
-            hovertemplate=f"<b>{col}</b><br>Year: %{{x}}<br>Wealth: $%{{y:,.0f}}<extra></extra>"
-        ))
+    income_tax_rate = st.sidebar.slider(
+        "Marginal Income Tax Rate (%)",
+        min_value=10, max_value=37, value=22, step=1,
+        help="Federal marginal tax rate on rental income (22% is common)"
+    ) / 100
 
-    fig.update_layout(
-        title="Net Wealth Over 25 Years (with Uncertainty Bands)",
-        xaxis_title="Year",
-        yaxis_title="Total Portfolio Value ($)",
-        yaxis_tickformat="$,.0f",
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        hovermode="x unified",
-        height=500
-    )
+    cap_gains_tax = st.sidebar.slider(
+        "Capital Gains Tax Rate (%)",
+        min_value=0, max_value=25, value=15, step=1,
+        help="Federal long-term capital gains rate (0%, 15%, or 20% typical). Used by the exit-timing analysis in the Tax Considerations tab, which taxes gains over today's value when the property is sold. The main projections assume no capital gains tax on the sale because of the Primary Residence Exemption: if you lived in the home 2 of the last 5 years, you can exclude up to 250k (single) or 500k (married) of gains."
+    ) / 100
 
-    st.plotly_chart(fig, use_container_width=True)
-
-    # --- STACKED BAR CHART: Property Value vs Cash ---
-    st.markdown("#### Wealth Composition: Property Value vs Cash/Portfolio")
-
-    fig_breakdown = go.Figure()
-
-    # Calculate totals for hover
-    df_base['Total (As-Is)'] = df_base['Property Value (As-Is)'] + df_base['Cash (As-Is)']
-    df_base['Total (Refurb)'] = df_base['Property Value (Refurb)'] + df_base['Cash (Refurb)']
-
-    # Rent As-Is - Property Value (bottom of blue stack)
-    fig_breakdown.add_trace(
-        go.Bar(
-            name="As-Is: Property",
-            x=df_base['Year'],
-            y=df_base['Property Value (As-Is)'],
-            marker_color="#1f77b4",
-            customdata=df_base[['Cash (As-Is)', 'Total (As-Is)']].values,
-            hovertemplate="<b>Rent As-Is (Year %{x})</b><br>" +
-                          "Property: $%{y:,.0f}<br>" +
-                          "Cash: $%{customdata[0]:,.0f}<br>" +
-                          "Total: $%{customdata[1]:,.0f}<extra></extra>",
-            offsetgroup=0
-        )
+    include_niit = st.sidebar.checkbox(
+        "Include NIIT (3.8%)",
+        value=False,
+        help="Net Investment Income Tax: An additional 3.8% tax on investment income (capital gains, dividends, rental income) for high earners. Applies if your Modified Adjusted Gross Income exceeds $200k (single) or $250k (married filing jointly). This gets added on top of your capital gains tax rate."
     )
-    # Rent As-Is - Cash (top of blue stack)
-    fig_breakdown.add_trace(
-        go.Bar(
-            name="As-Is: Cash",
-            x=df_base['Year'],
-            y=df_base['Cash (As-Is)'],
-            marker_color="#aec7e8",
-            customdata=df_base[['Property Value (As-Is)', 'Cash (As-Is)', 'Total (As-Is)']].values,
-            hovertemplate="<b>Rent As-Is (Year %{x})</b><br>" +
-                          "Property: $%{customdata[0]:,.0f}<br>" +
-                          "Cash: $%{customdata[1]:,.0f}<br>" +
-                          "Total: $%{customdata[2]:,.0f}<extra></extra>",
-            offsetgroup=0,
-            base=df_base['Property Value (As-Is)']
-        )
+
+    if include_niit:
+        cap_gains_tax += 0.038
+
+    st.sidebar.markdown("---")
+    st.sidebar.header("🏦 Mortgage Financing")
+
+    use_mortgage = st.sidebar.checkbox(
+        "Model Monthly with Mortgage",
+        value=False,
+        help="Run a month-by-month projection with an outstanding mortgage: amortized payments, mortgage interest deducted alongside depreciation, PMI while the balance is above 80% of the property value, and vacancy taken as whole months without rent. Sell scenarios pay off the loan from the sale proceeds."
     )
 
-    # Refurb & Rent - Split cash into positive (green) and negative (red)
-    df_base['Cash (Refurb) Positive'] = df_base['Cash (Refurb)'].clip(lower=0)
-    df_base['Cash (Refurb) Negative'] = df_base['Cash (Refurb)'].clip(upper=0)
-
-    # Refurb & Rent - Property Value (bottom of green stack)
-    fig_breakdown.add_trace(
-        go.Bar(
-            name="Refurb: Property",
-            x=df_base['Year'],
-            y=df_base['Property Value (Refurb)'],
-            marker_color="#2ca02c",
-            customdata=df_base[['Property Value (Refurb)', 'Cash (Refurb)', 'Total (Refurb)']].values,
-            hovertemplate="<b>Refurb & Rent (Year %{x})</b><br>" +
-                          "Property: $%{customdata[0]:,.0f}<br>" +
-                          "Cash: $%{customdata[1]:,.0f}<br>" +
-                          "Total: $%{customdata[2]:,.0f}<extra></extra>",
-            offsetgroup=1
+    if use_mortgage:
+        loan_balance = st.sidebar.number_input(
+            "$ Outstanding Loan Balance",
+            min_value=0, max_value=700000, value=250000, step=5000
         )
-    )
-    # Refurb & Rent - Positive Cash (top of green stack)
-    fig_breakdown.add_trace(
-        go.Bar(
-            name="Refurb: Cash",
-            x=df_base['Year'],
-            y=df_base['Cash (Refurb) Positive'],
-            marker_color="#98df8a",
-            customdata=df_base[['Property Value (Refurb)', 'Cash (Refurb)', 'Total (Refurb)']].values,
-            hovertemplate="<b>Refurb & Rent (Year %{x})</b><br>" +
-                          "Property: $%{customdata[0]:,.0f}<br>" +
-                          "Cash: $%{customdata[1]:,.0f}<br>" +
-                          "Total: $%{customdata[2]:,.0f}<extra></extra>",
-            offsetgroup=1,
-            base=df_base['Property Value (Refurb)']
+        mortgage_rate = st.sidebar.slider(
+            "Mortgage Rate (%)",
+            min_value=0.0, max_value=12.0, value=6.5, step=0.125
+        ) / 100
+        term_years = st.sidebar.slider(
+            "Remaining Term (years)",
+            min_value=1, max_value=30, value=30, step=1
         )
+        pmi_rate = st.sidebar.slider(
+            "PMI Rate (%/year)",
+            min_value=0.0, max_value=2.0, value=0.5, step=0.1,
+            help="Private mortgage insurance, charged on the balance until it falls to 80% of the property value. Not tax deductible."
+        ) / 100
+        financing = Financing(loan_balance, mortgage_rate, term_years, pmi_rate)
+
+    st.sidebar.markdown("---")
+    st.sidebar.header("🎲 Monte Carlo Simulation")
+
+    monte_carlo = st.sidebar.checkbox(
+        "Enable Monte Carlo Mode",
+        value=False,
+        help="Simulate thousands of random 25-year paths where market returns, appreciation, rent growth and vacancy vary every year around the rates above. Adds a percentile fan chart to the Summary tab."
     )
-    # Refurb & Rent - Negative Cash (red portion showing cost on top)
-    fig_breakdown.add_trace(
-        go.Bar(
-            name="Refurb: Cost",
-            x=df_base['Year'],
-            y=-df_base['Cash (Refurb) Negative'],  # Make positive for display
-            marker_color="#d62728",  # Red
-            customdata=df_base[['Property Value (Refurb)', 'Cash (Refurb)', 'Total (Refurb)']].values,
-            hovertemplate="<b>Refurb & Rent (Year %{x})</b><br>" +
-                          "Property: $%{customdata[0]:,.0f}<br>" +
-                          "Cash: $%{customdata[1]:,.0f}<br>" +
-                          "Total: $%{customdata[2]:,.0f}<extra></extra>",
-            offsetgroup=1,
-            base=df_base['Property Value (Refurb)'] + df_base['Cash (Refurb) Positive']
+
+    if monte_carlo:
+        mc_paths = st.sidebar.slider(
+            "Simulated Paths",
+            min_value=10000, max_value=100000, value=50000, step=10000,
+            help="Number of random paths. More paths give smoother percentile bands."
         )
-    )
+        market_vol = st.sidebar.slider(
+            "Market Return Volatility (%)",
+            min_value=0.0, max_value=30.0, value=15.0, step=1.0,
+            help="Standard deviation of annual market returns. The S&P 500 has historically been around 15-20%."
+        ) / 100
+        appreciation_vol = st.sidebar.slider(
+            "Appreciation Volatility (%)",
+            min_value=0.0, max_value=10.0, value=4.0, step=0.5,
+            help="Standard deviation of annual property appreciation."
+        ) / 100
+        rent_growth_vol = st.sidebar.slider(
+            "Rent Growth Volatility (%)",
+            min_value=0.0, max_value=5.0, value=2.0, step=0.25,
+            help="Standard deviation of annual rent growth."
+        ) / 100
+        vacancy_vol = st.sidebar.slider(
+            "Vacancy Volatility (%)",
+            min_value=0.0, max_value=20.0, value=5.0, step=1.0,
+            help="Standard deviation of the annual vacancy rate (clipped to 0-100%)."
+        ) / 100
+
+    return {
+        "market_return": market_return,
+        "appreciation": appreciation,
+        "rent_growth": rent_growth,
+        "vacancy_rate": vacancy_rate,
+        "val_as_is_low": val_as_is_low,
+        "val_as_is": val_as_is,
+        "val_as_is_high": val_as_is_high,
+        "val_refurb_low": val_refurb_low,
+        "val_refurb": val_refurb,
+        "val_refurb_high": val_refurb_high,
+        "rent_as_is_low": rent_as_is_low,
+        "rent_as_is": rent_as_is,
+        "rent_as_is_high": rent_as_is_high,
+        "rent_refurb_low": rent_refurb_low,
+        "rent_refurb": rent_refurb,
+        "rent_refurb_high": rent_refurb_high,
+        "refurb_cost_low": refurb_cost_low,
+        "refurb_cost": refurb_cost,
+        "refurb_cost_high": refurb_cost_high,
+        "property_tax_rate": property_tax_rate,
+        "maintenance_rate": maintenance_rate,
+        "hoa_annual": hoa_annual,
+        "management_fee": management_fee,
+        "income_tax_rate": income_tax_rate,
+        "cap_gains_tax": cap_gains_tax,
+        "use_mortgage": use_mortgage,
+        "financing": financing,
+        "monte_carlo": monte_carlo,
+        "mc_paths": mc_paths,
+        "market_vol": market_vol,
+        "appreciation_vol": appreciation_vol,
+        "rent_growth_vol": rent_growth_vol,
+        "vacancy_vol": vacancy_vol,
+    }
 
-    fig_breakdown.update_layout(
-        barmode='group',
-        height=400,
-        yaxis_tickformat="$,.0f",
-        yaxis_title="Total Wealth ($)",
-        xaxis_title="Year",
-        xaxis=dict(dtick=1),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
-    )
 
-    st.plotly_chart(fig_breakdown, use_container_width=True)
-    st.caption("*Cash assumes reinvested rental income compounds in the market and is not taxed on earnings until withdrawal.*")
+@st.fragment
+def batched_sidebar_inputs():
+    """sidebar_inputs() as a fragment, so edits rerun only the sidebar until applied.
+
+    Returns the applied inputs and shows how many pending edits differ from them.
+    """
+    status = st.sidebar.container()
+    pending = sidebar_inputs()
+    applied = st.session_state.setdefault("applied_inputs", pending)
+    changed = [name for name, value in pending.items() if value != applied[name]]
+    with status:
+        if changed:
+            st.warning(f"✏️ {len(changed)} unapplied change{'s' if len(changed) > 1 else ''}")
+            st.caption(", ".join(name.replace("_", " ") for name in changed))
+        else:
+            st.caption("✅ All changes applied")
+        if st.button("Apply changes", type="primary", disabled=not changed, width="stretch"):
+            st.session_state["applied_inputs"] = pending
+            st.rerun(scope="app")
+        st.markdown("---")
+    return applied
+
+
+profiler.start("Sidebar")
+batch_edits = st.sidebar.toggle(
+    "Batch Edits",
+    value=False,
+    key="batch_edits",
+    # Each batch starts from the inputs currently applied
+    on_change=lambda: st.session_state.pop("applied_inputs", None),
+    help="Edit several inputs, then recalculate once with Apply changes instead of after every edit. Useful for entering a whole new scenario, and lighter on a shared server."
+)
+sidebar = batched_sidebar_inputs() if batch_edits else sidebar_inputs()
+# Back under the names the rest of the app reads
+market_return = sidebar["market_return"]
+appreciation = sidebar["appreciation"]
+rent_growth = sidebar["rent_growth"]
+vacancy_rate = sidebar["vacancy_rate"]
+val_as_is_low = sidebar["val_as_is_low"]
+val_as_is = sidebar["val_as_is"]
+val_as_is_high = sidebar["val_as_is_high"]
+val_refurb_low = sidebar["val_refurb_low"]
+val_refurb = sidebar["val_refurb"]
+val_refurb_high = sidebar["val_refurb_high"]
+rent_as_is_low = sidebar["rent_as_is_low"]
+rent_as_is = sidebar["rent_as_is"]
+rent_as_is_high = sidebar["rent_as_is_high"]
+rent_refurb_low = sidebar["rent_refurb_low"]
+rent_refurb = sidebar["rent_refurb"]
+rent_refurb_high = sidebar["rent_refurb_high"]
+refurb_cost_low = sidebar["refurb_cost_low"]
+refurb_cost = sidebar["refurb_cost"]
+refurb_cost_high = sidebar["refurb_cost_high"]
+property_tax_rate = sidebar["property_tax_rate"]
+maintenance_rate = sidebar["maintenance_rate"]
+hoa_annual = sidebar["hoa_annual"]
+management_fee = sidebar["management_fee"]
+income_tax_rate = sidebar["income_tax_rate"]
+cap_gains_tax = sidebar["cap_gains_tax"]
+use_mortgage = sidebar["use_mortgage"]
+financing = sidebar["financing"]
+monte_carlo = sidebar["monte_carlo"]
+mc_paths = sidebar["mc_paths"]
+market_vol = sidebar["market_vol"]
+appreciation_vol = sidebar["appreciation_vol"]
+rent_growth_vol = sidebar["rent_growth_vol"]
+vacancy_vol = sidebar["vacancy_vol"]
+
+profiler.stop()
 
-    # Find the crossover point for Refurb & Rent
-    crossover_year = None
-    for idx, row in df_base.iterrows():
-        if row["Refurb & Rent"] > row["Sell As-Is"] and crossover_year is None:
-            crossover_year = row["Year"]
-            break
+# --- FIXED PROPERTY SPECS ---
+profiler.start("Calculation")
+building_value = BUILDING_VALUE  # From Tax Records (excludes land)
+selling_costs = SELLING_COSTS  # 6% closing costs
+
+# --- MODEL INPUTS ---
+params = ScenarioParams(
+    val_asis=val_as_is,
+    val_ref=val_refurb,
+    rent_asis=rent_as_is,
+    rent_ref=rent_refurb,
+    refurb=refurb_cost,
+    market_return=market_return,
+    appreciation=appreciation,
+    rent_growth=rent_growth,
+    vacancy_rate=vacancy_rate,
+    property_tax_rate=property_tax_rate,
+    maintenance_rate=maintenance_rate,
+    hoa_annual=hoa_annual,
+    management_fee=management_fee,
+    income_tax_rate=income_tax_rate,
+    building_value=building_value,
+    selling_costs=selling_costs,
+)
+annual_depreciation = params.annual_depreciation
+expense_rate = params.expense_rate
 
-    if crossover_year:
-        st.info(f"📈 **Crossover Point:** The 'Refurb & Rent' strategy surpasses 'Sell As-Is' at **Year {crossover_year}**")
+# Low scenario: pessimistic (lower values/rents, higher refurb cost)
+params_low = replace(
+    params, val_asis=val_as_is_low, val_ref=val_refurb_low, rent_asis=rent_as_is_low,
+    rent_ref=rent_refurb_low, refurb=refurb_cost_high,
+)
 
-    st.markdown("---")
+# High scenario: optimistic (higher values/rents, lower refurb cost)
+params_high = replace(
+    params, val_asis=val_as_is_high, val_ref=val_refurb_high, rent_asis=rent_as_is_high,
+    rent_ref=rent_refurb_high, refurb=refurb_cost_low,
+)
 
-    # Summary Metrics
-    st.subheader("Final Wealth at Year 25")
-    final = df_base.iloc[-1]
-    final_low = df_low.iloc[-1]
-    final_high = df_high.iloc[-1]
+# --- RESULT CACHE ---
+@st.cache_resource
+def get_result_cache():
+    """One cache shared by every session; sized via ENGINE_CACHE_SIZE / ENGINE_CACHE_TTL (seconds, 0 = no expiry)."""
+    ttl = float(os.environ.get("ENGINE_CACHE_TTL", 3600))
+    return ResultCache(
+        max_entries=int(os.environ.get("ENGINE_CACHE_SIZE", 256)),
+        ttl=ttl if ttl > 0 else None,
+    )
 
-    col1, col2, col3, col4 = st.columns(4)
 
-    with col1:
-        st.metric(
-            label="🏠 Rent As-Is",
-            value=f"${final['Rent As-Is']:,.0f}"
-        )
-        st.caption(f"Range: ${final_low['Rent As-Is']:,.0f} - ${final_high['Rent As-Is']:,.0f}")
+result_cache = get_result_cache()
 
-    with col2:
-        st.metric(
-            label="🔨 Refurb & Rent",
-            value=f"${final['Refurb & Rent']:,.0f}"
-        )
-        st.caption(f"Range: ${final_low['Refurb & Rent']:,.0f} - ${final_high['Refurb & Rent']:,.0f}")
 
-    with col3:
-        st.metric(
-            label="💰 Sell As-Is",
-            value=f"${final['Sell As-Is']:,.0f}"
-        )
-        st.caption(f"Range: ${final_low['Sell As-Is']:,.0f} - ${final_high['Sell As-Is']:,.0f}")
+# Monte Carlo nodes each session's graph memoizes: the drawn paths and sell
+# portfolios, which are costly to redraw, and the small property-pair arrays.
+# Per-path rent and cash nodes are recomputed when needed to bound memory.
+MC_GRAPH_KEEP = ("market_index", "value_index", "rent_index", "vacancy", "portfolios", "vals", "rents", "refurbs")
 
-    with col4:
-        st.metric(
-            label="🏗️ Refurb & Sell",
-            value=f"${final['Refurb & Sell']:,.0f}"
-        )
-        st.caption(f"Range: ${final_low['Refurb & Sell']:,.0f} - ${final_high['Refurb & Sell']:,.0f}")
 
-    st.markdown("---")
+@st.cache_resource
+def get_mc_graphs():
+    """Per-session Monte Carlo graphs in one bounded pool shared by every session.
 
-    # Strategy Explanation
-    st.subheader("Understanding the Strategies")
+    At 100k paths a graph holds over 100 MB, so at most MC_GRAPH_SESSIONS
+    (default 4) are kept, least recently used first out, and each expires
+    MC_GRAPH_TTL seconds (default 600) after it was created; an evicted
+    session simply draws its paths again.
+    """
+    ttl = float(os.environ.get("MC_GRAPH_TTL", 600))
+    return ResultCache(
+        max_entries=int(os.environ.get("MC_GRAPH_SESSIONS", 4)),
+        ttl=ttl if ttl > 0 else None,
+    )
 
-    exp1, exp2 = st.columns(2)
 
-    with exp1:
-        st.markdown("#### 🏠 Rent Strategies")
-        st.markdown(f"""
-        **Rent As-Is:** Keep the property in current condition, collect rent, and reinvest
-        the after-tax cash flow into the market.
+@st.cache_resource
+def get_prefetcher():
+    """One background worker shared by every session; ENGINE_PREFETCH_BUDGET caps the scenarios per rerun."""
+    return Prefetcher(get_result_cache(), budget=int(os.environ.get("ENGINE_PREFETCH_BUDGET", 48)))
 
-        **Refurb & Rent (Forced Equity Play):** Invest upfront to unlock higher rent AND
-        immediate equity. The \\${refurb_cost:,} investment creates ~\\${val_refurb - val_as_is:,} in equity
-        while also increasing monthly cash flow by \\${rent_refurb - rent_as_is:,}.
 
-        *Rental income is taxed at {income_tax_rate*100:.0f}% but reduced by the \\${annual_depreciation:,.0f}/yr
-        depreciation shield. Market gains on reinvested cash are tax-free.*
-        """)
+# Slider steps either side of the current inputs to precompute (0 = off)
+prefetch_steps = int(os.environ.get("ENGINE_PREFETCH_STEPS", 0))
+# Speculative work queued by this session's last run stops before this run
+# competes with it; whatever it already cached stays cached
+if "prefetch_cancel" in st.session_state:
+    st.session_state.pop("prefetch_cancel").set()
 
-    with exp2:
-        st.markdown("#### 💰 Sell Strategies")
-        st.markdown(f"""
-        **Sell As-Is:** Immediately liquidate the property (minus 6% closing costs) and
-        invest the proceeds in the stock market.
 
-        **Refurb & Sell:** Spend \\${refurb_cost:,} to increase the sale price from \\${val_as_is:,} to \\${val_refurb:,},
-        then invest the larger proceeds.
+def scenario_key(params, years=25):
+    return ("scenario", years, snapshot(**params.engine_inputs()))
 
-        *Market gains compound tax-free in this model. These strategies provide immediate
-        liquidity but lose the depreciation tax shield.*
-        """)
 
-# ============ TAB 2: RATE ASSUMPTIONS ============
-with tab2:
-    st.header("Understanding the Rate Assumptions")
-    st.markdown("*Why the default values were chosen and what they mean*")
+def cached_scenario(params, years=25):
+    """run_scenario through the shared cache, copied so this session can add columns."""
+    df = result_cache.get_or_compute(scenario_key(params, years), lambda: run_scenario(params, years))
+    return df.copy()
 
-    rate1, rate2 = st.columns(2)
 
-    with rate1:
-        st.markdown("#### Market Portfolio Return (Default: 6%)")
-        st.markdown("""
-        This represents the expected annual return from investing in a diversified stock portfolio.
+RANGE_SAMPLES = 4096  # Sobol samples behind the sampled uncertainty bands
 
-        **Historical Context:**
-        - S&P 500 average return (1928-2024): ~10% nominal, ~7% inflation-adjusted
-        - Vanguard Total Stock Market (VTI) 10-year return: ~11%
-        - Conservative estimate accounts for sequence-of-returns risk and fees
+# --- OUTPUT DEPENDENCIES ---
+# The model inputs behind each heavy output. Outputs are memoized in the shared
+# cache under just these inputs, so a rerun rebuilds only the outputs whose
+# inputs changed: nudging hoa_annual leaves the depreciation chart alone, and an
+# input only one output reads (such as cap_gains_tax) rebuilds just that one.
+model_inputs = {
+    "params": params,
+    "params_low": params_low,
+    "params_high": params_high,
+    "annual_depreciation": annual_depreciation,
+    "income_tax_rate": income_tax_rate,
+    "cap_gains_tax": cap_gains_tax,
+}
+if use_mortgage:
+    model_inputs["financing"] = financing
+if monte_carlo:
+    model_inputs["monte_carlo"] = dict(
+        paths=mc_paths, market_vol=market_vol, appreciation_vol=appreciation_vol,
+        rent_growth_vol=rent_growth_vol, vacancy_vol=vacancy_vol,
+    )
 
-        **Why 6%?** A conservative estimate that accounts for inflation, fees, and the reality
-        that future returns may be lower than historical averages. Bumping to 8-10% represents
-        a more optimistic scenario.
-        """)
+# Derived outputs (tables, figures, batched engine results) are memoized in the
+# shared result cache, so every session with the same inputs reuses them. Each
+# output lists the model inputs it depends on; widgets inside a @st.fragment
+# are passed as settings, so changing one reruns only its fragment and rebuilds
+# only the outputs that read it.
+OUTPUT_INPUTS = {
+    "wealth_band_chart": ("params_low", "params", "params_high"),
+    "range_bands": ("params_low", "params", "params_high"),
+    "mc_bands": ("params", "monte_carlo"),
+    "monte_carlo_chart": ("params", "monte_carlo"),
+    "monthly": ("params", "financing"),
+    "monthly_chart": ("params", "financing"),
+    "amortization": ("financing",),
+    "breakdown_chart": ("params",),
+    "crossovers": ("params",),
+    "thresholds": ("params",),
+    "tax_shield": ("annual_depreciation", "income_tax_rate"),
+    "tax_savings_chart": ("annual_depreciation", "income_tax_rate"),
+    "roi_table": ("params",),
+    "exit_matrix": ("params", "cap_gains_tax"),
+    "exit_chart": ("params", "cap_gains_tax"),
+    "refurb_optimizer": ("params", "cap_gains_tax"),
+    "backtest": ("params",),
+    "backtest_chart": ("params",),
+    "sweep": ("params",),
+    "tornado": ("params", "params_low", "params_high"),
+    "explore_chart": ("params",),
+    "portfolio": ("params",),
+}
+
+
+def memoized_output(name, build, *settings):
+    """build() through the shared cache, keyed by the inputs OUTPUT_INPUTS lists for name.
+
+    settings are extra hashable values local to the output, such as a widget selection.
+    """
+    inputs = tuple(fingerprint(model_inputs[dep]) for dep in OUTPUT_INPUTS[name])
+    return result_cache.get_or_compute(("output", name, inputs, settings), build)
 
-        st.markdown("#### Property Appreciation (Default: 3%)")
-        st.markdown("""
-        The expected annual increase in your property's market value.
 
-        **Historical Context:**
-        - U.S. national average (1991-2024): ~3.5-4% nominal
-        - Montgomery County, TX (2019-2024): ~5-8% (post-pandemic boom)
-        - Long-term sustainable growth typically tracks inflation + 1%
+# Run calculations for base, low, and high scenarios
+df_base = cached_scenario(params)
+df_low = cached_scenario(params_low)
+df_high = cached_scenario(params_high)
+
+# Shared by several tabs (and the CSV export), so computed whatever tab is open
+add_breakdown_columns(df_base)
+final = df_base.iloc[-1]
+
+# Monte Carlo: all paths evaluated together, reduced to percentile bands
+if monte_carlo:
+    mc_inputs = dict(
+        params.engine_inputs(), market_vol=market_vol, appreciation_vol=appreciation_vol,
+        rent_growth_vol=rent_growth_vol, vacancy_vol=vacancy_vol,
+    )
+    # Only the percentile bands are cached across sessions. Each session also
+    # keeps its drawn growth indices, so nudging an input the draws don't
+    # depend on (HOA, taxes, rents...) reuses them instead of resimulating;
+    # they live in a bounded shared pool rather than in the session itself
+    mc_session = st.session_state.setdefault("mc_session", os.urandom(6).hex())
+    mc_graph = get_mc_graphs().get_or_compute(
+        mc_session, lambda: ModelGraph(SIMULATION_NODES, keep=MC_GRAPH_KEEP),
+    )
+    mc_bands = memoized_output(
+        "mc_bands",
+        lambda: percentile_bands(simulate_paths(**mc_inputs, n_paths=mc_paths, seed=42, graph=mc_graph)),
+    )
+elif "mc_session" in st.session_state:
+    get_mc_graphs().discard(st.session_state["mc_session"])
 
-        **Why 3%?** Conservative baseline that assumes the post-pandemic boom normalizes.
-        Montgomery County's growth may continue above average due to Houston expansion,
-        but 3% is a safe planning assumption.
-        """)
+# Monthly engine with mortgage financing
+if use_mortgage:
+    monthly = memoized_output("monthly", lambda: run_monthly(**params.engine_inputs(), **asdict(financing)))
 
-    with rate2:
-        st.markdown("#### Annual Rent Growth (Default: 2.5%)")
-        st.markdown("""
-        How much you can increase rent each year while remaining competitive.
+profiler.stop()
 
-        **Historical Context:**
-        - National average rent growth (2010-2024): ~3-4%
-        - Texas rent growth tends to be slightly lower due to no income tax migration
-        - Rent typically grows slower than property values in appreciating markets
+cache_stats = result_cache.stats()
+st.sidebar.markdown("---")
+st.sidebar.caption(
+    f"⚡ Engine cache: {cache_stats['hits']:,} hits · {cache_stats['misses']:,} misses · "
+    f"{cache_stats['entries']:,} entries (shared across sessions)"
+    + (f" · {cache_stats['warmed']:,} prefetched" if prefetch_steps else "")
+)
 
-        **Why 2.5%?** Matches historical inflation and represents sustainable growth.
-        Higher rates (3-4%) are achievable in strong markets, but tenant turnover risk
-        increases with aggressive rent increases.
-        """)
+# --- MAIN DASHBOARD UI ---
+# Tabs rerun the script when switched, and each tab only renders while it is
+# open, so hidden tabs build no figures and send nothing to the browser
+tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(
+    ["📊 Summary", "📈 Rate Assumptions", "🏘️ Comparables", "🏛️ Tax Considerations", "🏠 Property Specs", "🗺️ Sensitivity", "🏢 Portfolio"],
+    key="active_tab", on_change="rerun",
+)
 
-        st.markdown("#### Vacancy Rate (Default: 5%)")
-        st.markdown("""
-        Percentage of time the property sits empty (turnover, repairs, finding tenants).
+# Widgets in hidden tabs are not rendered, which would reset them; writing their
+# values back keeps each selection until its tab is opened again
+hidden_widgets = tuple(prefix for tab, prefix in [(tab1, "breakeven_"), (tab1, "summary_"), (tab3, "comps_"), (tab5, "optimizer_"), (tab6, "sweep_"), (tab6, "tornado_"), (tab6, "explore_")]
+                       if not tab.open)
+for key in list(st.session_state):
+    if key.startswith(hidden_widgets):
+        st.session_state[key] = st.session_state[key]
 
-        **Industry Benchmarks:**
-        - Well-managed single-family: 3-5%
-        - Average rental market: 5-8%
-        - Challenging markets: 8-12%
+# ============ TAB 1: SUMMARY ============
+@st.fragment
+def breakeven_assumptions():
+    """Break-even table for one assumption."""
+    st.markdown("#### Break-Even Assumptions")
+    threshold_input = st.selectbox(
+        "Assumption to solve for",
+        list(INPUT_RANGES),
+        index=0,
+        format_func=lambda name: INPUT_RANGES[name].label,
+        key="breakeven_input"
+    )
+    threshold_spec = INPUT_RANGES[threshold_input]
+    st.markdown(f"*Value of {threshold_spec.label.lower()} at which each pair ties at Year 25 (other inputs unchanged)*")
+    thresholds = memoized_output("thresholds", lambda: threshold_table(params, threshold_input), threshold_input)
+    st.dataframe(
+        thresholds.style.format({
+            "Break-Even Value": lambda v: "—" if pd.isna(v)
+            else f"{v * 100:.2f}%" if threshold_spec.percent else f"${v:,.0f}",
+            "Wins Above": lambda s: "—" if pd.isna(s) else s,
+        }),
+        width="stretch",
+        hide_index=True
+    )
 
-        **Why 5%?** Represents ~18 days/year of vacancy, typical for a desirable property
-        in a good location. A waterside townhouse in April Sound should command strong
-        tenant interest, supporting this conservative estimate.
-        """)
 
-# ============ TAB 3: COMPARABLES ============
-with tab3:
-    st.header("Comparable Properties in April Sound")
-    st.markdown("*Market data to support the value and rent estimates*")
+if tab1.open:
+    with tab1, profiler.section("Summary tab"):
+        st.header("25-Year Wealth Projection")
+        band_method = st.radio(
+            "Uncertainty Bands",
+            ["Low / High Corners", "Sampled Ranges"],
+            horizontal=True,
+            key="summary_band_method",
+            help="Corners run every input at its low or high estimate together, which overstates the tails. "
+                 "Sampled Ranges treats each low/base/high entry as a PERT distribution peaking at base and "
+                 f"evaluates {RANGE_SAMPLES:,} Sobol samples (with antithetic pairs) in one batch."
+        )
 
-    st.subheader("🏠 Nearby Sales & Listings")
-    st.markdown("""
-    | Address | Sq Ft | Beds/Baths | Sale Price | Per Sq Ft | Condition | View | Status |
-    |---------|-------|------------|------------|-----------|-----------|------|--------|
-    | 144 April Point Dr S | 1,824 | 3/2.5 | \\$365,000 | \\$200 | Original | Open Water | Subject Property |
-    | 143 April Point Dr S | 1,824 | 3/2.5 | \\$485,000 | \\$266 | Renovated | Open Water | Sold Jan 2025 |
-    | 137 April Point Dr S | 1,824 | 3/2.5 | \\$510,000 | \\$280 | Renovated | Open Water | Sold Oct 2023 |
-    | 132 April Point Dr S | 1,800 | 3/2.5 | \\$372,000 | \\$207 | Renovated | Water View | Sold 2023 |
-    | 120 April Point Dr S | 1,750 | 3/2 | \\$349,000 | \\$199 | Original | Water View | Sold 2024 |
-    | 156 April Point Dr N | 1,920 | 3/2.5 | \\$385,000 | \\$201 | Updated | Lakeside | Sold 2024 |
-    """)
+        if band_method == "Low / High Corners":
+            st.markdown("*Shaded bands show the range between low and high estimates*")
+            fig = memoized_output("wealth_band_chart", lambda: wealth_band_chart(df_low, df_base, df_high), band_method)
+        else:
+            st.markdown("*Shaded bands span P5-P95 of the sampled values, rents and refurb budget; lines show the base case*")
+
+            def build_sampled_bands():
+                bands = memoized_output("range_bands", lambda: range_bands(params, {
+                    "val_asis": (val_as_is_low, val_as_is, val_as_is_high),
+                    "val_ref": (val_refurb_low, val_refurb, val_refurb_high),
+                    "rent_asis": (rent_as_is_low, rent_as_is, rent_as_is_high),
+                    "rent_ref": (rent_refurb_low, rent_refurb, rent_refurb_high),
+                    "refurb": (refurb_cost_low, refurb_cost, refurb_cost_high),
+                }, n=RANGE_SAMPLES))
+                band_low, band_high = (
+                    pd.DataFrame(bands[i], columns=STRATEGIES).assign(Year=df_base["Year"]) for i in (0, -1)
+                )
+                return wealth_band_chart(band_low, df_base, band_high)
+
+            fig = memoized_output("wealth_band_chart", build_sampled_bands, band_method)
+
+        st.plotly_chart(fig, width="stretch")
+
+        # --- MONTE CARLO FAN CHART ---
+        if monte_carlo:
+            st.markdown(f"#### Monte Carlo Simulation ({mc_paths:,} paths)")
+            st.markdown("*Outer bands span P5-P95, inner bands P25-P75; lines show the median (P50)*")
+
+            fig_mc = memoized_output("monte_carlo_chart", lambda: monte_carlo_chart(mc_bands))
+            st.plotly_chart(fig_mc, width="stretch")
+
+        # --- MONTHLY PROJECTION WITH MORTGAGE ---
+        if use_mortgage:
+            st.markdown("#### Monthly Projection with Mortgage")
+            st.markdown(f"*\\${financing.loan_balance:,} loan at {financing.mortgage_rate*100:.3g}% over {financing.term_years} years. "
+                        "Wealth is property equity plus reinvested cash for the rent strategies.*")
+
+            fig_monthly = memoized_output("monthly_chart", lambda: monthly_chart(monthly))
+            st.plotly_chart(fig_monthly, width="stretch")
+
+            amortization = memoized_output("amortization", lambda: amortization_table(financing))
+            mort1, mort2, mort3 = st.columns(3)
+            mort1.metric("💳 Monthly Payment", f"${amortization['Payments'].iloc[0] / 12:,.0f}")
+            mort2.metric("🧾 Year 1 Interest Deduction", f"${amortization['Interest'].iloc[0]:,.0f}")
+            mort3.metric("🏦 Balance at Year 25", f"${amortization['Ending Balance'].iloc[-1]:,.0f}")
+
+            with st.expander("Amortization Schedule"):
+                st.dataframe(
+                    amortization.style.format({
+                        "Payments": "${:,.0f}",
+                        "Interest": "${:,.0f}",
+                        "Principal": "${:,.0f}",
+                        "Ending Balance": "${:,.0f}",
+                    }),
+                    width="stretch",
+                    hide_index=True
+                )
+
+        # --- STACKED BAR CHART: Property Value vs Cash ---
+        st.markdown("#### Wealth Composition: Property Value vs Cash/Portfolio")
+
+        fig_breakdown = memoized_output("breakdown_chart", lambda: breakdown_chart(df_base))
+
+        st.plotly_chart(fig_breakdown, width="stretch")
+        st.caption("*Cash assumes reinvested rental income compounds in the market and is not taxed on earnings until withdrawal.*")
+
+        # Find the crossover point for Refurb & Rent, for every pair of strategies at once
+        crossovers = memoized_output("crossovers", lambda: crossover_table(df_base[STRATEGIES]))
+        refurb_vs_sell = crossovers.iloc[PAIRS.index((STRATEGIES.index("Refurb & Rent"), STRATEGIES.index("Sell As-Is")))]
+        crossover_year = refurb_vs_sell["Crossover Year"]
+
+        if pd.notna(crossover_year) and df_base.loc[crossover_year, "Refurb & Rent"] > df_base.loc[crossover_year, "Sell As-Is"]:
+            st.info(f"📈 **Crossover Point:** The 'Refurb & Rent' strategy surpasses 'Sell As-Is' at **Year {crossover_year}**")
+
+        st.markdown("---")
+
+        # Summary Metrics
+        st.subheader("Final Wealth at Year 25")
+        final_low = df_low.iloc[-1]
+        final_high = df_high.iloc[-1]
+
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric(
+                label="🏠 Rent As-Is",
+                value=f"${final['Rent As-Is']:,.0f}"
+            )
+            st.caption(f"Range: ${final_low['Rent As-Is']:,.0f} - ${final_high['Rent As-Is']:,.0f}")
+
+        with col2:
+            st.metric(
+                label="🔨 Refurb & Rent",
+                value=f"${final['Refurb & Rent']:,.0f}"
+            )
+            st.caption(f"Range: ${final_low['Refurb & Rent']:,.0f} - ${final_high['Refurb & Rent']:,.0f}")
+
+        with col3:
+            st.metric(
+                label="💰 Sell As-Is",
+                value=f"${final['Sell As-Is']:,.0f}"
+            )
+            st.caption(f"Range: ${final_low['Sell As-Is']:,.0f} - ${final_high['Sell As-Is']:,.0f}")
+
+        with col4:
+            st.metric(
+                label="🏗️ Refurb & Sell",
+                value=f"${final['Refurb & Sell']:,.0f}"
+            )
+            st.caption(f"Range: ${final_low['Refurb & Sell']:,.0f} - ${final_high['Refurb & Sell']:,.0f}")
+
+        st.markdown("---")
+
+        # Break-Even Analysis
+        st.subheader("⚖️ Break-Even Analysis")
+
+        be1, be2 = st.columns(2)
+
+        with be1:
+            st.markdown("#### Crossover Years")
+            st.markdown("*First year in which each pair of strategies swaps places*")
+            st.dataframe(
+                crossovers.style.format({"Crossover Year": lambda y: "—" if pd.isna(y) else f"Year {y}"}),
+                width="stretch",
+                hide_index=True
+            )
+
+        with be2:
+            breakeven_assumptions()
+
+        st.markdown("---")
+
+        # Strategy Explanation
+        st.subheader("Understanding the Strategies")
+
+        exp1, exp2 = st.columns(2)
+
+        with exp1:
+            st.markdown("#### 🏠 Rent Strategies")
+            st.markdown(f"""
+            **Rent As-Is:** Keep the property in current condition, collect rent, and reinvest
+            the after-tax cash flow into the market.
+
+            **Refurb & Rent (Forced Equity Play):** Invest upfront to unlock higher rent AND
+            immediate equity. The \\${refurb_cost:,} investment creates ~\\${val_refurb - val_as_is:,} in equity
+            while also increasing monthly cash flow by \\${rent_refurb - rent_as_is:,}.
+
+            *Rental income is taxed at {income_tax_rate*100:.0f}% but reduced by the \\${annual_depreciation:,.0f}/yr
+            depreciation shield. Market gains on reinvested cash are tax-free.*
+            """)
+
+        with exp2:
+            st.markdown("#### 💰 Sell Strategies")
+            st.markdown(f"""
+            **Sell As-Is:** Immediately liquidate the property (minus 6% closing costs) and
+            invest the proceeds in the stock market.
 
-    st.markdown("---")
+            **Refurb & Sell:** Spend \\${refurb_cost:,} to increase the sale price from \\${val_as_is:,} to \\${val_refurb:,},
+            then invest the larger proceeds.
 
-    st.subheader("💵 Rental Comparables")
-    st.markdown("""
-    | Address | Sq Ft | Beds/Baths | Monthly Rent | Per Sq Ft | Condition | View |
-    |---------|-------|------------|--------------|-----------|-----------|------|
-    | 144 April Point Dr S | 1,824 | 3/2.5 | \\$2,550 | \\$1.40 | Original (Subject) | Open Water |
-    | 118 April Sound | 1,700 | 3/2 | \\$2,400 | \\$1.41 | Original | Interior |
-    | 160 April Point Dr N | 1,950 | 3/2.5 | \\$2,800 | \\$1.44 | Updated | Lakeside |
-    | 140 April Point Dr S | 1,850 | 3/2.5 | \\$3,200 | \\$1.73 | Renovated | Water View |
-    | 128 April Sound | 2,000 | 4/3 | \\$3,500 | \\$1.75 | Renovated | Interior |
-    """)
-
-    st.info("""
-    **Key Insight:** Renovated units command ~\\$1.73/sq ft vs \\$1.40/sq ft for original condition (~24% premium).
-    Note: No open water view renovated rental comps exist - these premium units tend to sell rather than rent.
-    Refurbished rent estimates are extrapolated from water view comps with a modest view premium.
-    """)
+            *Market gains compound tax-free in this model. These strategies provide immediate
+            liquidity but lose the depreciation tax shield.*
+            """)
 
-    st.markdown("---")
+# ============ TAB 2: RATE ASSUMPTIONS ============
+if tab2.open:
+    with tab2, profiler.section("Rate Assumptions tab"):
+        st.header("Understanding the Rate Assumptions")
+        st.markdown("*Why the default values were chosen and what they mean*")
+
+        rate1, rate2 = st.columns(2)
+
+        with rate1:
+            st.markdown("#### Market Portfolio Return (Default: 6%)")
+            st.markdown("""
+            This represents the expected annual return from investing in a diversified stock portfolio.
+
+            **Historical Context:**
+            - S&P 500 average return (1928-2024): ~10% nominal, ~7% inflation-adjusted
+            - Vanguard Total Stock Market (VTI) 10-year return: ~11%
+            - Conservative estimate accounts for sequence-of-returns risk and fees
+
+            **Why 6%?** A conservative estimate that accounts for inflation, fees, and the reality
+            that future returns may be lower than historical averages. Bumping to 8-10% represents
+            a more optimistic scenario.
+            """)
+
+            st.markdown("#### Property Appreciation (Default: 3%)")
+            st.markdown("""
+            The expected annual increase in your property's market value.
+
+            **Historical Context:**
+            - U.S. national average (1991-2024): ~3.5-4% nominal
+            - Montgomery County, TX (2019-2024): ~5-8% (post-pandemic boom)
+            - Long-term sustainable growth typically tracks inflation + 1%
+
+            **Why 3%?** Conservative baseline that assumes the post-pandemic boom normalizes.
+            Montgomery County's growth may continue above average due to Houston expansion,
+            but 3% is a safe planning assumption.
+            """)
+
+        with rate2:
+            st.markdown("#### Annual Rent Growth (Default: 2.5%)")
+            st.markdown("""
+            How much you can increase rent each year while remaining competitive.
+
+            **Historical Context:**
+            - National average rent growth (2010-2024): ~3-4%
+            - Texas rent growth tends to be slightly lower due to no income tax migration
+            - Rent typically grows slower than property values in appreciating markets
+
+            **Why 2.5%?** Matches historical inflation and represents sustainable growth.
+            Higher rates (3-4%) are achievable in strong markets, but tenant turnover risk
+            increases with aggressive rent increases.
+            """)
+
+            st.markdown("#### Vacancy Rate (Default: 5%)")
+            st.markdown("""
+            Percentage of time the property sits empty (turnover, repairs, finding tenants).
+
+            **Industry Benchmarks:**
+            - Well-managed single-family: 3-5%
+            - Average rental market: 5-8%
+            - Challenging markets: 8-12%
+
+            **Why 5%?** Represents ~18 days/year of vacancy, typical for a desirable property
+            in a good location. A waterside townhouse in April Sound should command strong
+            tenant interest, supporting this conservative estimate.
+            """)
+
+        # --- HISTORICAL BACKTEST ---
+        st.markdown("---")
+        st.subheader("📜 Historical Backtest")
+        st.markdown("*The strategies replayed over every rolling 25-year window of actual U.S. stock returns, "
+                    "home prices and rents, instead of constant rates. Other inputs stay at the sidebar values. "
+                    "The spread between windows is the sequence-of-returns risk the constant rates hide.*")
+
+        # Every window in one batched engine call
+        backtest_years, backtest_wealth = memoized_output("backtest", lambda: backtest(params, load_history()))
+        fig_backtest = memoized_output("backtest_chart", lambda: backtest_chart(backtest_years, backtest_wealth))
+        st.plotly_chart(fig_backtest, width="stretch")
+
+        backtest_table = backtest_summary(backtest_years, backtest_wealth)
+        win_cols = st.columns(len(STRATEGIES))
+        for col, strategy, win_rate in zip(win_cols, backtest_table["Strategy"], backtest_table["Win Rate"]):
+            col.metric(f"🏆 {strategy} Wins", f"{win_rate:.0%}")
+        st.dataframe(
+            backtest_table.style.format({
+                "Win Rate": "{:.0%}",
+                "Median": "${:,.0f}",
+                "Worst": "${:,.0f}",
+                "Best": "${:,.0f}",
+            }),
+            width="stretch",
+            hide_index=True
+        )
+        st.caption("Win rate is the share of windows in which a strategy ends Year 25 with the most wealth. "
+                   "History: S&P 500 total return, Case-Shiller U.S. National Home Price Index and CPI rent of "
+                   "primary residence (annual, bundled with the app).")
 
-    st.subheader("📊 Market Context")
+# ============ TAB 3: COMPARABLES ============
+COMP_TABLE_COLUMNS = {
+    "address": "Address", "sqft": "Sq Ft", "beds": "Beds", "baths": "Baths", "price": "Price",
+    "per_sqft": "Per Sq Ft", "condition": "Condition", "view": "View", "status": "Status",
+}
 
-    ctx1, ctx2 = st.columns(2)
 
-    with ctx1:
-        st.markdown("#### April Sound Community")
-        st.markdown("""
-        - **Location:** Waterside townhomes on Lake Conroe
-        - **Community:** Gated with clubhouse, pools, golf course access
-        - **HOA:** \\$272.56/quarter + \\$73/mo social membership
-        - **Demographics:** Mix of retirees and Houston commuters
-        - **Rental Demand:** Strong due to lake access and amenities
-        """)
+def comps_table(rows, price_label, per_sqft_format):
+    """Comp rows as a dataframe; formatted in the browser so large comp sets stay fast."""
+    st.dataframe(
+        rows[list(COMP_TABLE_COLUMNS)].rename(columns={**COMP_TABLE_COLUMNS, "price": price_label}),
+        column_config={
+            "Sq Ft": st.column_config.NumberColumn(format="%.0f"),
+            "Baths": st.column_config.NumberColumn(format="%g"),
+            price_label: st.column_config.NumberColumn(format="$%.0f"),
+            "Per Sq Ft": st.column_config.NumberColumn(format=per_sqft_format),
+        },
+        width="stretch",
+        hide_index=True,
+    )
 
-    with ctx2:
-        st.markdown("#### Montgomery County, TX Trends")
-        st.markdown("""
-        - **2019-2024 Appreciation:** ~5-8% annually (post-pandemic boom)
-        - **Current Market:** Stabilizing but still above national average
-        - **Population Growth:** Houston metro expanding northward
-        - **Employment:** Strong healthcare, energy, and remote work presence
-        - **Rental Vacancy:** ~4-6% in desirable areas
-        """)
+
+@st.fragment
+def comps_explorer():
+    """Filtered sale and rental comps."""
+    filter1, filter2, filter3 = st.columns(3)
+    with filter1:
+        conditions = st.multiselect("Condition", comp_store.values("condition"), key="comps_condition")
+    with filter2:
+        views = st.multiselect("View", comp_store.values("view"), key="comps_view")
+    with filter3:
+        sold_since = st.date_input("Sold Since", value=None, key="comps_sold_since",
+                                   help="Leave empty to include every sale, dated or not.")
+    filters = {"condition": conditions or None, "view": views or None}
+
+    st.subheader("🏠 Nearby Sales & Listings")
+    comps_table(comp_store.query(kind="sale", since=sold_since, **filters), "Sale Price", "$%.0f")
 
     st.markdown("---")
 
-    st.subheader("🏗️ Refurbishment Value Analysis")
+    st.subheader("💵 Rental Comparables")
+    comps_table(comp_store.query(kind="rental", **filters), "Monthly Rent", "$%.2f")
+
+
+if tab3.open:
+    with tab3, profiler.section("Comparables tab"):
+        st.header("Comparable Properties in April Sound")
+        st.markdown("*Market data to support the value and rent estimates*")
+
+        comps_explorer()
+
+        # Median $/sq ft excluding the subject, computed when the comps are loaded
+        rent_per_sqft = comp_store.medians["condition"]["rental"]
+        rent_premium = comp_store.premium("rental", "condition", "Renovated", "Original")
+        sale_premium = comp_store.premium("sale", "condition", "Renovated", "Original")
+        view_premium = comp_store.premium("sale", "view", "Open Water", "Water View")
+        st.info(f"""
+        **Key Insight:** Renovated units command ~\\${rent_per_sqft['Renovated']:.2f}/sq ft vs \\${rent_per_sqft['Original']:.2f}/sq ft for original condition (~{rent_premium:.0%} premium).
+        Renovated sales carry a ~{sale_premium:.0%} premium per sq ft, and open water views ~{view_premium:.0%} over water views.
+        Note: No open water view renovated rental comps exist - these premium units tend to sell rather than rent.
+        Refurbished rent estimates are extrapolated from water view comps with a modest view premium.
+        """)
 
-    st.markdown(f"""
-    | Metric | As-Is | After Refurb | Gain |
-    |--------|-------|--------------|------|
-    | **Property Value** | \\${val_as_is:,} | \\${val_refurb:,} | +\\${val_refurb - val_as_is:,} |
-    | **Monthly Rent** | \\${rent_as_is:,} | \\${rent_refurb:,} | +\\${rent_refurb - rent_as_is:,}/mo |
-    | **Annual Rent** | \\${rent_as_is * 12:,} | \\${rent_refurb * 12:,} | +\\${(rent_refurb - rent_as_is) * 12:,}/yr |
-    | **Rent per Sq Ft** | \\${rent_as_is / 1824:.2f} | \\${rent_refurb / 1824:.2f} | +\\${(rent_refurb - rent_as_is) / 1824:.2f} |
-    | **Cap Rate** | {((rent_as_is * 12 * 0.65) / val_as_is) * 100:.1f}% | {((rent_refurb * 12 * 0.65) / val_refurb) * 100:.1f}% | - |
-    """)
+        st.markdown("---")
 
-    st.success(f"""
-    **Forced Equity Play:** A \\${refurb_cost:,} investment creates \\${val_refurb - val_as_is:,} in immediate equity
-    (a {((val_refurb - val_as_is) / refurb_cost - 1) * 100:.0f}% return on renovation cost) while also increasing
-    annual rental income by \\${(rent_refurb - rent_as_is) * 12:,}.
-    """)
+        st.subheader("📊 Market Context")
 
-# ============ TAB 4: TAX CONSIDERATIONS ============
-with tab4:
-    st.header("The Tax Advantage of Holding Real Estate")
-
-    # Tax Treatment Summary
-    st.subheader("📋 Tax Treatment in This Model")
-    st.markdown(f"""
-    | Income Type | Tax Rate | Notes |
-    |-------------|----------|-------|
-    | **Rental Income** | {income_tax_rate*100:.0f}% | Reduced by depreciation deduction |
-    | **Depreciation Shield** | -\\${annual_depreciation:,.0f}/yr | Offsets taxable rental income |
-    | **Market Gains (Reinvested Cash)** | 0% | Assumed tax-deferred or long-term |
-    | **Market Gains (Sell Scenarios)** | 0% | Assumed tax-deferred or long-term |
-    """)
+        ctx1, ctx2 = st.columns(2)
 
-    st.markdown("---")
+        with ctx1:
+            st.markdown("#### April Sound Community")
+            st.markdown("""
+            - **Location:** Waterside townhomes on Lake Conroe
+            - **Community:** Gated with clubhouse, pools, golf course access
+            - **HOA:** \\$272.56/quarter + \\$73/mo social membership
+            - **Demographics:** Mix of retirees and Houston commuters
+            - **Rental Demand:** Strong due to lake access and amenities
+            """)
 
-    # Depreciation Section
-    col1, col2 = st.columns(2)
+        with ctx2:
+            st.markdown("#### Montgomery County, TX Trends")
+            st.markdown("""
+            - **2019-2024 Appreciation:** ~5-8% annually (post-pandemic boom)
+            - **Current Market:** Stabilizing but still above national average
+            - **Population Growth:** Houston metro expanding northward
+            - **Employment:** Strong healthcare, energy, and remote work presence
+            - **Rental Vacancy:** ~4-6% in desirable areas
+            """)
 
-    with col1:
-        st.subheader("🏛️ Annual Depreciation Deduction")
-        st.markdown(f"""
-        Based on your tax records, the **Improvement Value** (building only, excluding land) is:
+        st.markdown("---")
 
-        **\\${building_value:,.0f}**
+        st.subheader("🏗️ Refurbishment Value Analysis")
 
-        The IRS allows you to depreciate residential rental property over **27.5 years**.
+        st.markdown(f"""
+        | Metric | As-Is | After Refurb | Gain |
+        |--------|-------|--------------|------|
+        | **Property Value** | \\${val_as_is:,} | \\${val_refurb:,} | +\\${val_refurb - val_as_is:,} |
+        | **Monthly Rent** | \\${rent_as_is:,} | \\${rent_refurb:,} | +\\${rent_refurb - rent_as_is:,}/mo |
+        | **Annual Rent** | \\${rent_as_is * 12:,} | \\${rent_refurb * 12:,} | +\\${(rent_refurb - rent_as_is) * 12:,}/yr |
+        | **Rent per Sq Ft** | \\${rent_as_is / 1824:.2f} | \\${rent_refurb / 1824:.2f} | +\\${(rent_refurb - rent_as_is) / 1824:.2f} |
+        | **Cap Rate** | {((rent_as_is * 12 * 0.65) / val_as_is) * 100:.1f}% | {((rent_refurb * 12 * 0.65) / val_refurb) * 100:.1f}% | - |
         """)
 
         st.success(f"""
-        **Annual Depreciation Deduction: \\${annual_depreciation:,.2f}**
-
-        This "paper loss" reduces your taxable rental income each year.
+        **Forced Equity Play:** A \\${refurb_cost:,} investment creates \\${val_refurb - val_as_is:,} in immediate equity
+        (a {((val_refurb - val_as_is) / refurb_cost - 1) * 100:.0f}% return on renovation cost) while also increasing
+        annual rental income by \\${(rent_refurb - rent_as_is) * 12:,}.
         """)
 
-    with col2:
-        st.subheader("💡 What This Means")
-        # Calculate Year 1 NOI for example
-        yr1_noi = (rent_as_is * 12) - (val_as_is * expense_rate) - hoa_annual
-        yr1_taxable = max(0, yr1_noi - annual_depreciation)
-        yr1_tax_without = yr1_noi * income_tax_rate
-        yr1_tax_with = yr1_taxable * income_tax_rate
+# ============ TAB 4: TAX CONSIDERATIONS ============
+if tab4.open:
+    with tab4, profiler.section("Tax Considerations tab"):
+        st.header("The Tax Advantage of Holding Real Estate")
 
+        # Tax Treatment Summary
+        st.subheader("📋 Tax Treatment in This Model")
         st.markdown(f"""
-        **Year 1 Example (As-Is):**
-
-        | Without Depreciation | With Depreciation |
-        |---------------------|-------------------|
-        | NOI: \\${yr1_noi:,.0f} | NOI: \\${yr1_noi:,.0f} |
-        | Taxable: \\${yr1_noi:,.0f} | Taxable: \\${yr1_taxable:,.0f} |
-        | Tax @ {income_tax_rate*100:.0f}%: \\${yr1_tax_without:,.0f} | Tax @ {income_tax_rate*100:.0f}%: \\${yr1_tax_with:,.0f} |
-
-        **Annual Tax Savings: ~\\${yr1_tax_without - yr1_tax_with:,.0f}**
+        | Income Type | Tax Rate | Notes |
+        |-------------|----------|-------|
+        | **Rental Income** | {income_tax_rate*100:.0f}% | Reduced by depreciation deduction |
+        | **Depreciation Shield** | -\\${annual_depreciation:,.0f}/yr | Offsets taxable rental income |
+        | **Market Gains (Reinvested Cash)** | 0% | Assumed tax-deferred or long-term |
+        | **Market Gains (Sell Scenarios)** | 0% | Assumed tax-deferred or long-term |
         """)
 
-    st.markdown("---")
+        st.markdown("---")
 
-    # Cumulative Tax Shield
-    st.subheader("📊 Cumulative Tax Shield Over Time")
-
-    tax_shield_df = pd.DataFrame({
-        "Year": range(1, 26),
-        "Annual Depreciation": [annual_depreciation] * 25,
-        "Cumulative Depreciation": [annual_depreciation * i for i in range(1, 26)],
-        "Estimated Tax Savings": [annual_depreciation * income_tax_rate * i for i in range(1, 26)]
-    })
-
-    fig_tax = go.Figure()
-    fig_tax.add_trace(go.Bar(
-        x=tax_shield_df["Year"],
-        y=tax_shield_df["Estimated Tax Savings"],
-        name="Cumulative Tax Savings",
-        marker_color="#2ca02c"
-    ))
-    fig_tax.update_layout(
-        title=f"Cumulative Tax Savings from Depreciation (@ {income_tax_rate*100:.0f}% rate)",
-        xaxis_title="Year",
-        yaxis_title="Tax Savings ($)",
-        yaxis_tickformat="$,.0f",
-        height=400
-    )
-    st.plotly_chart(fig_tax, use_container_width=True)
+        # Depreciation Section
+        col1, col2 = st.columns(2)
 
-    st.info(f"""
-    **25-Year Total Depreciation:** \\${annual_depreciation * 25:,.0f}
+        with col1:
+            st.subheader("🏛️ Annual Depreciation Deduction")
+            st.markdown(f"""
+            Based on your tax records, the **Improvement Value** (building only, excluding land) is:
 
-    **Estimated Tax Savings (@ {income_tax_rate*100:.0f}% marginal rate):** \\${annual_depreciation * 25 * income_tax_rate:,.0f}
+            **\\${building_value:,.0f}**
 
-    *Note: Depreciation is "recaptured" at 25% when you eventually sell, but you've had
-    the use of that money for decades of compounding.*
-    """)
+            The IRS allows you to depreciate residential rental property over **27.5 years**.
+            """)
 
-    st.markdown("---")
+            st.success(f"""
+            **Annual Depreciation Deduction: \\${annual_depreciation:,.2f}**
 
-    # Year-by-Year Breakdown Table
-    st.subheader("📋 Year-by-Year Wealth Breakdown (Base Scenario)")
+            This "paper loss" reduces your taxable rental income each year.
+            """)
 
-    display_cols = ["Year", "Rent As-Is", "Refurb & Rent", "Sell As-Is", "Refurb & Sell",
-                   "Property Value (As-Is)", "Cash (As-Is)"]
+        with col2:
+            st.subheader("💡 What This Means")
+            # Calculate Year 1 NOI for example
+            yr1 = year_one_tax_example(params)
+            yr1_noi, yr1_taxable = yr1["noi"], yr1["taxable"]
+            yr1_tax_without, yr1_tax_with = yr1["tax_without"], yr1["tax_with"]
 
-    # Format for display
-    st.dataframe(
-        df_base[display_cols].style.format({
-            "Rent As-Is": "${:,.0f}",
-            "Refurb & Rent": "${:,.0f}",
-            "Sell As-Is": "${:,.0f}",
-            "Refurb & Sell": "${:,.0f}",
-            "Property Value (As-Is)": "${:,.0f}",
-            "Cash (As-Is)": "${:,.0f}",
-        }),
-        use_container_width=True,
-        height=400
-    )
+            st.markdown(f"""
+            **Year 1 Example (As-Is):**
 
-    # Download button
-    csv = df_base.to_csv(index=False)
-    st.download_button(
-        label="📥 Download Full Data as CSV",
-        data=csv,
-        file_name="investment_analysis.csv",
-        mime="text/csv"
-    )
+            | Without Depreciation | With Depreciation |
+            |---------------------|-------------------|
+            | NOI: \\${yr1_noi:,.0f} | NOI: \\${yr1_noi:,.0f} |
+            | Taxable: \\${yr1_noi:,.0f} | Taxable: \\${yr1_taxable:,.0f} |
+            | Tax @ {income_tax_rate*100:.0f}%: \\${yr1_tax_without:,.0f} | Tax @ {income_tax_rate*100:.0f}%: \\${yr1_tax_with:,.0f} |
 
-    st.markdown("---")
+            **Annual Tax Savings: ~\\${yr1_tax_without - yr1_tax_with:,.0f}**
+            """)
 
-    # ROI Comparison
-    st.subheader("📈 Return on Investment Comparison (25yr)")
-
-    roi_data = {
-        "Strategy": ["Rent As-Is", "Refurb & Rent", "Sell As-Is", "Refurb & Sell"],
-        "Initial Investment": [
-            val_as_is,
-            val_as_is + refurb_cost,
-            val_as_is * (1 - selling_costs),
-            val_as_is + refurb_cost
-        ],
-        "Final Value (Yr 25)": [
-            final["Rent As-Is"],
-            final["Refurb & Rent"],
-            final["Sell As-Is"],
-            final["Refurb & Sell"]
-        ]
-    }
-    roi_df = pd.DataFrame(roi_data)
-    roi_df["Total Return"] = roi_df["Final Value (Yr 25)"] - roi_df["Initial Investment"]
-    roi_df["ROI %"] = ((roi_df["Final Value (Yr 25)"] / roi_df["Initial Investment"]) - 1) * 100
-    roi_df["Annualized ROI %"] = ((roi_df["Final Value (Yr 25)"] / roi_df["Initial Investment"]) ** (1/25) - 1) * 100
+        st.markdown("---")
 
-    st.dataframe(
-        roi_df.style.format({
-            "Initial Investment": "${:,.0f}",
-            "Final Value (Yr 25)": "${:,.0f}",
-            "Total Return": "${:,.0f}",
-            "ROI %": "{:.1f}%",
-            "Annualized ROI %": "{:.2f}%"
-        }),
-        use_container_width=True
-    )
+        # Cumulative Tax Shield
+        st.subheader("📊 Cumulative Tax Shield Over Time")
 
-    st.markdown("---")
+        tax_shield_df = memoized_output("tax_shield", lambda: tax_shield_table(params))
 
-    st.subheader("🏛️ Tax Record Information")
-    st.markdown(f"""
-    | Tax Component | Value |
-    |---------------|-------|
-    | **Building/Improvement Value** | \\${building_value:,} |
-    | **Annual Depreciation (27.5 yr)** | \\${annual_depreciation:,.2f} |
-    | **Property Tax Rate** | {property_tax_rate*100:.1f}% |
-    | **Annual Property Tax (As-Is)** | \\${val_as_is * property_tax_rate:,.0f} |
-    """)
+        fig_tax = memoized_output("tax_savings_chart", lambda: tax_savings_chart(tax_shield_df, income_tax_rate))
+        st.plotly_chart(fig_tax, width="stretch")
 
-    st.markdown("---")
+        st.info(f"""
+        **25-Year Total Depreciation:** \\${annual_depreciation * 25:,.0f}
 
-    st.subheader("🌴 The Texas Advantage")
-    st.success("""
-    **No State Income Tax:** Texas has no state income tax, meaning 100% of your
-    rental income and capital gains stay in your pocket at the state level.
+        **Estimated Tax Savings (@ {income_tax_rate*100:.0f}% marginal rate):** \\${annual_depreciation * 25 * income_tax_rate:,.0f}
 
-    **Primary Residence Strategy:** If you or a family member lives in the property
-    for 2 of the 5 years before selling, you can exclude up to \\$250,000 (single) or
-    \\$500,000 (married) of capital gains from federal taxes.
-    """)
-
-# ============ TAB 5: PROPERTY SPECS ============
-with tab5:
-    st.header("Property Details: 144 April Point Dr S")
+        *Note: Depreciation is "recaptured" at 25% when you eventually sell, but you've had
+        the use of that money for decades of compounding.*
+        """)
 
-    col1, col2 = st.columns(2)
+        st.markdown("---")
 
-    with col1:
-        st.subheader("🏠 Physical Characteristics")
+        # --- EXIT TIMING ---
+        st.subheader("🚪 When Should You Sell?")
         st.markdown(f"""
-        | Feature | Value |
-        |---------|-------|
-        | **Square Footage** | 1,824 sq. ft. |
-        | **Location** | Montgomery, TX |
-        | **Community** | April Sound (Waterside) |
-        | **Property Type** | Townhouse |
+        *Year 25 wealth if the property is sold at the end of each year, after {selling_costs*100:.0f}% selling costs,
+        {DEPRECIATION_RECAPTURE_RATE*100:.0f}% recapture of the depreciation claimed so far and {cap_gains_tax*100:.1f}%
+        capital gains tax on the rest of the gain over today's value. Proceeds are invested in the market until Year 25.
+        The sell strategies sell today, so they are flat lines.*
         """)
 
-        st.subheader("💵 Current Valuations")
+        # Every exit year from one model evaluation
+        exits = memoized_output("exit_matrix", lambda: exit_matrix(params, cap_gains_tax))
+        fig_exit = memoized_output("exit_chart", lambda: exit_chart(exits))
+        st.plotly_chart(fig_exit, width="stretch")
+
+        best_exits = optimal_exits(exits)
+        exit1, exit2 = st.columns(2)
+        for col, row in zip((exit1, exit2), best_exits.head(2).to_dict("records")):
+            col.metric(f"🏁 {row['Strategy']}: Best Exit", f"Year {row['Best Exit Year']}",
+                       f"${row['Final Wealth']:,.0f} at Year 25", delta_color="off")
+
+        with st.expander("Exit Year × Strategy Matrix"):
+            st.dataframe(
+                exits.style.format("${:,.0f}").highlight_max(color="#1f6f3f"),
+                width="stretch",
+                height=400
+            )
+
+        st.markdown("---")
+
+        # Year-by-Year Breakdown Table
+        st.subheader("📋 Year-by-Year Wealth Breakdown (Base Scenario)")
+
+        display_cols = ["Year", "Rent As-Is", "Refurb & Rent", "Sell As-Is", "Refurb & Sell",
+                       "Property Value (As-Is)", "Cash (As-Is)"]
+
+        # Format for display
+        with profiler.section("Styled table"):
+            st.dataframe(
+                df_base[display_cols].style.format({
+                    "Rent As-Is": "${:,.0f}",
+                    "Refurb & Rent": "${:,.0f}",
+                    "Sell As-Is": "${:,.0f}",
+                    "Refurb & Sell": "${:,.0f}",
+                    "Property Value (As-Is)": "${:,.0f}",
+                    "Cash (As-Is)": "${:,.0f}",
+                }),
+                width="stretch",
+                height=400
+            )
+
+        # Download button
+        with profiler.section("CSV export"):
+            csv = df_base.to_csv(index=False)
+        st.download_button(
+            label="📥 Download Full Data as CSV",
+            data=csv,
+            file_name="investment_analysis.csv",
+            mime="text/csv"
+        )
+
+        st.markdown("---")
+
+        # ROI Comparison
+        st.subheader("📈 Return on Investment Comparison (25yr)")
+
+        roi_df = memoized_output("roi_table", lambda: roi_table(params, final))
+
+        st.dataframe(
+            roi_df.style.format({
+                "Initial Investment": "${:,.0f}",
+                "Final Value (Yr 25)": "${:,.0f}",
+                "Total Return": "${:,.0f}",
+                "ROI %": "{:.1f}%",
+                "Annualized ROI %": "{:.2f}%"
+            }),
+            width="stretch"
+        )
+
+        st.markdown("---")
+
+        st.subheader("🏛️ Tax Record Information")
         st.markdown(f"""
-        | Condition | Market Value | Monthly Rent |
-        |-----------|--------------|--------------|
-        | **As-Is** | \\${val_as_is_low:,} - \\${val_as_is:,} - \\${val_as_is_high:,} | \\${rent_as_is_low:,} - \\${rent_as_is:,} - \\${rent_as_is_high:,}/mo |
-        | **Refurbished** | \\${val_refurb_low:,} - \\${val_refurb:,} - \\${val_refurb_high:,} | \\${rent_refurb_low:,} - \\${rent_refurb:,} - \\${rent_refurb_high:,}/mo |
+        | Tax Component | Value |
+        |---------------|-------|
+        | **Building/Improvement Value** | \\${building_value:,} |
+        | **Annual Depreciation (27.5 yr)** | \\${annual_depreciation:,.2f} |
+        | **Property Tax Rate** | {property_tax_rate*100:.1f}% |
+        | **Annual Property Tax (As-Is)** | \\${val_as_is * property_tax_rate:,.0f} |
         """)
 
-    with col2:
-        st.subheader("📊 Financial Summary")
+        st.markdown("---")
 
-        # As-Is Annual Numbers
-        annual_rent_as_is = rent_as_is * 12
-        annual_expenses_as_is = (val_as_is * expense_rate) + hoa_annual
-        noi_as_is = annual_rent_as_is - annual_expenses_as_is
-        cap_rate_as_is = (noi_as_is / val_as_is) * 100
+        st.subheader("🌴 The Texas Advantage")
+        st.success("""
+        **No State Income Tax:** Texas has no state income tax, meaning 100% of your
+        rental income and capital gains stay in your pocket at the state level.
 
-        # Refurb Annual Numbers
-        annual_rent_refurb = rent_refurb * 12
-        annual_expenses_refurb = (val_refurb * expense_rate) + hoa_annual
-        noi_refurb = annual_rent_refurb - annual_expenses_refurb
-        cap_rate_refurb = (noi_refurb / val_refurb) * 100
+        **Primary Residence Strategy:** If you or a family member lives in the property
+        for 2 of the 5 years before selling, you can exclude up to \\$250,000 (single) or
+        \\$500,000 (married) of capital gains from federal taxes.
+        """)
 
-        st.markdown(f"""
-        **As-Is Scenario (Year 1):**
-        | Metric | Value |
-        |--------|-------|
-        | Gross Annual Rent | \\${annual_rent_as_is:,} |
-        | Annual Expenses | \\${annual_expenses_as_is:,.0f} |
-        | Net Operating Income | \\${noi_as_is:,.0f} |
-        | Cap Rate | {cap_rate_as_is:.2f}% |
-
-        **Refurbished Scenario (Year 1):**
-        | Metric | Value |
-        |--------|-------|
-        | Gross Annual Rent | \\${annual_rent_refurb:,} |
-        | Annual Expenses | \\${annual_expenses_refurb:,.0f} |
-        | Net Operating Income | \\${noi_refurb:,.0f} |
-        | Cap Rate | {cap_rate_refurb:.2f}% |
+# ============ TAB 5: PROPERTY SPECS ============
+@st.fragment
+def refurb_optimizer():
+    """Refurb optimizer controls and results."""
+    opt1, opt2, opt3 = st.columns(3)
+    with opt1:
+        objective = st.radio("Maximize", list(OBJECTIVES), format_func=OBJECTIVES.get, key="optimizer_objective")
+    with opt2:
+        doubling_gain = st.slider(
+            "Extra Uplift from Doubling the Budget (%)",
+            min_value=5, max_value=95, value=50, step=5, key="optimizer_doubling_gain",
+            help="How much more value and rent uplift twice the base budget buys, as a share of the base uplift. "
+                 "Lower values mean the returns on extra spending fade faster."
+        ) / 100
+    with opt3:
+        max_spend = st.number_input("$ Maximum Spend", min_value=10000, max_value=300000, value=150000, step=5000,
+                                    key="optimizer_max_spend")
+
+    try:
+        curve = UpliftCurve.from_params(params, doubling_gain)
+    except ValueError as exc:
+        st.warning(f"Cannot build the cost-to-uplift curve: {exc}.")
+        return
+
+    def build():
+        # Coarse-to-fine spend search; each round is one batched liquidation call
+        result = optimize_refurb(params, curve, cap_gains_tax, objective, max_spend)
+        fig = refurb_spend_chart(result["spends"], result["best_by_spend"], OBJECTIVES[objective],
+                                 percent=objective == "irr", best=(result["spend"], result["value"]))
+        return result, fig
+
+    result, fig_refurb = memoized_output("refurb_optimizer", build, objective, doubling_gain, max_spend)
+
+    best1, best2, best3, best4 = st.columns(4)
+    best1.metric("🏆 Best Strategy", result["strategy"])
+    best2.metric("🔧 Refurb Spend", f"${result['spend']:,.0f}")
+    best3.metric("🚪 Sell In", "Today" if result["exit_year"] == 0 else f"Year {result['exit_year']}")
+    best4.metric(OBJECTIVES[objective], f"{result['value']:.2%}" if objective == "irr" else f"${result['value']:,.0f}")
+    if "Refurb" in result["strategy"]:
+        st.caption(f"At that spend the curve gives a refurbished value of ${result['val_ref']:,.0f} "
+                   f"and rent of ${result['rent_ref']:,.0f}/mo."
+                   + (" The optimum is at the maximum spend; consider raising it." if result["spend"] >= max_spend else ""))
+
+    st.plotly_chart(fig_refurb, width="stretch")
+
+if tab5.open:
+    with tab5, profiler.section("Property Specs tab"):
+        st.header("Property Details: 144 April Point Dr S")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("🏠 Physical Characteristics")
+            st.markdown(f"""
+            | Feature | Value |
+            |---------|-------|
+            | **Square Footage** | 1,824 sq. ft. |
+            | **Location** | Montgomery, TX |
+            | **Community** | April Sound (Waterside) |
+            | **Property Type** | Townhouse |
+            """)
+
+            st.subheader("💵 Current Valuations")
+            st.markdown(f"""
+            | Condition | Market Value | Monthly Rent |
+            |-----------|--------------|--------------|
+            | **As-Is** | \\${val_as_is_low:,} - \\${val_as_is:,} - \\${val_as_is_high:,} | \\${rent_as_is_low:,} - \\${rent_as_is:,} - \\${rent_as_is_high:,}/mo |
+            | **Refurbished** | \\${val_refurb_low:,} - \\${val_refurb:,} - \\${val_refurb_high:,} | \\${rent_refurb_low:,} - \\${rent_refurb:,} - \\${rent_refurb_high:,}/mo |
+            """)
+
+        with col2:
+            st.subheader("📊 Financial Summary")
+
+            # Year 1 operating numbers for both conditions
+            caps = cap_rate_table(params)
+            annual_rent_as_is, annual_expenses_as_is, noi_as_is, cap_rate_as_is = caps.loc["As-Is"]
+            annual_rent_refurb, annual_expenses_refurb, noi_refurb, cap_rate_refurb = caps.loc["Refurbished"]
+
+            st.markdown(f"""
+            **As-Is Scenario (Year 1):**
+            | Metric | Value |
+            |--------|-------|
+            | Gross Annual Rent | \\${annual_rent_as_is:,.0f} |
+            | Annual Expenses | \\${annual_expenses_as_is:,.0f} |
+            | Net Operating Income | \\${noi_as_is:,.0f} |
+            | Cap Rate | {cap_rate_as_is:.2f}% |
+
+            **Refurbished Scenario (Year 1):**
+            | Metric | Value |
+            |--------|-------|
+            | Gross Annual Rent | \\${annual_rent_refurb:,.0f} |
+            | Annual Expenses | \\${annual_expenses_refurb:,.0f} |
+            | Net Operating Income | \\${noi_refurb:,.0f} |
+            | Cap Rate | {cap_rate_refurb:.2f}% |
+            """)
+
+        st.markdown("---")
+
+        # --- REFURB OPTIMIZER ---
+        st.subheader("🔧 How Much Should You Spend on the Refurb?")
+        st.markdown("*Spending more raises the refurbished value and rent with diminishing returns, anchored at your "
+                    "base budget, value and rent. The optimizer searches refurb spend, strategy and exit year "
+                    "(after selling costs and taxes, as in the Tax Considerations tab).*")
+
+        refurb_optimizer()
+
+# ============ TAB 6: SENSITIVITY ============
+def input_range_slider(name, label, key):
+    """Range slider over an input's full sidebar range, shown in % for rates."""
+    spec = INPUT_RANGES[name]
+    scale = 100 if spec.percent else 1
+    low, high = spec.low * scale, spec.high * scale
+    bounds = st.slider(
+        f"{label} ({'%' if spec.percent else '$'})",
+        min_value=float(low), max_value=float(high), value=(float(low), float(high)),
+        step=float(spec.step * scale), key=key
+    )
+    return bounds[0] / scale, bounds[1] / scale
+
+
+@st.fragment
+def sweep_heatmap():
+    """Two-way sweep controls and heatmap."""
+    sweep_names = list(INPUT_RANGES)
+    label_of = lambda name: INPUT_RANGES[name].label
+
+    sens1, sens2 = st.columns(2)
+    with sens1:
+        x_name = st.selectbox("X-Axis Input", sweep_names, index=sweep_names.index("market_return"),
+                              format_func=label_of, key="sweep_x")
+        x_bounds = input_range_slider(x_name, "X Range", key=f"sweep_x_range_{x_name}")
+        strategy_a = st.selectbox("Strategy A", STRATEGIES, index=1, key="sweep_a")
+    with sens2:
+        y_names = [name for name in sweep_names if name != x_name]
+        y_name = st.selectbox("Y-Axis Input", y_names,
+                              index=y_names.index("appreciation") if "appreciation" in y_names else 0,
+                              format_func=label_of, key="sweep_y")
+        y_bounds = input_range_slider(y_name, "Y Range", key=f"sweep_y_range_{y_name}")
+        strategy_b = st.selectbox("Strategy B", STRATEGIES, index=2, key="sweep_b")
+
+    grid_size = st.slider("Grid Resolution (points per axis)", min_value=50, max_value=300, value=200, step=25,
+                          key="sweep_grid_size")
+
+    if strategy_a == strategy_b:
+        st.warning("Choose two different strategies to compare.")
+    else:
+        x_values = np.linspace(*x_bounds, grid_size)
+        y_values = np.linspace(*y_bounds, grid_size)
+
+        # One batched engine call for the whole grid
+        sweep = memoized_output(
+            "sweep", lambda: sweep_grid(params, x_name, x_values, y_name, y_values),
+            x_name, x_bounds, y_name, y_bounds, grid_size,
+        )
+        diff = strategy_difference(sweep, strategy_a, strategy_b)
+
+        x_scale = 100 if INPUT_RANGES[x_name].percent else 1
+        y_scale = 100 if INPUT_RANGES[y_name].percent else 1
+        x_axis, y_axis = x_values * x_scale, y_values * y_scale
+        x_title = f"{label_of(x_name)} ({'%' if x_scale == 100 else '$'})"
+        y_title = f"{label_of(y_name)} ({'%' if y_scale == 100 else '$'})"
+
+        fig_sens = go.Figure()
+        fig_sens.add_trace(go.Heatmap(
+            x=x_axis,
+            y=y_axis,
+            z=diff,
+            colorscale="RdBu",
+            zmid=0,
+            colorbar=dict(title="Difference ($)", tickformat="$,.0f"),
+            hovertemplate=f"{x_title}: %{{x:,.2f}}<br>{y_title}: %{{y:,.2f}}<br>" +
+                          f"{strategy_a} − {strategy_b}: $%{{z:,.0f}}<extra></extra>"
+        ))
+        # Indifference contour where both strategies end with equal wealth
+        fig_sens.add_trace(go.Contour(
+            x=x_axis,
+            y=y_axis,
+            z=diff,
+            contours=dict(start=0, end=0, size=1, coloring="lines"),
+            line=dict(color="black", width=3),
+            showscale=False,
+            name="Indifference",
+            hoverinfo="skip"
+        ))
+        fig_sens.add_trace(go.Scatter(
+            x=[getattr(params, x_name) * x_scale],
+            y=[getattr(params, y_name) * y_scale],
+            mode="markers",
+            marker=dict(size=14, color="#ffd700", symbol="star", line=dict(width=1, color="black")),
+            name="Current Inputs",
+            hovertemplate="Current inputs<extra></extra>"
+        ))
+        fig_sens.update_layout(
+            title=f"Year 25 Wealth: {strategy_a} − {strategy_b}",
+            xaxis_title=x_title,
+            yaxis_title=y_title,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+            height=600
+        )
+        st.plotly_chart(fig_sens, width="stretch")
+
+        share_a = (diff > 0).mean() * 100
+        st.info(f"""
+        **{strategy_a}** ends ahead of **{strategy_b}** on **{share_a:.0f}%** of this grid (blue region).
+        The black line marks where both strategies finish Year 25 with equal wealth.
         """)
 
+
+@st.fragment
+def tornado_sensitivity():
+    """Tornado chart for the selected strategy."""
+    tornado_strategy = st.selectbox("Strategy", STRATEGIES, index=1, key="tornado_strategy")
+
+    tornado_bounds = {name: (spec.low, spec.high) for name, spec in INPUT_RANGES.items()} | {
+        "val_asis": (val_as_is_low, val_as_is_high),
+        "val_ref": (val_refurb_low, val_refurb_high),
+        "rent_asis": (rent_as_is_low, rent_as_is_high),
+        "rent_ref": (rent_refurb_low, rent_refurb_high),
+        "refurb": (refurb_cost_low, refurb_cost_high),
+    }
+    tornado_names, tornado_wealth = memoized_output("tornado", lambda: tornado(params, bounds=tornado_bounds))
+    tornado_idx = STRATEGIES.index(tornado_strategy)
+    base_final = final[tornado_strategy]
+    low_delta = tornado_wealth[:, 0, tornado_idx] - base_final
+    high_delta = tornado_wealth[:, 1, tornado_idx] - base_final
+
+    # Smallest swing first so the most influential input ends up on top
+    order = np.argsort(np.abs(high_delta - low_delta), kind="stable")
+    tornado_labels = [INPUT_RANGES[tornado_names[i]].label for i in order]
+
+    def bound_text(name, value):
+        return f"{value * 100:.2f}%" if INPUT_RANGES[name].percent else f"${value:,.0f}"
+
+    fig_tornado = go.Figure()
+    for side, delta, color, label in [(0, low_delta, "#d62728", "Low Bound"), (1, high_delta, "#2ca02c", "High Bound")]:
+        bound_values = [bound_text(tornado_names[i], tornado_bounds[tornado_names[i]][side]) for i in order]
+        fig_tornado.add_trace(go.Bar(
+            y=tornado_labels,
+            x=delta[order],
+            base=base_final,
+            orientation="h",
+            name=label,
+            marker_color=color,
+            customdata=list(zip(bound_values, base_final + delta[order])),
+            hovertemplate="<b>%{y}</b> = %{customdata[0]}<br>" +
+                          "Year 25 Wealth: $%{customdata[1]:,.0f}<br>" +
+                          "Change: $%{x:+,.0f}<extra></extra>"
+        ))
+
+    fig_tornado.update_layout(
+        title=f"Sensitivity of {tornado_strategy} (Base: ${base_final:,.0f})",
+        barmode="overlay",
+        xaxis_title="Year 25 Wealth ($)",
+        xaxis_tickformat="$,.0f",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        height=max(400, 40 * len(tornado_labels))
+    )
+    fig_tornado.add_vline(x=base_final, line_width=2, line_color="#fafafa")
+    st.plotly_chart(fig_tornado, width="stretch")
+
+@st.fragment
+def explore_input():
+    """Every slider step of one input as animation frames; scrubbing them never reruns the app."""
+    explore_names = list(INPUT_RANGES)
+    explore_name = st.selectbox("Input", explore_names, index=explore_names.index("market_return"),
+                                format_func=lambda name: INPUT_RANGES[name].label, key="explore_input")
+    spec = INPUT_RANGES[explore_name]
+
+    def build():
+        # All steps in one batched engine call
+        values, wealth = step_sweep(params, explore_name)
+        labels = [f"{v * 100:.2f}%" if spec.percent else f"${v:,.0f}" for v in values]
+        active = int(np.abs(values - getattr(params, explore_name)).argmin())
+        return sweep_animation(labels, wealth, spec.label, active)
+
+    st.plotly_chart(memoized_output("explore_chart", build, explore_name), width="stretch")
+
+if tab6.open:
+    with tab6, profiler.section("Sensitivity tab"):
+        st.header("Two-Way Sensitivity Analysis")
+        st.markdown("*Sweep any two assumptions and compare two strategies at Year 25. All other inputs stay at the sidebar values.*")
+
+        sweep_heatmap()
+
+        st.markdown("---")
+
+        # --- TORNADO CHART ---
+        st.subheader("🌪️ Which Assumptions Matter Most?")
+        st.markdown("*Year 25 wealth with each input pushed to its low or high bound while the others stay at base. "
+                    "Values and rents use your low/high entries; other inputs use their full slider range.*")
+
+        tornado_sensitivity()
+
+        st.markdown("---")
+
+        # --- ANIMATED SWEEP ---
+        st.subheader("🎞️ Explore One Input")
+        st.markdown("*Drag the slider under the chart (or press ▶) to step one input through its whole range "
+                    "with everything else at the sidebar values. All steps are precomputed, so scrubbing is instant.*")
+
+        explore_input()
+
+# ============ TAB 7: PORTFOLIO ============
+@st.fragment
+def portfolio_analysis(template_csv):
+    """Upload, evaluation and ranking of a property CSV."""
+    up1, up2 = st.columns([3, 1])
+    with up1:
+        portfolio_file = st.file_uploader("Upload Property CSV", type="csv", key="portfolio_csv")
+    with up2:
+        st.download_button(
+            label="📄 Download CSV Template",
+            data=template_csv,
+            file_name="portfolio_template.csv",
+            mime="text/csv"
+        )
+        st.caption("*_low / _high columns are optional and default to the base value.*")
+
+    if portfolio_file is None:
+        st.info("Upload a CSV with one row per property to see the portfolio wealth curve and per-property ranking.")
+    elif tab7.open:
+        portfolio_bytes = portfolio_file.getvalue()
+        try:
+            properties = load_properties(portfolio_file)
+        except ValueError as exc:
+            st.error(f"Could not read the property CSV: {exc}")
+        else:
+            # Every property x strategy x scenario in one batched engine call
+            portfolio_wealth = memoized_output(
+                "portfolio", lambda: evaluate_portfolio(params, properties),
+                hashlib.sha256(portfolio_bytes).hexdigest(),
+            )
+            totals = portfolio_totals(portfolio_wealth)
+            ranking = property_ranking(properties, portfolio_wealth)
+
+            pm1, pm2, pm3 = st.columns(3)
+            pm1.metric("🏢 Properties", f"{len(properties):,}")
+            pm2.metric("💵 Portfolio Value (As-Is, Today)", f"${properties['val_asis'].sum():,.0f}")
+            pm3.metric("🏆 Year 25 (Best per Property)", f"${totals[1, -1, -1]:,.0f}")
+
+            st.plotly_chart(portfolio_chart(totals), width="stretch")
+
+            st.subheader("📋 Per-Property Ranking (Year 25, Base Scenario)")
+            st.markdown("*Click a column header to sort. Best (Low) / Best (High) show the highest wealth of any strategy under the pessimistic and optimistic inputs.*")
+            # Formatted in the browser via column_config; a pandas Styler is too slow for thousands of rows
+            money_cols = STRATEGIES + ["Edge vs Next Best", "Best (Low)", "Best (High)"]
+            st.dataframe(
+                ranking,
+                column_config={col: st.column_config.NumberColumn(col, format="$%.0f") for col in money_cols},
+                width="stretch",
+                hide_index=True,
+                height=400
+            )
+
+            best_counts = ranking["Best Strategy"].value_counts()
+            st.caption(" · ".join(f"**{strategy}** best for {best_counts.get(strategy, 0):,}" for strategy in STRATEGIES))
+
+
+# The uploader renders even while the tab is hidden so the uploaded file is kept;
+# only the portfolio evaluation waits until the tab is opened
+with tab7, profiler.section("Portfolio tab"):
+    st.header("Portfolio Analysis")
+    st.markdown("*Evaluate many properties at once. Market, expense and tax assumptions come from the sidebar; "
+                "each property brings its own values, rents, refurb budget and building value.*")
+
+    # Template pre-filled with this property's sidebar ranges
+    template = pd.DataFrame([{
+        "property": "144 April Point Dr S",
+        "val_asis_low": val_as_is_low, "val_asis": val_as_is, "val_asis_high": val_as_is_high,
+        "val_ref_low": val_refurb_low, "val_ref": val_refurb, "val_ref_high": val_refurb_high,
+        "rent_asis_low": rent_as_is_low, "rent_asis": rent_as_is, "rent_asis_high": rent_as_is_high,
+        "rent_ref_low": rent_refurb_low, "rent_ref": rent_refurb, "rent_ref_high": rent_refurb_high,
+        "refurb_low": refurb_cost_low, "refurb": refurb_cost, "refurb_high": refurb_cost_high,
+        "building_value": building_value,
+    }])
+
+    with profiler.section("CSV export"):
+        template_csv = template.to_csv(index=False)
+
+    portfolio_analysis(template_csv)
+
 # --- FOOTER ---
 st.markdown("---")
 st.markdown("""
@@ -977,3 +1739,42 @@ st.markdown("""
     <p>Built by Theo Douwes</p>
 </div>
 """, unsafe_allow_html=True)
+
+# --- SPECULATIVE PREFETCH ---
+# Once this run is drawn, precompute the scenarios a slider step or two away
+# in the background, so the next drag of a rate slider lands on a cache hit
+if prefetch_steps:
+    st.session_state["prefetch_cancel"] = get_prefetcher().submit(
+        (scenario_key(p), partial(run_scenario, p))
+        for p in neighbor_params([params, params_low, params_high], steps=prefetch_steps)
+    )
+
+# --- PROFILER OUTPUT ---
+if profiler.enabled:
+    st.session_state.setdefault("profile_session", os.urandom(6).hex())
+    st.session_state["profile_run"] = st.session_state.get("profile_run", 0) + 1
+
+    st.sidebar.markdown("---")
+    st.sidebar.header("⏱️ Rerun Profile")
+    st.sidebar.caption(f"Script run {st.session_state['profile_run']:,} took {profiler.total() * 1000:,.0f} ms")
+    st.sidebar.dataframe(
+        profiler.table(),
+        column_config={
+            "ms": st.column_config.NumberColumn(format="%.1f"),
+            "Share": st.column_config.ProgressColumn(format="percent", min_value=0.0, max_value=1.0),
+        },
+        hide_index=True,
+        width="stretch",
+    )
+
+    # One JSON line per rerun so latency can be compared across sessions
+    profile_log = os.environ.get("APP_PROFILE_LOG", "profile_log.jsonl")
+    try:
+        profiler.append_log(
+            profile_log,
+            session=st.session_state["profile_session"],
+            run=st.session_state["profile_run"],
+            cache=result_cache.stats(),
+        )
+    except OSError as exc:
+        st.sidebar.warning(f"Could not write the profile log to {profile_log}: {exc}")
@@ -0,0 +1,37 @@
+"""Investment model for 144 April Point Dr S, usable without the Streamlit UI."""
+from .cache import ResultCache, fingerprint, snapshot
+from .engine import (
+    BUILDING_VALUE,
+    DEPRECIATION_RECAPTURE_RATE,
+    DEPRECIATION_YEARS,
+    PERCENTILES,
+    SELLING_COSTS,
+    STRATEGIES,
+    ScenarioParams,
+    percentile_bands,
+    run_batch,
+    run_scenario,
+    simulate_paths,
+)
+from .metrics import cap_rate_table, roi_table, tax_shield_table, year_one_tax_example
+
+__all__ = [
+    "BUILDING_VALUE",
+    "DEPRECIATION_RECAPTURE_RATE",
+    "DEPRECIATION_YEARS",
+    "PERCENTILES",
+    "SELLING_COSTS",
+    "STRATEGIES",
+    "ResultCache",
+    "ScenarioParams",
+    "cap_rate_table",
+    "fingerprint",
+    "percentile_bands",
+    "roi_table",
+    "run_batch",
+    "run_scenario",
+    "simulate_paths",
+    "snapshot",
+    "tax_shield_table",
+    "year_one_tax_example",
+]
@@ -0,0 +1,71 @@
+"""Historical backtest: the four strategies over every rolling window of market history."""
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .engine import STRATEGIES
+from .graph import evaluate, growth_index, prepare_inputs
+
+HISTORY_CSV = Path(__file__).parent / "data" / "market_history.csv"
+HISTORY_COLUMNS = ["year", "equity_return_pct", "home_price_pct", "rent_pct"]
+
+
+def load_history(source=HISTORY_CSV):
+    """Read a market history CSV (bundled by default) into a DataFrame sorted by year.
+
+    Percent columns are kept as given; years must be consecutive.
+    """
+    import pandas as pd
+
+    history = pd.read_csv(source, comment="#")
+    missing = [c for c in HISTORY_COLUMNS if c not in history.columns]
+    if missing:
+        raise ValueError(f"Market history CSV is missing columns: {', '.join(missing)}")
+    history = history[HISTORY_COLUMNS].sort_values("year").reset_index(drop=True)
+    if (np.diff(history["year"]) != 1).any():
+        raise ValueError("Market history years must be consecutive")
+    return history
+
+
+def backtest(params, history, years=25):
+    """Wealth for every rolling years-long window of history, evaluated in one batch.
+
+    Each window replaces the constant market_return, appreciation and rent_growth
+    of params with the realized yearly rates, starting in its first year; the
+    windows are strided views of the history, so no rate is copied per window.
+    Returns (start_years, wealth) with wealth shaped (windows, years + 1, strategies).
+    """
+    if len(history) < years:
+        raise ValueError(f"Market history covers {len(history)} years, fewer than the {years}-year horizon")
+
+    def windows(column):
+        return sliding_window_view(history[column].to_numpy(dtype=float) / 100, years)[..., None]
+
+    _, inputs = prepare_inputs(years, **params.engine_inputs())
+    wealth = evaluate(
+        ["strategies"],
+        **inputs,
+        market_index=growth_index(windows("equity_return_pct")),
+        value_index=growth_index(windows("home_price_pct")),
+        # Rent is first collected at its base level in year 1
+        rent_index=growth_index(windows("rent_pct"), skip=1),
+    )["strategies"]
+    return history["year"].to_numpy()[:len(wealth)], wealth
+
+
+def backtest_summary(start_years, wealth):
+    """Final-wealth statistics and win rate of each strategy across the windows, as a DataFrame."""
+    import pandas as pd
+
+    final = wealth[:, -1, :]
+    wins = np.bincount(final.argmax(axis=1), minlength=len(STRATEGIES)) / len(final)
+    return pd.DataFrame({
+        "Strategy": STRATEGIES,
+        "Win Rate": wins,
+        "Median": np.median(final, axis=0),
+        "Worst": final.min(axis=0),
+        "Worst Start": start_years[final.argmin(axis=0)],
+        "Best": final.max(axis=0),
+        "Best Start": start_years[final.argmax(axis=0)],
+    })
@@ -0,0 +1,163 @@
+"""Score many scenario definitions from the command line.
+
+Reads a JSON list or CSV of scenarios using the ScenarioParams field names
+(rates as fractions, e.g. 0.06), evaluates them in chunks across a process
+pool and streams one row per scenario-year to a Parquet or Arrow file:
+
+    python -m april_sound.batch scenarios.csv -o results.parquet --workers 8
+
+An optional scenario_id column is carried through to the output; otherwise
+scenarios are numbered by their position in the input.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import MISSING, fields
+from pathlib import Path
+
+import numpy as np
+
+from .engine import STRATEGIES, ScenarioParams, run_batch
+
+PARAM_FIELDS = {f.name: f.default for f in fields(ScenarioParams)}
+
+
+def load_scenarios(path):
+    """Read scenario definitions into columns of float arrays plus their ids."""
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        with open(path) as f:
+            rows = json.load(f)
+    elif path.suffix.lower() == ".csv":
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        raise ValueError(f"Unsupported scenario file {path}: expected .json or .csv")
+
+    unknown = {key for row in rows for key in row} - set(PARAM_FIELDS) - {"scenario_id"}
+    if unknown:
+        raise ValueError(f"Unknown scenario fields: {', '.join(sorted(unknown))}")
+
+    columns = {}
+    for name, default in PARAM_FIELDS.items():
+        values = []
+        for i, row in enumerate(rows):
+            value = row.get(name, "")
+            if value in ("", None):
+                if default is MISSING:
+                    raise ValueError(f"Scenario {i} is missing required field '{name}'")
+                value = default
+            values.append(float(value))
+        columns[name] = np.array(values)
+
+    if any("scenario_id" in row for row in rows):
+        ids = np.array([str(row.get("scenario_id", i)) for i, row in enumerate(rows)])
+    else:
+        ids = np.arange(len(rows))
+    return ids, columns
+
+
+def evaluate_chunk(ids, columns, years=25):
+    """Long-format results for one chunk: one row per scenario and year."""
+    wealth = run_batch(**ScenarioParams(**columns).engine_inputs(), years=years)
+    n_years = years + 1
+    result = {
+        "scenario_id": np.repeat(ids, n_years),
+        "year": np.tile(np.arange(n_years), len(ids)),
+    }
+    flat = wealth.reshape(-1, len(STRATEGIES))
+    for i, strategy in enumerate(STRATEGIES):
+        result[strategy] = flat[:, i]
+    return result
+
+
+def _open_writer(output, schema):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if Path(output).suffix.lower() in (".arrow", ".feather", ".ipc"):
+        return pa.ipc.new_file(output, schema)
+    return pq.ParquetWriter(output, schema)
+
+
+def run(input_path, output, workers=None, chunk_size=1000, years=25, progress=True):
+    """Evaluate every scenario in input_path and stream the results to output."""
+    import pyarrow as pa
+
+    ids, columns = load_scenarios(input_path)
+    total = len(ids)
+    workers = workers or os.cpu_count() or 1
+    chunks = [
+        (ids[start:start + chunk_size], {k: v[start:start + chunk_size] for k, v in columns.items()})
+        for start in range(0, total, chunk_size)
+    ]
+
+    writer = None
+    done = 0
+    started = time.perf_counter()
+
+    def write(result):
+        nonlocal writer, done
+        table = pa.table(result)
+        if writer is None:
+            writer = _open_writer(output, table.schema)
+        writer.write_table(table)
+        done += len(result["year"]) // (years + 1)
+        if progress:
+            rate = done / max(time.perf_counter() - started, 1e-9)
+            print(f"\r{done:,}/{total:,} scenarios ({rate:,.0f}/s)", end="", file=sys.stderr, flush=True)
+
+    try:
+        if workers == 1:
+            for chunk_ids, chunk_columns in chunks:
+                write(evaluate_chunk(chunk_ids, chunk_columns, years))
+        else:
+            # Keep only a few chunks in flight so results never pile up in memory
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = set()
+                for chunk_ids, chunk_columns in chunks:
+                    pending.add(pool.submit(evaluate_chunk, chunk_ids, chunk_columns, years))
+                    if len(pending) >= 2 * workers:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            write(future.result())
+                for future in pending:
+                    write(future.result())
+    finally:
+        if writer is not None:
+            writer.close()
+        if progress:
+            print(file=sys.stderr)
+
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m april_sound.batch",
+        description="Evaluate scenario definitions and write wealth paths to Parquet/Arrow.",
+    )
+    parser.add_argument("input", help="JSON list or CSV of scenarios (ScenarioParams fields)")
+    parser.add_argument("-o", "--output", default="results.parquet",
+                        help="Output file; .arrow/.feather writes Arrow IPC, anything else Parquet")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count; 1 runs in-process)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Scenarios per task")
+    parser.add_argument("--years", type=int, default=25, help="Projection horizon")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Disable progress output")
+    args = parser.parse_args(argv)
+
+    try:
+        count = run(args.input, args.output, workers=args.workers, chunk_size=args.chunk_size,
+                    years=args.years, progress=not args.quiet)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    print(f"Wrote {count:,} scenarios to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Break-even analysis: when and under which assumptions strategies swap order."""
+from dataclasses import replace
+from itertools import combinations
+
+import numpy as np
+
+from .engine import STRATEGIES, run_batch
+from .sensitivity import INPUT_RANGES
+
+# Every unordered pair of strategies, as indices into STRATEGIES
+PAIRS = list(combinations(range(len(STRATEGIES)), 2))
+_FIRST, _SECOND = np.array(PAIRS).T
+
+
+def crossover_years(wealth):
+    """First year each pair swaps order, shaped (..., len(PAIRS)); -1 if never.
+
+    wealth is shaped (..., years + 1, strategies) as returned by run_batch.
+    """
+    sign = np.sign(wealth[..., _FIRST] - wealth[..., _SECOND])
+    flips = (sign[..., 1:, :] != sign[..., :-1, :]) & (sign[..., 1:, :] != 0)
+    return np.where(flips.any(axis=-2), flips.argmax(axis=-2) + 1, -1)
+
+
+def _pair_difference(params, name, values, year):
+    """Year-`year` wealth of each pair's first minus second strategy.
+
+    values holds one input value per pair along the last axis.
+    """
+    wealth = run_batch(**replace(params, **{name: values}).engine_inputs(), years=year)[..., -1, :]
+    pair = np.arange(len(PAIRS))
+    return wealth[..., pair, _FIRST] - wealth[..., pair, _SECOND]
+
+
+def breakeven_thresholds(params, name, low=None, high=None, year=25, grid_points=129, iterations=40):
+    """Value of one input at which each pair of strategies ties at `year`.
+
+    A coarse grid over [low, high] (defaulting to the input's sidebar range)
+    brackets the first sign change for every pair in one batch, then bisection
+    refines all pairs together. Returns (thresholds, first_wins_above), with
+    NaN thresholds for pairs that never tie inside the range.
+    """
+    spec = INPUT_RANGES[name]
+    low = spec.low if low is None else low
+    high = spec.high if high is None else high
+    n_pairs = len(PAIRS)
+    pair = np.arange(n_pairs)
+
+    grid = np.linspace(low, high, grid_points)
+    diff = _pair_difference(params, name, np.broadcast_to(grid[:, None], (grid_points, n_pairs)), year)
+    sign = np.sign(diff)
+    # A tie landing exactly on a grid point brackets from that point onward
+    flips = (sign[1:] != sign[:-1]) & (sign[1:] != 0)
+    found = flips.any(axis=0)
+    k = flips.argmax(axis=0)
+
+    lo, hi = grid[k], grid[k + 1]
+    sign_lo = sign[k, pair]
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        same = np.sign(_pair_difference(params, name, mid, year)) == sign_lo
+        lo = np.where(same, mid, lo)
+        hi = np.where(same, hi, mid)
+
+    thresholds = np.where(found, (lo + hi) / 2, np.nan)
+    return thresholds, found & (sign[k + 1, pair] > 0)
+
+
+def crossover_table(wealth):
+    """Crossover year and final leader for every pair, from one run_scenario frame or array."""
+    import pandas as pd
+
+    wealth = np.asarray(wealth)
+    years = crossover_years(wealth)
+    final = wealth[-1]
+    return pd.DataFrame({
+        "Strategy A": [STRATEGIES[a] for a, _ in PAIRS],
+        "Strategy B": [STRATEGIES[b] for _, b in PAIRS],
+        "Crossover Year": pd.array([y if y >= 0 else None for y in years], dtype="Int64"),
+        f"Leader at Year {len(wealth) - 1}": [
+            STRATEGIES[a] if final[a] >= final[b] else STRATEGIES[b] for a, b in PAIRS
+        ],
+    })
+
+
+def threshold_table(params, name, year=25, **kwargs):
+    """breakeven_thresholds for every pair as a DataFrame."""
+    import pandas as pd
+
+    thresholds, first_wins_above = breakeven_thresholds(params, name, year=year, **kwargs)
+    return pd.DataFrame({
+        "Strategy A": [STRATEGIES[a] for a, _ in PAIRS],
+        "Strategy B": [STRATEGIES[b] for _, b in PAIRS],
+        "Break-Even Value": thresholds,
+        "Wins Above": [
+            None if np.isnan(t) else STRATEGIES[a] if above else STRATEGIES[b]
+            for t, above, (a, b) in zip(thresholds, first_wins_above, PAIRS)
+        ],
+    })
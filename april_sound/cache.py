@@ -0,0 +1,98 @@
+"""Bounded, thread-safe result cache shared by every app session."""
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import asdict, is_dataclass
+
+
+class ResultCache:
+    """Thread-safe LRU cache with an optional time-to-live and hit/miss counters.
+
+    clock returns the current time in seconds; it defaults to time.monotonic
+    and can be replaced, e.g. by a fake clock in tests.
+    """
+
+    def __init__(self, max_entries=256, ttl=None, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.warmed = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss.
+
+        An expired entry is dropped on lookup, even if compute then raises.
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self.ttl is None or now - entry[0] < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            self.misses += 1
+
+        # Compute outside the lock so other sessions are not blocked meanwhile
+        value = compute()
+        self._store(key, now, value)
+        return value
+
+    def warm(self, key, compute):
+        """Compute and store key ahead of a request unless already cached.
+
+        Not counted as a hit or a miss; returns True if a value was computed.
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl is None or now - entry[0] < self.ttl):
+                return False
+        self._store(key, now, compute())
+        with self._lock:
+            self.warmed += 1
+        return True
+
+    def discard(self, key):
+        """Drop key if cached; not counted as an eviction."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _store(self, key, now, value):
+        with self._lock:
+            self._entries[key] = (now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "warmed": self.warmed,
+                "entries": len(self._entries),
+            }
+
+
+def snapshot(**inputs):
+    """Canonical, hashable key for a set of model inputs."""
+    return tuple(sorted((name, round(float(value), 10)) for name, value in inputs.items()))
+
+
+def fingerprint(value):
+    """Hashable key for one model input: a dataclass, a mapping or a number."""
+    if is_dataclass(value):
+        return snapshot(**asdict(value))
+    if isinstance(value, Mapping):
+        return snapshot(**value)
+    return round(float(value), 10)
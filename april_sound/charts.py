@@ -0,0 +1,489 @@
+"""Plotly figures shared by the app and the benchmark suite."""
+import numpy as np
+import plotly.graph_objects as go
+
+from .engine import STRATEGIES
+
+STRATEGY_COLORS = {
+    "Rent As-Is": "#1f77b4",      # Blue
+    "Refurb & Rent": "#2ca02c",   # Green
+    "Sell As-Is": "#ff7f0e",      # Orange
+    "Refurb & Sell": "#e377c2"    # Pink
+}
+
+
+def wealth_band_chart(df_low, df_base, df_high):
+    """Base-case wealth lines with shaded low/high uncertainty bands."""
+    fig = go.Figure()
+
+    # Add uncertainty bands (fill between low and high)
+    for col in STRATEGIES:
+        # Upper bound (high scenario)
+        fig.add_trace(go.Scatter(
+            x=df_high['Year'],
+            y=df_high[col],
+            mode='lines',
+            line=dict(width=0),
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+
+        # Lower bound with fill to upper (creates the band)
+        hex_color = STRATEGY_COLORS[col]
+        rgba_fill = f"rgba({int(hex_color[1:3], 16)}, {int(hex_color[3:5], 16)}, {int(hex_color[5:7], 16)}, 0.2)"
+        fig.add_trace(go.Scatter(
+            x=df_low['Year'],
+            y=df_low[col],
+            mode='lines',
+            line=dict(width=0),
+            fill='tonexty',
+            fillcolor=rgba_fill,
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+
+    # Add main lines (base scenario)
+    for col in STRATEGIES:
+        fig.add_trace(go.Scatter(
+            x=df_base['Year'],
+            y=df_base[col],
+            name=col,
+            mode='lines+markers',
+            line=dict(width=3, color=STRATEGY_COLORS[col]),
+            marker=dict(size=6),
+            hovertemplate=f"<b>{col}</b><br>Year: %{{x}}<br>Wealth: $%{{y:,.0f}}<extra></extra>"
+        ))
+
+    fig.update_layout(
+        title="Net Wealth Over 25 Years (with Uncertainty Bands)",
+        xaxis_title="Year",
+        yaxis_title="Total Portfolio Value ($)",
+        yaxis_tickformat="$,.0f",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode="x unified",
+        height=500
+    )
+
+    return fig
+
+
+def portfolio_chart(totals):
+    """Portfolio wealth per strategy and best-per-property, with low/high bands, from portfolio_totals output."""
+    fig = go.Figure()
+    years_axis = np.arange(totals.shape[1])
+    colors = STRATEGY_COLORS | {"Best per Property": "#ffd700"}
+
+    for i, col in enumerate(STRATEGIES + ["Best per Property"]):
+        hex_color = colors[col]
+        rgba_fill = f"rgba({int(hex_color[1:3], 16)}, {int(hex_color[3:5], 16)}, {int(hex_color[5:7], 16)}, 0.2)"
+        fig.add_trace(go.Scatter(
+            x=years_axis, y=totals[2, :, i], mode='lines', line=dict(width=0),
+            showlegend=False, hoverinfo='skip'
+        ))
+        fig.add_trace(go.Scatter(
+            x=years_axis, y=totals[0, :, i], mode='lines', line=dict(width=0),
+            fill='tonexty', fillcolor=rgba_fill, showlegend=False, hoverinfo='skip'
+        ))
+        fig.add_trace(go.Scatter(
+            x=years_axis,
+            y=totals[1, :, i],
+            name=col,
+            mode='lines',
+            line=dict(width=3, color=hex_color, dash="dash" if col == "Best per Property" else "solid"),
+            hovertemplate=f"<b>{col}</b><br>Year: %{{x}}<br>Wealth: $%{{y:,.0f}}<extra></extra>"
+        ))
+
+    fig.update_layout(
+        title="Portfolio Net Wealth (All Properties Follow the Same Strategy)",
+        xaxis_title="Year",
+        yaxis_title="Total Portfolio Value ($)",
+        yaxis_tickformat="$,.0f",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode="x unified",
+        height=500
+    )
+
+    return fig
+
+
+def add_breakdown_columns(df_base):
+    """Add the totals and split cash columns used by breakdown_chart (in place)."""
+    # Calculate totals for hover
+    df_base['Total (As-Is)'] = df_base['Property Value (As-Is)'] + df_base['Cash (As-Is)']
+    df_base['Total (Refurb)'] = df_base['Property Value (Refurb)'] + df_base['Cash (Refurb)']
+
+    # Refurb & Rent - Split cash into positive (green) and negative (red)
+    df_base['Cash (Refurb) Positive'] = df_base['Cash (Refurb)'].clip(lower=0)
+    df_base['Cash (Refurb) Negative'] = df_base['Cash (Refurb)'].clip(upper=0)
+    return df_base
+
+
+def breakdown_chart(df_base):
+    """Grouped stacks of property value and cash for the two rent strategies.
+
+    Expects the columns added by add_breakdown_columns.
+    """
+    fig_breakdown = go.Figure()
+
+    # Rent As-Is - Property Value (bottom of blue stack)
+    fig_breakdown.add_trace(
+        go.Bar(
+            name="As-Is: Property",
+            x=df_base['Year'],
+            y=df_base['Property Value (As-Is)'],
+            marker_color="#1f77b4",
+            customdata=df_base[['Cash (As-Is)', 'Total (As-Is)']].values,
+            hovertemplate="<b>Rent As-Is (Year %{x})</b><br>" +
+                          "Property: $%{y:,.0f}<br>" +
+                          "Cash: $%{customdata[0]:,.0f}<br>" +
+                          "Total: $%{customdata[1]:,.0f}<extra></extra>",
+            offsetgroup=0
+        )
+    )
+    # Rent As-Is - Cash (top of blue stack)
+    fig_breakdown.add_trace(
+        go.Bar(
+            name="As-Is: Cash",
+            x=df_base['Year'],
+            y=df_base['Cash (As-Is)'],
+            marker_color="#aec7e8",
+            customdata=df_base[['Property Value (As-Is)', 'Cash (As-Is)', 'Total (As-Is)']].values,
+            hovertemplate="<b>Rent As-Is (Year %{x})</b><br>" +
+                          "Property: $%{customdata[0]:,.0f}<br>" +
+                          "Cash: $%{customdata[1]:,.0f}<br>" +
+                          "Total: $%{customdata[2]:,.0f}<extra></extra>",
+            offsetgroup=0,
+            base=df_base['Property Value (As-Is)']
+        )
+    )
+
+    # Refurb & Rent - Property Value (bottom of green stack)
+    fig_breakdown.add_trace(
+        go.Bar(
+            name="Refurb: Property",
+            x=df_base['Year'],
+            y=df_base['Property Value (Refurb)'],
+            marker_color="#2ca02c",
+            customdata=df_base[['Property Value (Refurb)', 'Cash (Refurb)', 'Total (Refurb)']].values,
+            hovertemplate="<b>Refurb & Rent (Year %{x})</b><br>" +
+                          "Property: $%{customdata[0]:,.0f}<br>" +
+                          "Cash: $%{customdata[1]:,.0f}<br>" +
+                          "Total: $%{customdata[2]:,.0f}<extra></extra>",
+            offsetgroup=1
+        )
+    )
+    # Refurb & Rent - Positive Cash (top of green stack)
+    fig_breakdown.add_trace(
+        go.Bar(
+            name="Refurb: Cash",
+            x=df_base['Year'],
+            y=df_base['Cash (Refurb) Positive'],
+            marker_color="#98df8a",
+            customdata=df_base[['Property Value (Refurb)', 'Cash (Refurb)', 'Total (Refurb)']].values,
+            hovertemplate="<b>Refurb & Rent (Year %{x})</b><br>" +
+                          "Property: $%{customdata[0]:,.0f}<br>" +
+                          "Cash: $%{customdata[1]:,.0f}<br>" +
+                          "Total: $%{customdata[2]:,.0f}<extra></extra>",
+            offsetgroup=1,
+            base=df_base['Property Value (Refurb)']
+        )
+    )
+    # Refurb & Rent - Negative Cash (red portion showing cost on top)
+    fig_breakdown.add_trace(
+        go.Bar(
+            name="Refurb: Cost",
+            x=df_base['Year'],
+            y=-df_base['Cash (Refurb) Negative'],  # Make positive for display
+            marker_color="#d62728",  # Red
+            customdata=df_base[['Property Value (Refurb)', 'Cash (Refurb)', 'Total (Refurb)']].values,
+            hovertemplate="<b>Refurb & Rent (Year %{x})</b><br>" +
+                          "Property: $%{customdata[0]:,.0f}<br>" +
+                          "Cash: $%{customdata[1]:,.0f}<br>" +
+                          "Total: $%{customdata[2]:,.0f}<extra></extra>",
+            offsetgroup=1,
+            base=df_base['Property Value (Refurb)'] + df_base['Cash (Refurb) Positive']
+        )
+    )
+
+    fig_breakdown.update_layout(
+        barmode='group',
+        height=400,
+        yaxis_tickformat="$,.0f",
+        yaxis_title="Total Wealth ($)",
+        xaxis_title="Year",
+        xaxis=dict(dtick=1),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
+    )
+
+    return fig_breakdown
+
+
+def tax_savings_chart(tax_shield_df, income_tax_rate):
+    """Cumulative tax saved by the depreciation deduction."""
+    fig_tax = go.Figure()
+    fig_tax.add_trace(go.Bar(
+        x=tax_shield_df["Year"],
+        y=tax_shield_df["Estimated Tax Savings"],
+        name="Cumulative Tax Savings",
+        marker_color="#2ca02c"
+    ))
+    fig_tax.update_layout(
+        title=f"Cumulative Tax Savings from Depreciation (@ {income_tax_rate*100:.0f}% rate)",
+        xaxis_title="Year",
+        yaxis_title="Tax Savings ($)",
+        yaxis_tickformat="$,.0f",
+        height=400
+    )
+
+    return fig_tax
+
+
+def monte_carlo_chart(mc_bands):
+    """Percentile fan chart from percentile_bands output (P5-P95 and P25-P75 bands, median line)."""
+    fig_mc = go.Figure()
+    years_axis = np.arange(mc_bands.shape[1])
+
+    for i, col in enumerate(STRATEGIES):
+        hex_color = STRATEGY_COLORS[col]
+        rgb = f"{int(hex_color[1:3], 16)}, {int(hex_color[3:5], 16)}, {int(hex_color[5:7], 16)}"
+        p5, p25, p50, p75, p95 = mc_bands[:, :, i]
+
+        # Pairs of traces: upper bound first, then lower bound filled up to it
+        for upper, lower, alpha in [(p95, p5, 0.12), (p75, p25, 0.25)]:
+            fig_mc.add_trace(go.Scatter(
+                x=years_axis, y=upper, mode='lines', line=dict(width=0),
+                showlegend=False, hoverinfo='skip'
+            ))
+            fig_mc.add_trace(go.Scatter(
+                x=years_axis, y=lower, mode='lines', line=dict(width=0),
+                fill='tonexty', fillcolor=f"rgba({rgb}, {alpha})",
+                showlegend=False, hoverinfo='skip'
+            ))
+
+        fig_mc.add_trace(go.Scatter(
+            x=years_axis,
+            y=p50,
+            name=col,
+            mode='lines',
+            line=dict(width=3, color=hex_color),
+            customdata=np.stack([p5, p95], axis=-1),
+            hovertemplate=f"<b>{col}</b><br>Year: %{{x}}<br>Median: $%{{y:,.0f}}<br>" +
+                          "P5-P95: $%{customdata[0]:,.0f} - $%{customdata[1]:,.0f}<extra></extra>"
+        ))
+
+    fig_mc.update_layout(
+        title="Simulated Net Wealth (Percentile Fan Chart)",
+        xaxis_title="Year",
+        yaxis_title="Total Portfolio Value ($)",
+        yaxis_tickformat="$,.0f",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode="x unified",
+        height=500
+    )
+
+    return fig_mc
+
+
+def monthly_chart(monthly):
+    """Monthly wealth per strategy and the loan balance, from run_monthly output."""
+    fig_monthly = go.Figure()
+    month_axis = np.arange(monthly["wealth"].shape[0]) / 12
+    for i, col in enumerate(STRATEGIES):
+        fig_monthly.add_trace(go.Scatter(
+            x=month_axis,
+            y=monthly["wealth"][:, i],
+            name=col,
+            mode='lines',
+            line=dict(width=3, color=STRATEGY_COLORS[col]),
+            hovertemplate=f"<b>{col}</b><br>Year: %{{x:.2f}}<br>Wealth: $%{{y:,.0f}}<extra></extra>"
+        ))
+    fig_monthly.add_trace(go.Scatter(
+        x=month_axis,
+        y=monthly["balance"][:, 0],
+        name="Loan Balance",
+        mode='lines',
+        line=dict(width=2, color="#d62728", dash="dot"),
+        hovertemplate="<b>Loan Balance</b><br>Year: %{x:.2f}<br>$%{y:,.0f}<extra></extra>"
+    ))
+    fig_monthly.update_layout(
+        title="Net Wealth by Month (with Mortgage)",
+        xaxis_title="Year",
+        yaxis_title="Total Portfolio Value ($)",
+        yaxis_tickformat="$,.0f",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode="x unified",
+        height=500
+    )
+
+    return fig_monthly
+
+
+def sweep_animation(labels, wealth, input_label, active=0):
+    """Wealth curves for every step of one input, scrubbed with a Plotly slider.
+
+    wealth is shaped (len(labels), years + 1, strategies). Each step is an
+    animation frame carrying only the new y values, so moving the slider
+    redraws in the browser without a round trip to the server.
+    """
+    years = np.arange(wealth.shape[1])
+    fig = go.Figure(
+        data=[
+            go.Scatter(
+                x=years,
+                y=wealth[active, :, i],
+                name=col,
+                mode='lines',
+                line=dict(width=3, color=STRATEGY_COLORS[col]),
+                hovertemplate=f"<b>{col}</b><br>Year: %{{x}}<br>Wealth: $%{{y:,.0f}}<extra></extra>"
+            )
+            for i, col in enumerate(STRATEGIES)
+        ],
+        frames=[
+            go.Frame(name=label, data=[go.Scatter(y=wealth[step, :, i]) for i in range(len(STRATEGIES))])
+            for step, label in enumerate(labels)
+        ],
+    )
+
+    def animate(frame_names, duration=0):
+        return [frame_names, dict(mode="immediate", frame=dict(duration=duration, redraw=False),
+                                  transition=dict(duration=0))]
+
+    fig.update_layout(
+        title=f"Net Wealth as {input_label} Changes",
+        xaxis_title="Year",
+        yaxis_title="Total Portfolio Value ($)",
+        yaxis_tickformat="$,.0f",
+        # Fixed axes so the curves move instead of the scale
+        yaxis_range=[min(wealth.min(), 0), wealth.max() * 1.05],
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode="x unified",
+        height=550,
+        sliders=[dict(
+            active=active,
+            currentvalue=dict(prefix=f"{input_label}: "),
+            pad=dict(t=50),
+            steps=[dict(method="animate", label=label, args=animate([label])) for label in labels],
+        )],
+        updatemenus=[dict(
+            type="buttons",
+            direction="left",
+            x=0, y=0, xanchor="right", yanchor="top",
+            pad=dict(t=50, r=10),
+            buttons=[
+                dict(label="▶", method="animate", args=animate(None, duration=150)),
+                dict(label="⏸", method="animate", args=animate([None])),
+            ],
+        )],
+    )
+    return fig
+
+
+def backtest_chart(start_years, wealth):
+    """Distribution of final wealth across historical windows, one box per strategy.
+
+    Every window is drawn as a point labelled with its start year.
+    """
+    fig = go.Figure()
+    final_year = wealth.shape[1] - 1
+    for i, col in enumerate(STRATEGIES):
+        fig.add_trace(go.Box(
+            y=wealth[:, -1, i],
+            name=col,
+            marker_color=STRATEGY_COLORS[col],
+            boxpoints="all",
+            jitter=0.4,
+            pointpos=0,
+            customdata=start_years,
+            hovertemplate=f"<b>{col}</b><br>Start: %{{customdata}}<br>Year {final_year} Wealth: $%{{y:,.0f}}<extra></extra>"
+        ))
+
+    fig.update_layout(
+        title=f"Year {final_year} Wealth Across {len(start_years)} Historical Windows "
+              f"({start_years[0]}-{start_years[-1]} Starts)",
+        yaxis_title="Total Portfolio Value ($)",
+        yaxis_tickformat="$,.0f",
+        showlegend=False,
+        height=500
+    )
+    return fig
+
+
+def exit_chart(exits):
+    """Final-year wealth against the year the property is sold, one line per strategy.
+
+    exits is the exit_matrix DataFrame (exit year index, one column per strategy).
+    """
+    fig = go.Figure()
+    final_year = exits.index[-1]
+    for col in STRATEGIES:
+        best = exits[col].idxmax()
+        fig.add_trace(go.Scatter(
+            x=exits.index,
+            y=exits[col],
+            name=col,
+            mode='lines',
+            line=dict(width=3, color=STRATEGY_COLORS[col], dash="dash" if "Sell" in col else "solid"),
+            hovertemplate=f"<b>{col}</b><br>Sold in Year %{{x}}<br>Year {final_year} Wealth: $%{{y:,.0f}}<extra></extra>"
+        ))
+        if "Sell" not in col:
+            fig.add_trace(go.Scatter(
+                x=[best],
+                y=[exits[col][best]],
+                mode="markers",
+                marker=dict(size=14, color=STRATEGY_COLORS[col], symbol="star", line=dict(width=1, color="black")),
+                showlegend=False,
+                hovertemplate=f"<b>{col}</b><br>Best exit: Year %{{x}}<br>$%{{y:,.0f}}<extra></extra>"
+            ))
+
+    fig.update_layout(
+        title=f"Year {final_year} Wealth by Exit Year (After Selling Costs and Taxes)",
+        xaxis_title="Year Sold",
+        yaxis_title="Total Portfolio Value ($)",
+        yaxis_tickformat="$,.0f",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode="x unified",
+        height=500
+    )
+    return fig
+
+
+def refurb_spend_chart(spends, best_by_spend, objective_label, percent=False, best=None):
+    """Best objective over exit years against refurb spend, one line per strategy.
+
+    best_by_spend is shaped (len(spends), strategies); best is an optional
+    (spend, value) point to mark as the optimum.
+    """
+    scale = 100 if percent else 1
+    value_format = ":.2f}%" if percent else ":,.0f}"
+    prefix = "" if percent else "$"
+    fig = go.Figure()
+    for i, col in enumerate(STRATEGIES):
+        fig.add_trace(go.Scatter(
+            x=spends,
+            y=best_by_spend[:, i] * scale,
+            name=col,
+            mode='lines',
+            line=dict(width=3, color=STRATEGY_COLORS[col], dash="solid" if "Refurb" in col else "dash"),
+            hovertemplate=f"<b>{col}</b><br>Spend: $%{{x:,.0f}}<br>{prefix}%{{y{value_format}<extra></extra>"
+        ))
+    if best is not None:
+        fig.add_trace(go.Scatter(
+            x=[best[0]],
+            y=[best[1] * scale],
+            mode="markers",
+            marker=dict(size=16, color="#ffd700", symbol="star", line=dict(width=1, color="black")),
+            name="Optimum",
+            hovertemplate=f"Optimum<br>Spend: $%{{x:,.0f}}<br>{prefix}%{{y{value_format}<extra></extra>"
+        ))
+
+    fig.update_layout(
+        title=f"{objective_label} by Refurb Spend (Best Exit Year)",
+        xaxis_title="Refurb Spend ($)",
+        xaxis_tickformat="$,.0f",
+        yaxis_title=objective_label + (" (%)" if percent else " ($)"),
+        yaxis_tickformat=".1f" if percent else "$,.0f",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode="x unified",
+        height=500
+    )
+    return fig
@@ -0,0 +1,134 @@
+"""Comparable sales and rentals as a typed columnar store with indexed queries.
+
+Comps are read once from a CSV or Parquet file. Text columns become
+categoricals, the sale date a datetime, and $/sq ft is derived for every row
+in one vectorized step. Each indexed column maps its values to the sorted row
+positions holding them, and rows are also kept in date order, so a query
+intersects a few position arrays and bisects the dates instead of scanning
+every record. Median $/sq ft by condition and by view, the basis of the
+premiums, is computed once at load time.
+"""
+from pathlib import Path
+
+import numpy as np
+
+COMPS_CSV = Path(__file__).parent / "data" / "comps.csv"
+COMP_COLUMNS = [
+    "address", "community", "kind", "sqft", "beds", "baths", "price",
+    "condition", "view", "date", "status", "subject",
+]
+INDEXED_COLUMNS = ("kind", "community", "condition", "view")
+PREMIUM_COLUMNS = ("condition", "view")
+KINDS = ("sale", "rental")
+
+
+class CompStore:
+    """Comparable sales ("sale", price) and rentals ("rental", monthly rent) with indexed queries."""
+
+    def __init__(self, frame):
+        import pandas as pd
+
+        missing = [c for c in COMP_COLUMNS if c not in frame.columns]
+        if missing:
+            raise ValueError(f"Comps data is missing columns: {', '.join(missing)}")
+        frame = frame[COMP_COLUMNS].reset_index(drop=True)
+        unknown = set(frame["kind"]) - set(KINDS)
+        if unknown:
+            raise ValueError(f"Unknown comp kind(s) {sorted(unknown)}, expected one of {KINDS}")
+
+        self.frame = frame.assign(
+            **{column: frame[column].astype("category") for column in INDEXED_COLUMNS},
+            sqft=frame["sqft"].astype(float),
+            beds=frame["beds"].astype("Int64"),
+            baths=frame["baths"].astype(float),
+            price=frame["price"].astype(float),
+            date=pd.to_datetime(frame["date"].astype("string"), format="ISO8601"),
+            subject=frame["subject"].astype(bool),
+        )
+        if (self.frame["sqft"] <= 0).any():
+            raise ValueError("Comp square footage must be positive")
+        self.frame["per_sqft"] = self.frame["price"] / self.frame["sqft"]
+
+        self._index = {
+            column: {value: np.sort(positions) for value, positions in self.frame.groupby(column, observed=True).indices.items()}
+            for column in INDEXED_COLUMNS
+        }
+        # Undated rows (NaT) sort last and are left out of date-range queries
+        dates = self.frame["date"].to_numpy()
+        self._date_order = np.argsort(dates, kind="stable")
+        self._sorted_dates = dates[self._date_order]
+        self._dated = int(self.frame["date"].notna().sum())
+
+        comps = self.frame[~self.frame["subject"]]
+        self.medians = {
+            column: comps.groupby(["kind", column], observed=True)["per_sqft"].median()
+            for column in PREMIUM_COLUMNS
+        }
+
+    @classmethod
+    def from_file(cls, source=COMPS_CSV):
+        """Load comps from a .parquet file (needs pyarrow) or, for any other suffix, a CSV."""
+        import pandas as pd
+
+        if Path(source).suffix == ".parquet":
+            return cls(pd.read_parquet(source))
+        return cls(pd.read_csv(source, dtype={"date": "string"}))
+
+    def __len__(self):
+        return len(self.frame)
+
+    def values(self, column):
+        """Distinct values of an indexed column, sorted."""
+        return list(self._index[column])
+
+    def positions(self, kind=None, community=None, condition=None, view=None,
+                  since=None, until=None, subject=None):
+        """Sorted row positions matching every given filter.
+
+        kind, community, condition and view each take one value or a list of
+        values; since and until bound the sale date (inclusive) and exclude
+        undated rows; subject=False leaves out the subject property.
+        """
+        import pandas as pd
+
+        selected = None
+        for column, wanted in zip(INDEXED_COLUMNS, (kind, community, condition, view)):
+            if wanted is None:
+                continue
+            wanted = [wanted] if isinstance(wanted, str) else wanted
+            index = self._index[column]
+            hits = np.concatenate([index.get(value, np.empty(0, dtype=np.intp)) for value in wanted] or [np.empty(0, dtype=np.intp)])
+            selected = np.sort(hits) if selected is None else np.intersect1d(selected, hits, assume_unique=True)
+
+        if since is not None or until is not None:
+            dates = self._sorted_dates[:self._dated]
+            start = 0 if since is None else np.searchsorted(dates, pd.Timestamp(since).to_datetime64(), side="left")
+            stop = self._dated if until is None else np.searchsorted(dates, pd.Timestamp(until).to_datetime64(), side="right")
+            in_range = np.sort(self._date_order[start:stop])
+            selected = in_range if selected is None else np.intersect1d(selected, in_range, assume_unique=True)
+
+        if selected is None:
+            selected = np.arange(len(self.frame))
+        if subject is not None:
+            selected = selected[self.frame["subject"].to_numpy()[selected] == subject]
+        return selected
+
+    def query(self, **filters):
+        """Rows matching the filters of positions(), as a DataFrame in file order."""
+        return self.frame.iloc[self.positions(**filters)]
+
+    def subject(self, kind):
+        """The subject property's row of the given kind, or None if there is none."""
+        rows = self.query(kind=kind, subject=True)
+        return None if rows.empty else rows.iloc[0]
+
+    def premium(self, kind, column, value, baseline):
+        """Median $/sq ft of value over that of baseline, less one (e.g. 0.24 for 24%), or NaN.
+
+        column is "condition" or "view"; the subject property is excluded.
+        """
+        medians = self.medians[column]
+        try:
+            return float(medians[(kind, value)] / medians[(kind, baseline)] - 1)
+        except KeyError:
+            return float("nan")
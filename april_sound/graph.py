@@ -0,0 +1,288 @@
+"""The financial model as a small dependency graph of intermediate arrays.
+
+Each node is a function whose parameter names are the inputs or other nodes
+it reads, so the graph is read straight off the signatures below: the sell
+portfolios never touch rent, vacancy, HOA or tax, and the value paths never
+touch market_return. evaluate() computes the requested nodes once; ModelGraph
+memoizes nodes between calls and recomputes only those downstream of changed
+inputs, plus any unmemoized nodes they read (see its keep argument).
+SIMULATION_NODES swaps the closed-form growth indices and vacancy for Monte
+Carlo draws, leaving the rest of the graph unchanged.
+
+Per-scenario inputs are shaped (..., 1, 1), "year" is the (years + 1, 1)
+column of years, and nodes built from the property pair carry a last axis of
+2 for the as-is and refurbished conditions.
+"""
+import inspect
+
+import numpy as np
+
+ENGINE_INPUTS = (
+    "val_asis", "val_ref", "rent_asis", "rent_ref", "refurb", "market_return",
+    "appreciation", "rent_growth", "vacancy_rate", "expense_rate", "hoa_annual",
+    "management_fee", "income_tax_rate", "annual_depreciation", "selling_costs",
+)
+
+NODES = {}
+
+
+def _node(fn):
+    NODES[fn.__name__] = (tuple(inspect.signature(fn).parameters), fn)
+    return fn
+
+
+# --- Property pair (as-is, refurbished) ---
+@_node
+def vals(val_asis, val_ref):
+    return np.concatenate(np.broadcast_arrays(val_asis, val_ref), axis=-1)
+
+
+@_node
+def rents(rent_asis, rent_ref):
+    return np.concatenate(np.broadcast_arrays(rent_asis, rent_ref), axis=-1)
+
+
+@_node
+def refurbs(refurb):
+    return np.concatenate([np.zeros_like(refurb), refurb], axis=-1)
+
+
+# --- Growth indices: constant rates compound in closed form ---
+@_node
+def value_index(appreciation, year):
+    return (1 + appreciation) ** year
+
+
+@_node
+def market_index(market_return, year):
+    return (1 + market_return) ** year
+
+
+@_node
+def rent_index(rent_growth, year):
+    # Rent starts in year 1 and grows from there
+    return (1 + rent_growth) ** np.maximum(year - 1, 0)
+
+
+# --- Paths ---
+@_node
+def values(vals, value_index):
+    """Property values appreciating over time."""
+    return vals * value_index
+
+
+@_node
+def portfolios(vals, refurbs, selling_costs, market_index):
+    """Sell & invest: net sale proceeds compounding in the market (no tax on market gains)."""
+    return (vals * (1 - selling_costs) - refurbs) * market_index
+
+
+@_node
+def vacancy(vacancy_rate):
+    """Share of each year without rent (constant unless simulated)."""
+    return vacancy_rate
+
+
+@_node
+def net_rent(rents, rent_index, vacancy, management_fee):
+    return (rents * 12) * rent_index * (1 - vacancy) * (1 - management_fee)
+
+
+@_node
+def expenses(values, expense_rate, hoa_annual):
+    return (values * expense_rate) + hoa_annual
+
+
+@_node
+def noi(net_rent, expenses):
+    return net_rent - expenses
+
+
+@_node
+def tax(noi, annual_depreciation, income_tax_rate):
+    """Income tax after the depreciation shield."""
+    return np.maximum(0, noi - annual_depreciation) * income_tax_rate
+
+
+@_node
+def after_tax_cf(noi, tax):
+    cf = noi - tax
+    # Year 0 has no cash flow
+    cf[..., 0, :] = 0
+    return cf
+
+
+@_node
+def cash(after_tax_cf, market_index, refurbs):
+    """Reinvested cash, less the refurb paid out of pocket at year 0.
+
+    cash[y] = cash[y-1] * (1 + r[y]) + cf[y] is solved in closed form as
+    sum(cf[k] * index[y] / index[k]) via a discounted cumulative sum.
+    """
+    reinvested = np.cumsum(after_tax_cf / market_index, axis=-2) * market_index
+    first_year = (np.arange(reinvested.shape[-2]) == 0)[:, None]
+    return reinvested - refurbs * first_year
+
+
+@_node
+def wealth(values, cash):
+    """Rent & reinvest: property value plus reinvested cash."""
+    return values + cash
+
+
+@_node
+def strategies(wealth, portfolios):
+    """All four strategies along the last axis, in STRATEGIES order."""
+    return np.concatenate(np.broadcast_arrays(wealth, portfolios), axis=-1)
+
+
+# --- Monte Carlo replacements: each year draws its own rates ---
+SIMULATION_NODES = dict(NODES)
+
+
+def _simulation_node(name):
+    def register(fn):
+        SIMULATION_NODES[name] = (tuple(inspect.signature(fn).parameters), fn)
+        return fn
+    return register
+
+
+@_simulation_node("shocks")
+def _shocks(n_paths, years, seed):
+    """Standard normal draws for market, appreciation, rent growth and vacancy."""
+    return np.random.default_rng(seed).standard_normal((4, n_paths, years, 1))
+
+
+def growth_index(rates, skip=0):
+    """Growth index from yearly rates: 1 at year 0 (and for `skip` more years), then cumulative products."""
+    n_paths, years = rates.shape[:2]
+    index = np.ones((n_paths, years + 1, 1))
+    np.cumprod(1 + rates[:, skip:], axis=1, out=index[:, 1 + skip:])
+    return index
+
+
+@_simulation_node("market_index")
+def _simulated_market_index(market_return, market_vol, shocks):
+    return growth_index(np.clip(market_return + market_vol * shocks[0], -0.99, None))
+
+
+@_simulation_node("value_index")
+def _simulated_value_index(appreciation, appreciation_vol, shocks):
+    return growth_index(np.clip(appreciation + appreciation_vol * shocks[1], -0.99, None))
+
+
+@_simulation_node("rent_index")
+def _simulated_rent_index(rent_growth, rent_growth_vol, shocks):
+    # Rent is first collected at its base level in year 1
+    return growth_index(np.clip(rent_growth + rent_growth_vol * shocks[2], -0.99, None), skip=1)
+
+
+@_simulation_node("vacancy")
+def _simulated_vacancy(vacancy_rate, vacancy_vol, shocks):
+    drawn = np.clip(vacancy_rate + vacancy_vol * shocks[3], 0.0, 1.0)
+    return np.concatenate([np.zeros_like(drawn[:, :1]), drawn], axis=1)
+
+
+def prepare_inputs(years, **inputs):
+    """Shape engine inputs for the graph; returns (batch shape, graph inputs)."""
+    arrays = {name: np.asarray(value, dtype=float) for name, value in inputs.items()}
+    batch = np.broadcast_shapes(*(x.shape for x in arrays.values()))
+    graph_inputs = {name: x[..., None, None] for name, x in arrays.items()}
+    graph_inputs["year"] = np.arange(years + 1)[:, None]
+    return batch, graph_inputs
+
+
+def evaluate(outputs, nodes=NODES, **inputs):
+    """Compute the named nodes once. Any node may be supplied directly as an input.
+
+    Intermediates are released as soon as their last consumer has run, which
+    keeps peak memory close to that of a hand-written pipeline on large batches.
+    """
+    order, pending = [], {}
+
+    def plan(name):
+        if name in inputs or name in pending:
+            return
+        pending[name] = 0
+        for dep in nodes[name][0]:
+            plan(dep)
+        order.append(name)
+
+    for name in outputs:
+        plan(name)
+    for name in order:
+        for dep in nodes[name][0]:
+            pending[dep] = pending.get(dep, 0) + 1
+
+    results = dict(inputs)
+    for name in order:
+        deps, fn = nodes[name]
+        results[name] = fn(*(results[dep] for dep in deps))
+        for dep in deps:
+            pending[dep] -= 1
+            if pending[dep] == 0 and dep not in outputs:
+                del results[dep]
+    return {name: results[name] for name in outputs}
+
+
+class ModelGraph:
+    """Memoized graph evaluation that recomputes only what changed inputs reach.
+
+    update() sets inputs (already shaped, see prepare_inputs); an input whose
+    value is unchanged keeps its version. Every node's version is the newest
+    version among its dependencies, so a memoized node is reused exactly when
+    nothing upstream changed. keep limits memoization to the named nodes to
+    bound memory on large batches. A node outside keep is recomputed whenever
+    a node that reads it is, even if its own inputs are unchanged: with
+    values unkept, an HOA change recomputes values on the way to expenses.
+    recomputed lists the nodes evaluated since the last update().
+    """
+
+    def __init__(self, nodes=NODES, keep=None):
+        self.nodes = nodes
+        self.keep = keep
+        self.recomputed = []
+        self._inputs = {}  # name -> (value, version)
+        self._memo = {}  # node -> (version, value)
+        self._clock = 0
+
+    def update(self, **inputs):
+        for name, value in inputs.items():
+            current = self._inputs.get(name)
+            if current is not None and np.shape(current[0]) == np.shape(value) and np.array_equal(current[0], value):
+                continue
+            self._clock += 1
+            self._inputs[name] = (value, self._clock)
+        self.recomputed = []
+
+    def get(self, *names):
+        """Values of the named nodes (or inputs), a single value if one name is given."""
+        scratch, versions = {}, {}
+        values = [self._resolve(name, scratch, versions) for name in names]
+        return values[0] if len(values) == 1 else values
+
+    def _version(self, name, versions):
+        # Known from input versions alone, so a memo hit never touches its dependencies
+        if name in self._inputs:
+            return self._inputs[name][1]
+        if name not in versions:
+            versions[name] = max(self._version(dep, versions) for dep in self.nodes[name][0])
+        return versions[name]
+
+    def _resolve(self, name, scratch, versions):
+        if name in self._inputs:
+            return self._inputs[name][0]
+        if name in scratch:
+            return scratch[name]
+        version = self._version(name, versions)
+        memo = self._memo.get(name)
+        if memo is not None and memo[0] == version:
+            scratch[name] = memo[1]
+            return scratch[name]
+
+        deps, fn = self.nodes[name]
+        scratch[name] = fn(*(self._resolve(dep, scratch, versions) for dep in deps))
+        self.recomputed.append(name)
+        if self.keep is None or name in self.keep:
+            self._memo[name] = (version, scratch[name])
+        return scratch[name]
@@ -0,0 +1,77 @@
+"""Exit timing: after-tax wealth if the property is sold at the end of any year.
+
+Selling in year k nets value[k] less selling costs. Tax on the gain over the
+cost basis comes in two parts. The accumulated depreciation is recaptured at
+DEPRECIATION_RECAPTURE_RATE, and the rest of the gain is taxed at the capital
+gains rate (which includes NIIT when applicable). The cost basis is today's
+as-is value plus any refurb spend, less that depreciation.
+The proceeds then join the reinvested cash in the market until the horizon,
+so every exit year is compared on the same final date. All exit years come
+from one model evaluation: the growth to the horizon is a ratio of the
+cumulative market index, not a re-run per exit year.
+"""
+import numpy as np
+
+from .engine import DEPRECIATION_RECAPTURE_RATE, DEPRECIATION_YEARS, STRATEGIES
+from .graph import evaluate, prepare_inputs
+
+
+def exit_values(params, cap_gains_tax, recapture_rate=DEPRECIATION_RECAPTURE_RATE, years=25):
+    """Liquidation arrays for the two property conditions (as-is, refurbished) by exit year.
+
+    Returns a dict of arrays shaped (years + 1, 2): "sale_tax" (recapture plus
+    capital gains tax), "proceeds" (after-tax net sale proceeds), "at_exit"
+    (proceeds plus reinvested cash, less the refurb outlay grown in the market)
+    and "at_horizon" (at_exit grown in the market to the final year), plus the
+    "market_index" column used to grow them. Row k is a sale at the end of
+    year k; row 0 sells today.
+    """
+    _, inputs = prepare_inputs(years, **params.engine_inputs())
+    arrays = evaluate(["vals", "refurbs", "values", "cash", "market_index"], **inputs)
+    vals, refurbs, values, cash, market_index = (
+        arrays["vals"], arrays["refurbs"], arrays["values"], arrays["cash"], arrays["market_index"]
+    )
+
+    year = inputs["year"]
+    depreciation = params.annual_depreciation * np.minimum(year, DEPRECIATION_YEARS)
+    net_sale = values * (1 - params.selling_costs)
+    gain = net_sale - (vals[..., :1] + refurbs - depreciation)
+    recaptured = np.clip(np.minimum(depreciation, gain), 0, None)
+    sale_tax = recaptured * recapture_rate + np.clip(gain - depreciation, 0, None) * cap_gains_tax
+
+    proceeds = net_sale - sale_tax
+    # The headline projection counts the refurb outlay in year 0 only; here it is
+    # carried as the market growth it forgoes, so every exit year bears its cost
+    first_year = year == 0
+    at_exit = proceeds + cash + refurbs * first_year - refurbs * market_index
+    return {
+        "sale_tax": sale_tax,
+        "proceeds": proceeds,
+        "at_exit": at_exit,
+        "at_horizon": at_exit * (market_index[..., -1:, :] / market_index),
+        "market_index": market_index,
+    }
+
+
+def exit_matrix(params, cap_gains_tax, recapture_rate=DEPRECIATION_RECAPTURE_RATE, years=25):
+    """Final-year after-tax wealth by exit year (rows) and strategy (columns), as a DataFrame.
+
+    The rent strategies sell in the row's year. The sell strategies always
+    sell today, so their columns repeat the exit-year-0 value on every row.
+    """
+    import pandas as pd
+
+    at_horizon = exit_values(params, cap_gains_tax, recapture_rate, years)["at_horizon"]
+    matrix = np.concatenate([at_horizon, np.broadcast_to(at_horizon[:1], at_horizon.shape)], axis=1)
+    return pd.DataFrame(matrix, columns=STRATEGIES).rename_axis("Exit Year")
+
+
+def optimal_exits(matrix):
+    """Best exit year and the wealth it gives for each strategy column of exit_matrix."""
+    import pandas as pd
+
+    return pd.DataFrame({
+        "Strategy": matrix.columns,
+        "Best Exit Year": matrix.idxmax().to_numpy(),
+        "Final Wealth": matrix.max().to_numpy(),
+    })
@@ -0,0 +1,69 @@
+"""Derived tables shown in the Tax Considerations and Property Specs tabs."""
+from .engine import STRATEGIES
+
+
+def year_one_tax_example(params):
+    """Year 1 as-is tax bill with and without the depreciation shield."""
+    noi = (params.rent_asis * 12) - (params.val_asis * params.expense_rate) - params.hoa_annual
+    taxable = max(0, noi - params.annual_depreciation)
+    return {
+        "noi": noi,
+        "taxable": taxable,
+        "tax_without": noi * params.income_tax_rate,
+        "tax_with": taxable * params.income_tax_rate,
+    }
+
+
+def tax_shield_table(params, years=25):
+    """Cumulative depreciation and the tax it saves, one row per year."""
+    import pandas as pd
+
+    year = range(1, years + 1)
+    return pd.DataFrame({
+        "Year": year,
+        "Annual Depreciation": [params.annual_depreciation] * years,
+        "Cumulative Depreciation": [params.annual_depreciation * i for i in year],
+        "Estimated Tax Savings": [params.annual_depreciation * params.income_tax_rate * i for i in year],
+    })
+
+
+def cap_rate_table(params):
+    """Year 1 rent, expenses, NOI and cap rate for the as-is and refurbished property."""
+    import pandas as pd
+
+    rows = {}
+    for condition, value, rent in [("As-Is", params.val_asis, params.rent_asis),
+                                   ("Refurbished", params.val_ref, params.rent_ref)]:
+        annual_rent = rent * 12
+        annual_expenses = (value * params.expense_rate) + params.hoa_annual
+        noi = annual_rent - annual_expenses
+        rows[condition] = {
+            "Gross Annual Rent": annual_rent,
+            "Annual Expenses": annual_expenses,
+            "Net Operating Income": noi,
+            "Cap Rate %": (noi / value) * 100,
+        }
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def roi_table(params, final, years=25):
+    """Initial investment vs final wealth for each strategy.
+
+    final is the last row of run_scenario (anything indexable by strategy name).
+    """
+    import pandas as pd
+
+    roi_df = pd.DataFrame({
+        "Strategy": STRATEGIES,
+        "Initial Investment": [
+            params.val_asis,
+            params.val_asis + params.refurb,
+            params.val_asis * (1 - params.selling_costs),
+            params.val_asis + params.refurb,
+        ],
+        f"Final Value (Yr {years})": [final[s] for s in STRATEGIES],
+    })
+    roi_df["Total Return"] = roi_df[f"Final Value (Yr {years})"] - roi_df["Initial Investment"]
+    roi_df["ROI %"] = ((roi_df[f"Final Value (Yr {years})"] / roi_df["Initial Investment"]) - 1) * 100
+    roi_df["Annualized ROI %"] = ((roi_df[f"Final Value (Yr {years})"] / roi_df["Initial Investment"]) ** (1 / years) - 1) * 100
+    return roi_df
@@ -0,0 +1,155 @@
+"""Monthly-resolution engine with optional mortgage financing.
+
+Same four strategies as the annual engine, but every month is a period:
+rent is collected monthly (growing once a year), vacancy takes whole months
+off, expenses accrue monthly and income tax is settled at each year end. An
+outstanding mortgage is amortized in closed form; its interest is deducted
+alongside depreciation, PMI is charged until the balance falls to 80% of the
+starting value, and the sell strategies pay the loan off from the proceeds.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .engine import STRATEGIES
+
+PMI_LTV_LIMIT = 0.80
+
+
+@dataclass(frozen=True)
+class Financing:
+    """Outstanding mortgage on the property (a zero balance means owned free and clear)."""
+    loan_balance: float = 0.0
+    mortgage_rate: float = 0.065
+    term_years: float = 30
+    pmi_rate: float = 0.0  # Annual, as a share of the outstanding balance
+
+
+def amortize(loan_balance, mortgage_rate, term_years, months):
+    """Payment, interest and end-of-month balance for months 0..months.
+
+    Inputs broadcast as batches; outputs are shaped (*batch, months + 1) with
+    month 0 holding the starting balance and no payment.
+    """
+    loan = np.asarray(loan_balance, dtype=float)[..., None]
+    r = np.asarray(mortgage_rate, dtype=float)[..., None] / 12
+    n = np.asarray(term_years, dtype=float)[..., None] * 12
+    m = np.arange(months + 1)
+
+    # Level payment; a zero rate degenerates to straight-line repayment
+    safe_r = np.where(r > 0, r, 1.0)
+    growth_n = (1 + r) ** n
+    payment = np.where(r > 0, loan * r * growth_n / np.where(r > 0, growth_n - 1, 1.0), loan / n)
+
+    growth = (1 + r) ** np.minimum(m, n)
+    balance = np.where(
+        r > 0,
+        loan * growth - payment * (growth - 1) / safe_r,
+        loan - payment * np.minimum(m, n),
+    )
+    balance = np.maximum(balance, 0)
+
+    interest = np.zeros(np.broadcast_shapes(balance.shape, r.shape))
+    interest[..., 1:] = balance[..., :-1] * r
+    paid = np.broadcast_to((m >= 1) & (m <= n), interest.shape)
+    payment = np.where(paid, payment, 0.0)
+    return payment, interest, balance
+
+
+def run_monthly(val_asis, val_ref, rent_asis, rent_ref, refurb, market_return,
+                appreciation, rent_growth, vacancy_rate, expense_rate, hoa_annual,
+                management_fee, income_tax_rate, annual_depreciation, selling_costs,
+                loan_balance=0.0, mortgage_rate=0.0, term_years=30, pmi_rate=0.0,
+                years=25):
+    """Month-by-month scenarios; all inputs broadcast against each other.
+
+    Returns a dict of arrays shaped (*batch, months + 1, ...): "wealth" has one
+    column per strategy (STRATEGIES order); "values", "cash", "balance",
+    "interest" and "portfolios" have the as-is / refurbished pair.
+    """
+    months = 12 * years
+    inputs = [
+        np.asarray(x, dtype=float) for x in (
+            val_asis, val_ref, rent_asis, rent_ref, refurb, market_return, appreciation,
+            rent_growth, vacancy_rate, expense_rate, hoa_annual, management_fee,
+            income_tax_rate, annual_depreciation, selling_costs, loan_balance,
+            mortgage_rate, term_years, pmi_rate)
+    ]
+    batch = np.broadcast_shapes(*(x.shape for x in inputs))
+    (val_asis, val_ref, rent_asis, rent_ref, refurb, market_return, appreciation,
+     rent_growth, vacancy_rate, expense_rate, hoa_annual, management_fee,
+     income_tax_rate, annual_depreciation, selling_costs) = [x[..., None, None] for x in inputs[:15]]
+    loan_balance, mortgage_rate, term_years, pmi_rate = inputs[15:]
+
+    # Months along axis -2, property condition (as-is, refurbished) along axis -1
+    m = np.arange(months + 1)[:, None]
+    vals = np.concatenate(np.broadcast_arrays(val_asis, val_ref), axis=-1)
+    rents = np.concatenate(np.broadcast_arrays(rent_asis, rent_ref), axis=-1)
+    refurbs = np.concatenate([np.zeros_like(refurb), refurb], axis=-1)
+
+    # Annual rates compounded monthly so year-end values match the annual engine
+    values = vals * (1 + appreciation) ** (m / 12)
+    market_index = (1 + market_return) ** (m / 12)
+
+    # Mortgage on the property, shared by both conditions
+    payment, interest, balance = (x[..., None] for x in amortize(loan_balance, mortgage_rate, term_years, months))
+    opening = np.concatenate([np.zeros_like(balance[..., :1, :]), balance[..., :-1, :]], axis=-2)
+    pmi = np.where(opening > PMI_LTV_LIMIT * vals, opening * pmi_rate[..., None, None] / 12, 0.0)
+
+    # Rent is collected from month 1, steps up once per year, and a month is
+    # vacant whenever cumulative expected vacancy crosses a whole month
+    lease_year = np.maximum(m - 1, 0) // 12
+    vacant = np.floor(vacancy_rate * m) - np.floor(vacancy_rate * np.maximum(m - 1, 0))
+    occupied = (m >= 1) * (1 - vacant)
+    collected = rents * (1 + rent_growth) ** lease_year * occupied * (1 - management_fee)
+    expenses = ((values * expense_rate) + hoa_annual) / 12 * (m >= 1)
+    noi = collected - expenses
+
+    # Income tax on each calendar year's NOI less interest and depreciation, paid in month 12
+    deductible = (noi - interest)[..., 1:, :]
+    yearly = deductible.reshape(deductible.shape[:-2] + (years, 12, 2)).sum(axis=-2)
+    yearly_tax = np.maximum(0, yearly - annual_depreciation) * income_tax_rate
+    tax = np.zeros(np.broadcast_shapes(noi.shape, yearly_tax.shape[:-2] + (months + 1, 2)))
+    tax[..., 12::12, :] = yearly_tax
+
+    after_tax_cf = noi - payment - pmi - tax
+
+    # Reinvested cash compounds monthly: discounted cumulative sum as in the annual engine
+    cash = np.cumsum(after_tax_cf / market_index, axis=-2) * market_index
+    cash = cash - refurbs * (m == 0)
+
+    # Selling pays off the loan before the proceeds are invested
+    portfolios = (vals * (1 - selling_costs) - refurbs - balance[..., :1, :]) * market_index
+
+    equity = values - balance
+    wealth = np.concatenate(np.broadcast_arrays(equity + cash, portfolios), axis=-1)
+    arrays = {
+        "wealth": wealth,
+        "values": values,
+        "balance": balance,
+        "interest": interest,
+        "cash": cash,
+        "portfolios": portfolios,
+    }
+    return {
+        name: np.broadcast_to(arr, batch + arr.shape[-2:-1] + (len(STRATEGIES) if name == "wealth" else 2,))
+        for name, arr in arrays.items()
+    }
+
+
+def amortization_table(financing, years=25):
+    """Yearly payments, interest, principal and closing balance of a Financing."""
+    import pandas as pd
+
+    months = 12 * years
+    payment, interest, balance = amortize(
+        financing.loan_balance, financing.mortgage_rate, financing.term_years, months
+    )
+    by_year = lambda x: x[1:].reshape(years, 12).sum(axis=-1)
+    return pd.DataFrame({
+        "Year": np.arange(1, years + 1),
+        "Payments": by_year(payment),
+        "Interest": by_year(interest),
+        "Principal": by_year(payment - interest),
+        "Ending Balance": balance[12::12],
+    })
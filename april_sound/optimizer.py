@@ -0,0 +1,136 @@
+"""Refurbishment optimizer: the spend, strategy and exit year that maximize an objective.
+
+The refurbished value and rent follow a cost-to-uplift curve instead of being
+fixed, so spending more buys more uplift with diminishing returns. Each round
+evaluates a grid of spends, every exit year and every strategy in one batched
+liquidation call, then narrows the spend grid around the best candidate.
+"""
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from .engine import STRATEGIES
+from .liquidation import exit_values
+
+OBJECTIVES = {
+    "wealth": "Year 25 After-Tax Wealth",
+    "irr": "Annualized Return on Today's Equity",
+}
+
+
+@dataclass(frozen=True)
+class UpliftCurve:
+    """Refurbished value and rent as a saturating function of refurb spend.
+
+    Uplift grows as 1 - exp(-spend / scale), anchored so that spending the
+    base budget gives the base refurbished value and rent. doubling_gain is
+    the extra uplift bought by doubling the base budget, as a share of the
+    base uplift: 1.0 would be linear, values near 0 saturate at the budget.
+    """
+    val_asis: float
+    val_ref: float
+    rent_asis: float
+    rent_ref: float
+    refurb: float
+    doubling_gain: float = 0.5
+
+    def __post_init__(self):
+        if self.refurb <= 0:
+            raise ValueError("a positive base refurb budget is needed to anchor it")
+        if not 0 < self.doubling_gain < 1:
+            raise ValueError("doubling_gain must be between 0 and 1")
+
+    @classmethod
+    def from_params(cls, params, doubling_gain=0.5):
+        return cls(params.val_asis, params.val_ref, params.rent_asis, params.rent_ref, params.refurb, doubling_gain)
+
+    def at(self, spend):
+        """(refurbished value, refurbished rent) after spending spend (scalar or array)."""
+        # Doubling the budget b multiplies the uplift by 1 + exp(-b / scale)
+        scale = -self.refurb / np.log(self.doubling_gain)
+        share = (1 - np.exp(-np.asarray(spend, dtype=float) / scale)) / (1 - self.doubling_gain)
+        return (
+            self.val_asis + (self.val_ref - self.val_asis) * share,
+            self.rent_asis + (self.rent_ref - self.rent_asis) * share,
+        )
+
+
+def candidate_grid(params, curve, spends, cap_gains_tax, objective="wealth", years=25):
+    """Objective for every spend x exit year x strategy, shaped (len(spends), years + 1, strategies).
+
+    The rent strategies sell at the end of the exit year; exit year 0 would
+    sell today, which is the sell strategy, so it is NaN for them. The sell
+    strategies hold the market portfolio instead, so for "wealth" their value
+    is the same in every row. "irr" annualizes the value at the exit year over
+    today's as-is net sale proceeds, the equity given up by keeping the
+    property; exit year 0 has no return period and is excluded (NaN).
+    As-is strategies do not depend on the spend.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective '{objective}', expected one of {list(OBJECTIVES)}")
+    spends = np.asarray(spends, dtype=float)
+    val_ref, rent_ref = curve.at(spends)
+    batch = replace(params, val_ref=val_ref, rent_ref=rent_ref, refurb=spends)
+    values = exit_values(batch, cap_gains_tax, years=years)
+
+    if objective == "wealth":
+        at_horizon = values["at_horizon"]
+        grid = np.concatenate([at_horizon, np.broadcast_to(at_horizon[:, :1], at_horizon.shape)], axis=-1)
+    else:
+        at_exit = values["at_exit"]
+        held = np.concatenate([at_exit, at_exit[:, :1] * values["market_index"]], axis=-1)
+        equity = params.val_asis * (1 - params.selling_costs)
+        hold_years = np.arange(years + 1, dtype=float)[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            grid = np.where(hold_years > 0, (held / equity) ** (1 / hold_years) - 1, np.nan)
+    grid[:, 0, :2] = np.nan
+    return grid
+
+
+def optimize_refurb(params, curve, cap_gains_tax, objective="wealth", max_spend=150000,
+                    grid=21, rounds=4, years=25):
+    """Best refurb spend, strategy and exit year by coarse-to-fine search over the spend.
+
+    Every round is one batched evaluation of grid spends; the next round zooms
+    in on the two grid cells around the best refurbished candidate. Returns a
+    dict with the overall best ("strategy", "spend", "exit_year", "value",
+    "val_ref", "rent_ref"), plus "spends" and "best_by_spend" from the first
+    (full-range) round: the best objective over exit years for each strategy
+    at each spend, shaped (grid, strategies).
+    """
+    low, high = 0.0, float(max_spend)
+    first = None
+    best_refurb = None
+    for _ in range(rounds):
+        spends = np.linspace(low, high, grid)
+        objective_grid = candidate_grid(params, curve, spends, cap_gains_tax, objective, years)
+        if first is None:
+            first = spends, np.nanmax(objective_grid, axis=1)
+
+        # Only the refurbished strategies depend on the spend
+        refurbished = objective_grid[..., [1, 3]]
+        i, exit_year, j = np.unravel_index(np.nanargmax(refurbished), refurbished.shape)
+        candidate = (refurbished[i, exit_year, j], spends[i], int(exit_year), STRATEGIES[[1, 3][j]])
+        if best_refurb is None or candidate[0] > best_refurb[0]:
+            best_refurb = candidate
+        step = spends[1] - spends[0]
+        low, high = max(0.0, spends[i] - step), min(float(max_spend), spends[i] + step)
+
+    # The as-is strategies are the same at every spend
+    as_is = objective_grid[0][:, [0, 2]]
+    exit_year, j = np.unravel_index(np.nanargmax(as_is), as_is.shape)
+    best = max(best_refurb, (as_is[exit_year, j], 0.0, int(exit_year), STRATEGIES[[0, 2][j]]),
+               key=lambda candidate: candidate[0])
+
+    value, spend, exit_year, strategy = best
+    val_ref, rent_ref = curve.at(spend)
+    return {
+        "strategy": strategy,
+        "spend": float(spend),
+        "exit_year": exit_year,
+        "value": float(value),
+        "val_ref": float(val_ref),
+        "rent_ref": float(rent_ref),
+        "spends": first[0],
+        "best_by_spend": first[1],
+    }
@@ -0,0 +1,102 @@
+"""Portfolio mode: many properties, each with its own value/rent/refurb ranges."""
+from dataclasses import replace
+
+import numpy as np
+
+from .engine import STRATEGIES, run_batch
+
+# Per-property inputs; each may come with optional <name>_low / <name>_high columns
+RANGED_COLUMNS = ["val_asis", "val_ref", "rent_asis", "rent_ref", "refurb"]
+REQUIRED_COLUMNS = ["property"] + RANGED_COLUMNS + ["building_value"]
+SCENARIOS = ["Low", "Base", "High"]
+
+
+def load_properties(source):
+    """Read and validate a property CSV into a DataFrame with every range column filled.
+
+    Missing *_low / *_high columns (or blank cells) fall back to the base value;
+    blank cells in the required columns are an error.
+    """
+    import pandas as pd
+
+    properties = pd.read_csv(source)
+    missing = [c for c in REQUIRED_COLUMNS if c not in properties.columns]
+    if missing:
+        raise ValueError(f"Property CSV is missing columns: {', '.join(missing)}")
+    blank = properties[REQUIRED_COLUMNS].isna().to_numpy()
+    if blank.any():
+        row, column = np.argwhere(blank)[0]
+        name = properties["property"].iloc[row]
+        label = f"row {row + 1}" if pd.isna(name) else f"property '{name}'"
+        raise ValueError(f"Property CSV has a blank '{REQUIRED_COLUMNS[column]}' for {label}")
+
+    properties["property"] = properties["property"].astype(str)
+    for name in RANGED_COLUMNS + ["building_value"]:
+        properties[name] = pd.to_numeric(properties[name], errors="raise").astype(float)
+    for name in RANGED_COLUMNS:
+        for suffix in ("_low", "_high"):
+            column = name + suffix
+            if column in properties.columns:
+                properties[column] = pd.to_numeric(properties[column], errors="raise").fillna(properties[name])
+            else:
+                properties[column] = properties[name]
+    return properties.reset_index(drop=True)
+
+
+def evaluate_portfolio(params, properties, years=25):
+    """Wealth of every property x strategy, shaped (3, n_properties, years + 1, strategies).
+
+    Axis 0 follows SCENARIOS. As in the single-property view, the low scenario
+    pairs low values and rents with the high refurb cost, and the high scenario
+    the reverse. Market, expense and tax assumptions come from params.
+    """
+    def ranged(name, low, high):
+        return np.stack([
+            properties[f"{name}_{low}"].to_numpy(float),
+            properties[name].to_numpy(float),
+            properties[f"{name}_{high}"].to_numpy(float),
+        ])
+
+    batch = replace(
+        params,
+        val_asis=ranged("val_asis", "low", "high"),
+        val_ref=ranged("val_ref", "low", "high"),
+        rent_asis=ranged("rent_asis", "low", "high"),
+        rent_ref=ranged("rent_ref", "low", "high"),
+        refurb=ranged("refurb", "high", "low"),
+        building_value=properties["building_value"].to_numpy(float),
+    )
+    return run_batch(**batch.engine_inputs(), years=years)
+
+
+def portfolio_totals(wealth):
+    """Portfolio wealth per scenario, year and strategy, plus best-per-property.
+
+    Returns an array shaped (3, years + 1, strategies + 1); the extra last entry
+    assumes each property follows the strategy with the highest final base wealth.
+    """
+    best = wealth[1, :, -1, :].argmax(axis=-1)
+    best_paths = np.take_along_axis(wealth, best[None, :, None, None], axis=-1)
+    return np.concatenate([wealth, best_paths], axis=-1).sum(axis=1)
+
+
+def property_ranking(properties, wealth):
+    """Final base-case wealth per property and strategy with the best choice.
+
+    "Best (Low)" and "Best (High)" are the highest final wealth of any strategy
+    under the low and high inputs, which need not be the base-case best.
+    """
+    import pandas as pd
+
+    final = wealth[1, :, -1, :]
+    order = np.argsort(final, axis=-1)
+    best, runner_up = order[:, -1], order[:, -2]
+    rows = np.arange(len(final))
+    ranking = pd.DataFrame(final, columns=STRATEGIES)
+    ranking.insert(0, "Property", properties["property"].to_numpy())
+    ranking["Best Strategy"] = np.array(STRATEGIES)[best]
+    ranking["Edge vs Next Best"] = final[rows, best] - final[rows, runner_up]
+    ranking["Best (Low)"] = wealth[0, :, -1, :].max(axis=-1)
+    ranking["Best (High)"] = wealth[2, :, -1, :].max(axis=-1)
+    # Highest best-strategy wealth first
+    return ranking.iloc[np.argsort(-final[rows, best], kind="stable")].reset_index(drop=True)
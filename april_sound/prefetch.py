@@ -0,0 +1,63 @@
+"""Speculative background warming of the result cache around the current inputs."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from itertools import islice
+
+from .sensitivity import INPUT_RANGES
+
+# The rate sliders, which are usually dragged a step or two at a time
+SLIDER_INPUTS = (
+    "market_return", "appreciation", "rent_growth", "vacancy_rate",
+    "property_tax_rate", "maintenance_rate", "income_tax_rate",
+)
+
+
+def neighbor_changes(params, names=SLIDER_INPUTS, steps=1):
+    """Single-input changes {name: value} up to steps slider steps from params, nearest first.
+
+    Values outside the slider's bounds are skipped.
+    """
+    for distance in range(1, steps + 1):
+        for name in names:
+            bounds = INPUT_RANGES[name]
+            for direction in (-1, 1):
+                value = round(getattr(params, name) + direction * distance * bounds.step, 10)
+                if bounds.low <= value <= bounds.high:
+                    yield {name: value}
+
+
+def neighbor_params(scenarios, names=SLIDER_INPUTS, steps=1):
+    """Each neighbor change applied to every one of scenarios (e.g. low, base, high).
+
+    The changes are taken around the first scenario; a slider moves all of them together.
+    """
+    for change in neighbor_changes(scenarios[0], names, steps):
+        for params in scenarios:
+            yield replace(params, **change)
+
+
+class Prefetcher:
+    """Warms a ResultCache from a background thread pool.
+
+    Each submit() runs at most budget jobs and returns a threading.Event that
+    cancels whatever is left of them once set, so a rerun with new inputs can
+    drop speculative work that no longer applies.
+    """
+
+    def __init__(self, cache, budget=48, workers=1):
+        self.cache = cache
+        self.budget = budget
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+
+    def submit(self, jobs):
+        """Queue (key, compute) pairs to warm in order; returns their cancel event."""
+        cancel = threading.Event()
+        self._executor.submit(self._run, list(islice(jobs, self.budget)), cancel)
+        return cancel
+
+    def _run(self, jobs, cancel):
+        for key, compute in jobs:
+            if cancel.is_set():
+                return
+            self.cache.warm(key, compute)
@@ -0,0 +1,76 @@
+"""Opt-in wall-clock profiler for one script run of the app."""
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+
+class RerunProfiler:
+    """Times named, possibly nested sections of a single rerun.
+
+    A disabled profiler keeps the same interface but records nothing, so the
+    app can wrap its sections unconditionally.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.sections = []  # (name, depth, seconds) in start order
+        self._open = []  # (index into sections, start time)
+        self._started = time.perf_counter()
+
+    def start(self, name):
+        if not self.enabled:
+            return
+        self.sections.append((name, len(self._open), None))
+        self._open.append((len(self.sections) - 1, time.perf_counter()))
+
+    def stop(self):
+        if not self.enabled:
+            return
+        index, started = self._open.pop()
+        name, depth, _ = self.sections[index]
+        self.sections[index] = (name, depth, time.perf_counter() - started)
+
+    @contextmanager
+    def section(self, name):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def _finished(self):
+        return [(name, depth, seconds) for name, depth, seconds in self.sections if seconds is not None]
+
+    def total(self):
+        """Seconds since the profiler was created."""
+        return time.perf_counter() - self._started
+
+    def table(self):
+        """Finished sections as a DataFrame; nested sections are prefixed with one dot per level."""
+        import pandas as pd
+
+        total = self.total()
+        finished = self._finished()
+        return pd.DataFrame({
+            "Section": ["· " * depth + name for name, depth, _ in finished],
+            "ms": [seconds * 1000 for _, _, seconds in finished],
+            "Share": [seconds / total for _, _, seconds in finished],
+        })
+
+    def record(self, **fields):
+        """One JSON-serializable log record of this run, with extra fields merged in."""
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            **fields,
+            "total_ms": round(self.total() * 1000, 3),
+            "sections": [
+                {"name": name, "depth": depth, "ms": round(seconds * 1000, 3)}
+                for name, depth, seconds in self._finished()
+            ],
+        }
+
+    def append_log(self, path, **fields):
+        """Append this run's record to a JSONL file."""
+        with open(path, "a", encoding="utf-8") as log:
+            log.write(json.dumps(self.record(**fields)) + "\n")
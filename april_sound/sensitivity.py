@@ -0,0 +1,90 @@
+"""Sensitivity sweeps over the model inputs, evaluated as single batches."""
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from .engine import STRATEGIES, run_batch
+
+
+@dataclass(frozen=True)
+class InputRange:
+    """Label, bounds and step of a sweepable ScenarioParams field (model units)."""
+    label: str
+    low: float
+    high: float
+    step: float
+    percent: bool = False
+
+
+# Mirrors the sidebar widgets in app.py
+INPUT_RANGES = {
+    "market_return": InputRange("Market Portfolio Return", 0.0, 0.15, 0.005, percent=True),
+    "appreciation": InputRange("Property Appreciation", 0.0, 0.15, 0.005, percent=True),
+    "rent_growth": InputRange("Annual Rent Growth", 0.0, 0.10, 0.0025, percent=True),
+    "vacancy_rate": InputRange("Vacancy Rate", 0.0, 1.0, 0.01, percent=True),
+    "val_asis": InputRange("Property Value (As-Is)", 100000, 500000, 5000),
+    "val_ref": InputRange("Property Value (Refurbished)", 200000, 700000, 5000),
+    "rent_asis": InputRange("Monthly Rent (As-Is)", 1000, 5000, 50),
+    "rent_ref": InputRange("Monthly Rent (Refurbished)", 1500, 6000, 50),
+    "refurb": InputRange("Refurbishment Cost", 0, 150000, 5000),
+    "property_tax_rate": InputRange("Property Tax Rate", 0.005, 0.03, 0.001, percent=True),
+    "maintenance_rate": InputRange("Maintenance Reserve", 0.0, 0.03, 0.0025, percent=True),
+    "hoa_annual": InputRange("HOA + Social Fees", 0, 10000, 100),
+    "management_fee": InputRange("Management Fee", 0.0, 0.10, 0.10, percent=True),
+    "income_tax_rate": InputRange("Marginal Income Tax Rate", 0.10, 0.37, 0.01, percent=True),
+}
+
+
+def sweep_grid(params, x_name, x_values, y_name, y_values, years=25):
+    """Final-year wealth over a 2-D grid of two inputs, shaped (len(y), len(x), strategies).
+
+    Every grid point is evaluated in one run_batch call; all other inputs stay
+    at their values in params.
+    """
+    if x_name == y_name:
+        raise ValueError(f"Cannot sweep '{x_name}' against itself")
+    grid = replace(params, **{
+        x_name: np.asarray(x_values, dtype=float)[None, :],
+        y_name: np.asarray(y_values, dtype=float)[:, None],
+    })
+    return run_batch(**grid.engine_inputs(), years=years)[..., -1, :]
+
+
+def slider_steps(name):
+    """Every value the sidebar widget for name can take, from low to high."""
+    spec = INPUT_RANGES[name]
+    return np.linspace(spec.low, spec.high, int(round((spec.high - spec.low) / spec.step)) + 1)
+
+
+def step_sweep(params, name, values=None, years=25):
+    """Wealth paths with name set to each of values (every slider step by default).
+
+    Evaluated in one run_batch call. Returns (values, wealth) with wealth shaped
+    (len(values), years + 1, strategies).
+    """
+    values = slider_steps(name) if values is None else np.asarray(values, dtype=float)
+    return values, run_batch(**replace(params, **{name: values}).engine_inputs(), years=years)
+
+
+def strategy_difference(wealth, strategy_a, strategy_b):
+    """Wealth of strategy_a minus strategy_b along the last (strategy) axis."""
+    return wealth[..., STRATEGIES.index(strategy_a)] - wealth[..., STRATEGIES.index(strategy_b)]
+
+
+def tornado(params, bounds=None, year=25):
+    """Final wealth with each input pushed to its low and high bound, others at base.
+
+    bounds maps input names to (low, high) and overrides the INPUT_RANGES
+    limits for those inputs. All 2 x N perturbed scenarios are evaluated in
+    one run_batch call. Returns (names, wealth) with wealth shaped
+    (len(names), 2, strategies): [:, 0] at the low bound, [:, 1] at the high.
+    """
+    bounds = {name: (spec.low, spec.high) for name, spec in INPUT_RANGES.items()} | (bounds or {})
+    names = list(bounds)
+
+    # Row i holds the base scenario with input i swapped for its low / high bound
+    columns = {name: np.full((len(names), 2), float(getattr(params, name))) for name in names}
+    for i, name in enumerate(names):
+        columns[name][i] = bounds[name]
+    wealth = run_batch(**replace(params, **columns).engine_inputs(), years=year)[..., -1, :]
+    return names, wealth
@@ -0,0 +1,207 @@
+"""Benchmark suite for the engine, figure building and a full app rerun.
+
+    python benchmarks/bench.py -o bench.json                  # run and save
+    python benchmarks/bench.py --compare baseline.json        # flag regressions
+    python benchmarks/bench.py --only engine --quick          # subset, fewer repeats
+
+Three levels are measured:
+  engine   run_scenario at 25/50/100-year horizons and run_batch at batch
+           sizes of 1, 1k and 100k scenarios
+  figures  building (and JSON-serializing) the main band chart, the wealth
+           composition bar chart and the tax savings chart
+  app      an end-to-end script run through Streamlit's AppTest harness: a
+           cold first run with every Streamlit cache cleared, then reruns
+
+Each benchmark records the best and median time per call in seconds.
+With --compare, any benchmark whose best time grew by more than --threshold
+(default 25%) against the baseline is reported and the exit code is 1.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from april_sound import ScenarioParams, run_batch, run_scenario, tax_shield_table  # noqa: E402
+
+LEVELS = ("engine", "figures", "app")
+HORIZONS = (25, 50, 100)
+BATCH_SIZES = (1, 1_000, 100_000)
+
+# Sidebar defaults from app.py
+BASE = ScenarioParams(val_asis=365000, val_ref=495000, rent_asis=2550, rent_ref=3350, refurb=60000)
+LOW = replace(BASE, val_asis=340000, val_ref=485000, rent_asis=2350, rent_ref=3200, refurb=75000)
+HIGH = replace(BASE, val_asis=390000, val_ref=510000, rent_asis=2750, rent_ref=3500, refurb=50000)
+
+
+def measure(fn, repeat=5):
+    """Best and median seconds per call, with loop counts calibrated like timeit."""
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()
+    times = [t / loops for t in timer.repeat(repeat=repeat, number=loops)]
+    return {"best": min(times), "median": statistics.median(times), "loops": loops}
+
+
+def random_batch(size, seed=0):
+    """ScenarioParams whose property and rate inputs vary across a batch."""
+    rng = np.random.default_rng(seed)
+    return replace(
+        BASE,
+        val_asis=rng.uniform(340000, 390000, size),
+        val_ref=rng.uniform(485000, 510000, size),
+        rent_asis=rng.uniform(2350, 2750, size),
+        rent_ref=rng.uniform(3200, 3500, size),
+        refurb=rng.uniform(50000, 75000, size),
+        market_return=rng.uniform(0.04, 0.08, size),
+        appreciation=rng.uniform(0.02, 0.04, size),
+    )
+
+
+def bench_engine(repeat):
+    results = {}
+    for years in HORIZONS:
+        results[f"engine.run_scenario[years={years}]"] = measure(lambda: run_scenario(BASE, years), repeat)
+        for size in BATCH_SIZES:
+            inputs = random_batch(size).engine_inputs()
+            results[f"engine.run_batch[years={years},batch={size}]"] = measure(
+                lambda: run_batch(**inputs, years=years), repeat
+            )
+    return results
+
+
+def bench_figures(repeat):
+    from april_sound.charts import (
+        add_breakdown_columns, breakdown_chart, sweep_animation, tax_savings_chart, wealth_band_chart,
+    )
+    from april_sound.sensitivity import step_sweep
+
+    df_base, df_low, df_high = (run_scenario(p) for p in (BASE, LOW, HIGH))
+    add_breakdown_columns(df_base)
+    tax_shield_df = tax_shield_table(BASE)
+    sweep_values, sweep_wealth = step_sweep(BASE, "market_return")
+    sweep_labels = [f"{v * 100:.2f}%" for v in sweep_values]
+
+    builders = {
+        "wealth_band": lambda: wealth_band_chart(df_low, df_base, df_high),
+        "breakdown": lambda: breakdown_chart(df_base),
+        "tax_savings": lambda: tax_savings_chart(tax_shield_df, BASE.income_tax_rate),
+        "sweep_animation": lambda: sweep_animation(sweep_labels, sweep_wealth, "Market Portfolio Return"),
+    }
+    results = {}
+    for name, build in builders.items():
+        fig = build()
+        results[f"figures.{name}.build"] = measure(build, repeat)
+        results[f"figures.{name}.to_json"] = measure(fig.to_json, repeat)
+    return results
+
+
+def bench_app(repeat):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    script = str(ROOT / "app.py")
+
+    def first_run():
+        # The shared result caches outlive a session; clear them so every first run is cold
+        st.cache_resource.clear()
+        st.cache_data.clear()
+        AppTest.from_file(script, default_timeout=120).run()
+
+    at = AppTest.from_file(script, default_timeout=120).run()
+    if at.exception:
+        raise RuntimeError(f"app.py raised during the benchmark run: {at.exception[0].message}")
+
+    returns = iter(np.tile(np.arange(0.0, 15.5, 0.5), 1000))
+
+    def slider_rerun():
+        at.slider[0].set_value(float(next(returns))).run()
+
+    # Whole-script runs are slow enough that a few single calls suffice
+    results = {}
+    for name, fn in [("app.first_run", first_run), ("app.rerun", at.run), ("app.rerun_slider", slider_rerun)]:
+        fn()
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        results[name] = {"best": min(times), "median": statistics.median(times), "loops": 1}
+    return results
+
+
+def run(levels, repeat):
+    runners = {"engine": bench_engine, "figures": bench_figures, "app": bench_app}
+    results = {}
+    for level in levels:
+        print(f"Running {level} benchmarks...", file=sys.stderr)
+        results.update(runners[level](repeat))
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Print a comparison table and return the names of regressed benchmarks."""
+    regressions = []
+    print(f"{'benchmark':<48} {'baseline':>11} {'current':>11} {'change':>8}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<48} {'-':>11} {result['best'] * 1e3:>9.3f}ms {'new':>8}")
+            continue
+        ratio = result["best"] / base["best"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<48} {base['best'] * 1e3:>9.3f}ms {result['best'] * 1e3:>9.3f}ms {ratio - 1:>+7.0%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-o", "--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a stored results JSON")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown before flagging a regression (default 0.25 = 25%%)")
+    parser.add_argument("--only", nargs="+", choices=LEVELS, default=list(LEVELS), help="Levels to run")
+    parser.add_argument("--quick", action="store_true", help="Fewer repeats per benchmark")
+    args = parser.parse_args(argv)
+
+    current = run(args.only, repeat=2 if args.quick else 5)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=2))
+        print(f"Saved results to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}", file=sys.stderr)
+            return 1
+    else:
+        for name, result in current["results"].items():
+            print(f"{name:<48} best {result['best'] * 1e3:>9.3f}ms  median {result['median'] * 1e3:>9.3f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""Shared fixtures: the sidebar defaults of app.py as ScenarioParams."""
+import pytest
+
+from april_sound import ScenarioParams
+
+
+@pytest.fixture
+def base():
+    return ScenarioParams(val_asis=365000, val_ref=495000, rent_asis=2550, rent_ref=3350, refurb=60000)
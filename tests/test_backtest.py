@@ -0,0 +1,74 @@
+"""Rolling-window backtest against constant-rate projections and history validation."""
+import io
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from april_sound import STRATEGIES, run_scenario
+from april_sound.backtest import backtest, load_history
+
+
+def constant_history(start, n_years, equity, home, rent):
+    return pd.DataFrame({
+        "year": np.arange(start, start + n_years),
+        "equity_return_pct": equity,
+        "home_price_pct": home,
+        "rent_pct": rent,
+    })
+
+
+def test_constant_history_matches_run_scenario(base):
+    history = constant_history(1970, 40, equity=8.0, home=4.5, rent=3.0)
+    _, wealth = backtest(base, history, years=25)
+    expected = run_scenario(replace(base, market_return=0.08, appreciation=0.045, rent_growth=0.03))
+    for window in wealth:
+        np.testing.assert_allclose(window, expected[STRATEGIES], rtol=1e-12)
+
+
+@pytest.mark.parametrize("n_years, years", [(40, 25), (25, 25), (30, 10)])
+def test_one_window_per_start_year(base, n_years, years):
+    history = constant_history(1950, n_years, equity=6.0, home=3.0, rent=2.5)
+    start_years, wealth = backtest(base, history, years=years)
+    assert wealth.shape == (n_years - years + 1, years + 1, len(STRATEGIES))
+    np.testing.assert_array_equal(start_years, np.arange(1950, 1950 + n_years - years + 1))
+
+
+def test_windows_use_their_own_years(base):
+    # A crash in one year only touches the windows that contain it
+    history = constant_history(2000, 12, equity=6.0, home=3.0, rent=2.5)
+    history.loc[history["year"] == 2008, "equity_return_pct"] = -37.0
+    start_years, wealth = backtest(base, history, years=5)
+    final = wealth[:, -1, 2]
+    hit = (start_years <= 2008) & (2008 < start_years + 5)
+    assert np.allclose(final[~hit], final[0])
+    assert (final[hit] < final[0]).all()
+
+
+def test_short_history_raises(base):
+    with pytest.raises(ValueError, match="fewer than the 25-year horizon"):
+        backtest(base, constant_history(2000, 24, equity=6.0, home=3.0, rent=2.5))
+
+
+def test_bundled_history_loads():
+    history = load_history()
+    assert (np.diff(history["year"]) == 1).all()
+    assert len(history) >= 25
+
+
+def test_non_consecutive_years_raise():
+    csv = "year,equity_return_pct,home_price_pct,rent_pct\n2000,5,3,2\n2001,6,3,2\n2003,7,3,2\n"
+    with pytest.raises(ValueError, match="consecutive"):
+        load_history(io.StringIO(csv))
+
+
+def test_unsorted_years_are_sorted():
+    csv = "year,equity_return_pct,home_price_pct,rent_pct\n2001,6,3,2\n2000,5,3,2\n"
+    assert list(load_history(io.StringIO(csv))["year"]) == [2000, 2001]
+
+
+def test_missing_column_raises():
+    csv = "year,equity_return_pct,home_price_pct\n2000,5,3\n2001,6,3\n"
+    with pytest.raises(ValueError, match="missing columns: rent_pct"):
+        load_history(io.StringIO(csv))
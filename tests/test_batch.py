@@ -0,0 +1,111 @@
+"""Scenario file loading and the batch CLI against run_batch."""
+import json
+from dataclasses import asdict
+
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+
+from april_sound import STRATEGIES, ScenarioParams, run_batch
+from april_sound.batch import PARAM_FIELDS, evaluate_chunk, load_scenarios, main
+
+SCENARIOS = [
+    {"scenario_id": "base", "val_asis": 365000, "val_ref": 495000, "rent_asis": 2550, "rent_ref": 3350, "refurb": 60000},
+    {"scenario_id": "bull", "val_asis": 380000, "val_ref": 510000, "rent_asis": 2700, "rent_ref": 3500,
+     "refurb": 55000, "market_return": 0.09, "appreciation": 0.045},
+    {"scenario_id": "bear", "val_asis": 340000, "val_ref": 470000, "rent_asis": 2400, "rent_ref": 3100,
+     "refurb": 75000, "market_return": 0.02, "vacancy_rate": 0.12},
+]
+
+
+def scenario_params(rows):
+    """ScenarioParams batch of rows, with defaults for omitted fields."""
+    return ScenarioParams(**{
+        name: np.array([float(row.get(name, default)) for row in rows]) for name, default in PARAM_FIELDS.items()
+    })
+
+
+def test_load_json_fills_defaults(tmp_path):
+    path = tmp_path / "scenarios.json"
+    path.write_text(json.dumps(SCENARIOS))
+    ids, columns = load_scenarios(path)
+    assert list(ids) == ["base", "bull", "bear"]
+    assert set(columns) == set(PARAM_FIELDS)
+    expected = asdict(scenario_params(SCENARIOS))
+    for name, values in columns.items():
+        np.testing.assert_array_equal(values, expected[name], err_msg=name)
+
+
+def test_load_csv_with_blank_cells_matches_json(tmp_path):
+    names = ["val_asis", "val_ref", "rent_asis", "rent_ref", "refurb", "market_return"]
+    lines = [",".join(names)]
+    lines += [",".join(str(row.get(name, "")) for name in names) for row in SCENARIOS]
+    csv_path = tmp_path / "scenarios.csv"
+    csv_path.write_text("\n".join(lines) + "\n")
+    json_path = tmp_path / "scenarios.json"
+    json_path.write_text(json.dumps([{name: row[name] for name in names if name in row} for row in SCENARIOS]))
+
+    csv_ids, csv_columns = load_scenarios(csv_path)
+    json_ids, json_columns = load_scenarios(json_path)
+    # Without a scenario_id column scenarios are numbered by position
+    np.testing.assert_array_equal(csv_ids, np.arange(3))
+    np.testing.assert_array_equal(json_ids, np.arange(3))
+    for name in PARAM_FIELDS:
+        np.testing.assert_array_equal(csv_columns[name], json_columns[name], err_msg=name)
+
+
+@pytest.mark.parametrize("rows, message", [
+    ([{**SCENARIOS[0], "market_retrun": 0.07}], "Unknown scenario fields: market_retrun"),
+    ([{"val_asis": 365000, "val_ref": 495000, "rent_asis": 2550, "rent_ref": 3350}], "missing required field 'refurb'"),
+])
+def test_load_rejects_bad_fields(tmp_path, rows, message):
+    path = tmp_path / "scenarios.json"
+    path.write_text(json.dumps(rows))
+    with pytest.raises(ValueError, match=message):
+        load_scenarios(path)
+
+
+def test_load_rejects_unknown_format(tmp_path):
+    path = tmp_path / "scenarios.xlsx"
+    path.write_text("")
+    with pytest.raises(ValueError, match="expected .json or .csv"):
+        load_scenarios(path)
+
+
+def test_evaluate_chunk_is_long_format_run_batch():
+    params = scenario_params(SCENARIOS)
+    ids = np.array(["base", "bull", "bear"])
+    result = evaluate_chunk(ids, asdict(params), years=10)
+    wealth = run_batch(**params.engine_inputs(), years=10)
+    assert len(result["year"]) == 3 * 11
+    np.testing.assert_array_equal(result["scenario_id"], np.repeat(ids, 11))
+    np.testing.assert_array_equal(result["year"], np.tile(np.arange(11), 3))
+    for i, strategy in enumerate(STRATEGIES):
+        np.testing.assert_array_equal(result[strategy], wealth[..., i].ravel())
+
+
+def test_main_writes_parquet(tmp_path, capsys):
+    source, output = tmp_path / "scenarios.json", tmp_path / "results.parquet"
+    source.write_text(json.dumps(SCENARIOS))
+    main([str(source), "-o", str(output), "--workers", "1", "--chunk-size", "2", "--years", "10", "-q"])
+    assert "Wrote 3 scenarios" in capsys.readouterr().err
+
+    table = pq.read_table(output).to_pandas()
+    wealth = run_batch(**scenario_params(SCENARIOS).engine_inputs(), years=10)
+    assert list(table["scenario_id"]) == list(np.repeat(["base", "bull", "bear"], 11))
+    assert list(table["year"]) == list(np.tile(np.arange(11), 3))
+    np.testing.assert_allclose(table[STRATEGIES].to_numpy(), wealth.reshape(-1, len(STRATEGIES)))
+
+
+@pytest.mark.parametrize("missing", ["input", "output"])
+def test_main_reports_file_errors(tmp_path, capsys, missing):
+    source, output = tmp_path / "scenarios.json", tmp_path / "results.parquet"
+    source.write_text(json.dumps(SCENARIOS))
+    if missing == "input":
+        source = tmp_path / "absent.json"
+    else:
+        output = tmp_path / "absent" / "results.parquet"
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(source), "-o", str(output), "--workers", "1", "-q"])
+    assert exit_info.value.code == 2
+    assert "absent" in capsys.readouterr().err
@@ -0,0 +1,53 @@
+"""Break-even bisection and crossover years against direct evaluation."""
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from april_sound import run_batch, run_scenario
+from april_sound.breakeven import PAIRS, breakeven_thresholds, crossover_years
+from april_sound.engine import STRATEGIES
+
+
+def test_thresholds_tie_each_pair(base):
+    thresholds, first_wins_above = breakeven_thresholds(base, "market_return")
+    assert np.isfinite(thresholds).any()
+    for (a, b), threshold, above in zip(PAIRS, thresholds, first_wins_above):
+        if np.isnan(threshold):
+            continue
+        final = run_scenario(replace(base, market_return=threshold))[STRATEGIES].to_numpy()[-1]
+        assert abs(final[a] - final[b]) < 1e-3 * abs(final[a])
+        # Just above the threshold the first strategy leads exactly when reported
+        nudged = run_scenario(replace(base, market_return=threshold + 1e-4))[STRATEGIES].to_numpy()[-1]
+        assert (nudged[a] > nudged[b]) == above
+
+
+def test_thresholds_match_dense_scan(base):
+    grid = np.linspace(0.0, 0.15, 3001)
+    final = run_batch(**replace(base, market_return=grid).engine_inputs())[:, -1, :]
+    thresholds, _ = breakeven_thresholds(base, "market_return", low=0.0, high=0.15)
+    for (a, b), threshold in zip(PAIRS, thresholds):
+        diff = final[:, a] - final[:, b]
+        flips = np.flatnonzero(np.sign(diff[1:]) != np.sign(diff[:-1]))
+        if len(flips) == 0:
+            assert np.isnan(threshold)
+        else:
+            assert grid[flips[0]] <= threshold <= grid[flips[0] + 1]
+
+
+def test_crossover_years_match_loop(base):
+    wealth = run_scenario(replace(base, market_return=0.09))[STRATEGIES].to_numpy()
+    for (a, b), year in zip(PAIRS, crossover_years(wealth)):
+        diff = np.sign(wealth[:, a] - wealth[:, b])
+        expected = next((y for y in range(1, len(diff)) if diff[y] != 0 and diff[y] != diff[y - 1]), -1)
+        assert year == expected
+
+
+@pytest.mark.parametrize("low", [0.0, 100000.0])
+def test_exact_tie_on_grid_point(base, low):
+    # Without selling costs Sell As-Is and Refurb & Sell tie exactly at refurb = val_ref - val_asis
+    params = replace(base, val_asis=365000, val_ref=465000, selling_costs=0.0)
+    thresholds, first_wins_above = breakeven_thresholds(params, "refurb", low=low, high=low + 128000)
+    pair = PAIRS.index((STRATEGIES.index("Sell As-Is"), STRATEGIES.index("Refurb & Sell")))
+    assert thresholds[pair] == pytest.approx(100000, abs=1e-6)
+    assert first_wins_above[pair]
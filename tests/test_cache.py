@@ -0,0 +1,110 @@
+"""ResultCache expiry, eviction and counters, and the cache key helpers."""
+from dataclasses import replace
+
+import pytest
+
+from april_sound import ResultCache, snapshot
+from april_sound.cache import fingerprint
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def counter():
+    """A compute function returning 1, 2, 3, ... on successive calls."""
+    calls = []
+
+    def compute():
+        calls.append(None)
+        return len(calls)
+
+    return compute
+
+
+def test_ttl_expires_entries():
+    clock = FakeClock()
+    cache = ResultCache(ttl=10, clock=clock)
+    compute = counter()
+    assert cache.get_or_compute("a", compute) == 1
+    clock.now = 9.9
+    assert cache.get_or_compute("a", compute) == 1
+    clock.now = 10.0
+    assert cache.get_or_compute("a", compute) == 2
+    # The refreshed entry's lifetime starts when it was recomputed
+    clock.now = 19.9
+    assert cache.get_or_compute("a", compute) == 2
+
+
+def test_expired_entry_is_dropped_even_if_compute_fails():
+    clock = FakeClock()
+    cache = ResultCache(ttl=10, clock=clock)
+    cache.get_or_compute("a", lambda: 1)
+    clock.now = 10.0
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("a", fail)
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    cache.get_or_compute("a", lambda: "a")
+    cache.get_or_compute("b", lambda: "b")
+    # A hit makes "a" the most recently used, so "b" goes first
+    cache.get_or_compute("a", lambda: "stale")
+    cache.get_or_compute("c", lambda: "c")
+    assert cache.get_or_compute("a", lambda: "recomputed") == "a"
+    assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+    assert cache.stats()["evictions"] == 2
+
+
+def test_stats_count_hits_and_misses():
+    cache = ResultCache()
+    for key in ("a", "b", "a", "a", "c"):
+        cache.get_or_compute(key, lambda: key)
+    assert cache.stats() == {"hits": 2, "misses": 3, "evictions": 0, "warmed": 0, "entries": 3}
+
+
+def test_warm_fills_without_counting():
+    clock = FakeClock()
+    cache = ResultCache(ttl=10, clock=clock)
+    compute = counter()
+    assert cache.warm("a", compute)
+    assert not cache.warm("a", compute)
+    assert cache.get_or_compute("a", compute) == 1
+    clock.now = 10.0
+    assert cache.warm("a", compute)
+    assert cache.stats() == {"hits": 1, "misses": 0, "evictions": 0, "warmed": 2, "entries": 1}
+
+
+def test_discard_drops_key():
+    cache = ResultCache()
+    compute = counter()
+    cache.get_or_compute("a", compute)
+    cache.discard("a")
+    cache.discard("missing")
+    assert cache.get_or_compute("a", compute) == 2
+    assert cache.stats()["evictions"] == 0
+
+
+def test_snapshot_ignores_order_and_float_noise():
+    assert snapshot(a=1, b=0.1 + 0.2) == snapshot(b=0.3, a=1.0)
+    assert snapshot(a=0.3) != snapshot(a=0.31)
+
+
+def test_fingerprint_of_dataclasses_mappings_and_floats(base):
+    same = replace(base, val_asis=365000.0, market_return=0.1 - 0.04)
+    assert fingerprint(base) == fingerprint(same)
+    assert hash(fingerprint(base)) == hash(fingerprint(same))
+    assert fingerprint(base) != fingerprint(replace(base, hoa_annual=2001))
+    assert fingerprint({"x": 1, "y": 2}) == fingerprint({"y": 2.0, "x": 1.0})
+    assert fingerprint(0.1 + 0.2) == fingerprint(0.3)
+    assert fingerprint(5) == 5.0
@@ -0,0 +1,88 @@
+"""Indexed CompStore queries against plain pandas boolean masks."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from april_sound.comps import COMP_COLUMNS, CompStore
+
+
+@pytest.fixture(scope="module")
+def store():
+    rng = np.random.default_rng(24)
+    n = 2000
+    dates = pd.Series(pd.to_datetime("2018-01-01") + pd.to_timedelta(rng.integers(0, 8 * 365, n), unit="D"))
+    # Some comps are undated, and several share a sale date
+    dates[rng.random(n) < 0.1] = pd.NaT
+    frame = pd.DataFrame({
+        "address": [f"{i} Lakeview Dr" for i in range(n)],
+        "community": rng.choice(["April Sound", "Walden", "Bentwater"], n),
+        "kind": rng.choice(["sale", "rental"], n),
+        "sqft": rng.integers(1200, 3000, n),
+        "beds": rng.integers(2, 5, n),
+        "baths": rng.choice([2.0, 2.5, 3.0], n),
+        "price": rng.uniform(1000, 600000, n),
+        "condition": rng.choice(["Original", "Updated", "Renovated"], n),
+        "view": rng.choice(["Interior", "Lakeside", "Water View", "Open Water"], n),
+        "date": dates.dt.strftime("%Y-%m-%d").astype("string"),
+        "status": "Sold",
+        "subject": np.arange(n) < 2,
+    })[COMP_COLUMNS]
+    return CompStore(frame)
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"kind": "sale"},
+    {"kind": "rental", "community": "Walden"},
+    {"condition": ["Updated", "Renovated"], "view": "Open Water"},
+    {"community": ["April Sound", "Bentwater"], "view": ["Interior", "Lakeside"], "subject": False},
+    {"kind": "sale", "since": "2022-01-01"},
+    {"until": "2019-06-30"},
+    {"condition": "Renovated", "since": "2020-03-15", "until": "2021-03-15"},
+    {"kind": "rental", "since": "2030-01-01"},
+    {"community": "Nowhere"},
+    {"view": [], "kind": "sale"},
+    {"subject": True},
+])
+def test_positions_match_boolean_mask(store, filters):
+    frame = store.frame
+    mask = np.ones(len(frame), dtype=bool)
+    for column in ("kind", "community", "condition", "view"):
+        if column in filters:
+            wanted = filters[column]
+            mask &= frame[column].isin([wanted] if isinstance(wanted, str) else wanted).to_numpy()
+    # Date bounds are inclusive and leave out undated comps
+    if "since" in filters:
+        mask &= (frame["date"] >= pd.Timestamp(filters["since"])).to_numpy()
+    if "until" in filters:
+        mask &= (frame["date"] <= pd.Timestamp(filters["until"])).to_numpy()
+    if "subject" in filters:
+        mask &= (frame["subject"] == filters["subject"]).to_numpy()
+
+    positions = store.positions(**filters)
+    np.testing.assert_array_equal(positions, np.flatnonzero(mask))
+    pd.testing.assert_frame_equal(store.query(**filters), frame[mask])
+
+
+def test_date_bounds_are_inclusive(store):
+    day = store.frame["date"].dropna().iloc[0]
+    on_day = store.positions(since=day, until=day)
+    assert len(on_day) >= 1
+    assert (store.frame["date"].iloc[on_day] == day).all()
+
+
+def test_bundled_comps():
+    comps = CompStore.from_file()
+    assert set(comps.values("kind")) == {"sale", "rental"}
+    assert comps.subject("sale")["address"] == "144 April Point Dr S"
+    assert not comps.query(subject=False)["subject"].any()
+    # Renovated units sell for more per square foot than original ones
+    assert comps.premium("sale", "condition", "Renovated", "Original") > 0
+    assert np.isnan(comps.premium("sale", "condition", "Mint", "Original"))
+
+
+def test_rejects_missing_columns_and_unknown_kinds(store):
+    with pytest.raises(ValueError, match="missing columns: status"):
+        CompStore(store.frame.drop(columns="status"))
+    with pytest.raises(ValueError, match="Unknown comp kind"):
+        CompStore(store.frame.assign(kind="lease"))
@@ -0,0 +1,62 @@
+"""run_scenario and run_batch against the original year-by-year loop of the app."""
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from april_sound import STRATEGIES, run_batch, run_scenario
+
+
+def loop_scenario(params, years=25):
+    """The per-year loop run_scenario replaced, returning {column: list of yearly values}."""
+    p = params
+    columns = {name: [] for name in STRATEGIES + ["Cash (As-Is)", "Cash (Refurb)"]}
+    s3_gross = p.val_asis * (1 - p.selling_costs)
+    s4_gross = p.val_ref * (1 - p.selling_costs) - p.refurb
+    cash_s1 = cash_s2 = 0
+    for y in range(years + 1):
+        v_as_is = p.val_asis * (1 + p.appreciation) ** y
+        v_refurb = p.val_ref * (1 + p.appreciation) ** y
+        if y > 0:
+            cash_flows = []
+            for rent, value in ((p.rent_asis, v_as_is), (p.rent_ref, v_refurb)):
+                net_rent = rent * 12 * (1 + p.rent_growth) ** (y - 1) * (1 - p.vacancy_rate) * (1 - p.management_fee)
+                noi = net_rent - (value * p.expense_rate + p.hoa_annual)
+                tax = max(0, noi - p.annual_depreciation) * p.income_tax_rate
+                cash_flows.append(noi - tax)
+            cash_s1 = cash_s1 * (1 + p.market_return) + cash_flows[0]
+            cash_s2 = cash_s2 * (1 + p.market_return) + cash_flows[1]
+        refurb_paid = p.refurb if y == 0 else 0
+        columns["Rent As-Is"].append(v_as_is + cash_s1)
+        columns["Refurb & Rent"].append(v_refurb + cash_s2 - refurb_paid)
+        columns["Sell As-Is"].append(s3_gross * (1 + p.market_return) ** y)
+        columns["Refurb & Sell"].append(s4_gross * (1 + p.market_return) ** y)
+        columns["Cash (As-Is)"].append(cash_s1)
+        columns["Cash (Refurb)"].append(cash_s2 - refurb_paid)
+    return columns
+
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"market_return": 0.0, "appreciation": 0.0, "rent_growth": 0.0},
+    {"management_fee": 0.08, "vacancy_rate": 0.3, "income_tax_rate": 0.37},
+    # Negative NOI: the depreciation shield floors taxable income at zero
+    {"hoa_annual": 40000, "market_return": 0.12},
+])
+def test_run_scenario_matches_loop(base, overrides):
+    params = replace(base, **overrides)
+    result = run_scenario(params, years=30)
+    for column, expected in loop_scenario(params, years=30).items():
+        np.testing.assert_allclose(result[column], expected, rtol=1e-9, atol=1e-6, err_msg=column)
+
+
+def test_run_batch_broadcasts_to_scalar_runs(base):
+    market_returns = np.array([0.02, 0.06, 0.1])[:, None]
+    appreciations = np.array([0.0, 0.03])
+    batch = replace(base, market_return=market_returns, appreciation=appreciations)
+    wealth = run_batch(**batch.engine_inputs())
+    assert wealth.shape == (3, 2, 26, len(STRATEGIES))
+    for i, market_return in enumerate(market_returns[:, 0]):
+        for j, appreciation in enumerate(appreciations):
+            single = run_scenario(replace(base, market_return=market_return, appreciation=appreciation))
+            np.testing.assert_allclose(wealth[i, j], single[STRATEGIES].to_numpy(), rtol=1e-12)
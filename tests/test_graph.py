@@ -0,0 +1,46 @@
+"""ModelGraph memoization against direct evaluation."""
+from dataclasses import replace
+
+import numpy as np
+
+from april_sound import simulate_paths
+from april_sound.graph import NODES, SIMULATION_NODES, ModelGraph, evaluate, prepare_inputs
+
+MC = dict(market_vol=0.15, appreciation_vol=0.05, rent_growth_vol=0.03, vacancy_vol=0.03, n_paths=500, seed=7)
+
+
+def graph_inputs(params):
+    return prepare_inputs(25, **params.engine_inputs())[1]
+
+
+def test_graph_matches_evaluate_after_updates(base):
+    graph = ModelGraph()
+    for params in (base, replace(base, hoa_annual=3000), replace(base, market_return=0.09, rent_ref=3600)):
+        graph.update(**graph_inputs(params))
+        for name in NODES:
+            np.testing.assert_array_equal(graph.get(name), evaluate([name], **graph_inputs(params))[name])
+
+
+def test_only_downstream_nodes_recompute(base):
+    graph = ModelGraph()
+    graph.update(**graph_inputs(base))
+    graph.get("strategies")
+    graph.update(**graph_inputs(replace(base, hoa_annual=3000)))
+    graph.get("strategies")
+    assert sorted(graph.recomputed) == sorted(["expenses", "noi", "tax", "after_tax_cf", "cash", "wealth", "strategies"])
+
+    graph.update(**graph_inputs(replace(base, hoa_annual=3000)))
+    graph.get("strategies")
+    assert graph.recomputed == []
+
+
+def test_unkept_nodes_recompute_but_draws_are_reused(base):
+    keep = ("market_index", "value_index", "rent_index", "vacancy", "portfolios", "vals", "rents", "refurbs")
+    graph = ModelGraph(SIMULATION_NODES, keep=keep)
+    simulate_paths(**base.engine_inputs(), **MC, graph=graph)
+    changed = replace(base, hoa_annual=3000)
+    paths = simulate_paths(**changed.engine_inputs(), **MC, graph=graph)
+    assert not set(graph.recomputed) & set(keep + ("shocks",))
+    # values is not kept, so it is rebuilt on the way to expenses
+    assert "values" in graph.recomputed
+    np.testing.assert_array_equal(paths, simulate_paths(**changed.engine_inputs(), **MC))
@@ -0,0 +1,65 @@
+"""Exit-timing matrix against selling in each year one at a time."""
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from april_sound import DEPRECIATION_YEARS, STRATEGIES, run_scenario
+from april_sound.liquidation import exit_matrix, optimal_exits
+
+
+def sell_in_year(params, exit_year, cap_gains_tax, recapture_rate, years=25):
+    """Final wealth of the two rent strategies when selling at the end of exit_year, one year at a time."""
+    p = params
+    depreciation = p.annual_depreciation * min(exit_year, DEPRECIATION_YEARS)
+    finals = []
+    for val, rent, refurb in ((p.val_asis, p.rent_asis, 0.0), (p.val_ref, p.rent_ref, p.refurb)):
+        cash = 0.0
+        for y in range(1, exit_year + 1):
+            value = val * (1 + p.appreciation) ** y
+            net_rent = rent * 12 * (1 + p.rent_growth) ** (y - 1) * (1 - p.vacancy_rate) * (1 - p.management_fee)
+            noi = net_rent - (value * p.expense_rate + p.hoa_annual)
+            cash = cash * (1 + p.market_return) + noi - max(0, noi - p.annual_depreciation) * p.income_tax_rate
+
+        net_sale = val * (1 + p.appreciation) ** exit_year * (1 - p.selling_costs)
+        gain = net_sale - (p.val_asis + refurb - depreciation)
+        sale_tax = max(0, min(depreciation, gain)) * recapture_rate + max(0, gain - depreciation) * cap_gains_tax
+        # The refurb outlay is carried as the market growth it forgoes
+        at_exit = net_sale - sale_tax + cash - refurb * (1 + p.market_return) ** exit_year
+        finals.append(at_exit * (1 + p.market_return) ** (years - exit_year))
+    return finals
+
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"appreciation": -0.01, "market_return": 0.09},
+    {"building_value": 500000, "hoa_annual": 9000},
+])
+def test_exit_matrix_matches_selling_each_year(base, overrides):
+    params = replace(base, **overrides)
+    matrix = exit_matrix(params, cap_gains_tax=0.188, recapture_rate=0.25)
+    assert list(matrix.columns) == STRATEGIES
+    assert len(matrix) == 26
+    for exit_year in range(26):
+        np.testing.assert_allclose(
+            matrix.iloc[exit_year, :2], sell_in_year(params, exit_year, 0.188, 0.25), rtol=1e-9,
+        )
+    # The sell strategies sell today whatever the row
+    np.testing.assert_allclose(matrix.iloc[:, 2:], np.tile(matrix.iloc[0, :2], (26, 1)))
+
+
+def test_untaxed_sell_columns_match_run_scenario(base):
+    matrix = exit_matrix(base, cap_gains_tax=0.0, recapture_rate=0.0)
+    final = run_scenario(base).iloc[-1]
+    for strategy in ("Sell As-Is", "Refurb & Sell"):
+        np.testing.assert_allclose(matrix[strategy], final[strategy], rtol=1e-12)
+
+
+def test_optimal_exits_pick_the_best_year(base):
+    matrix = exit_matrix(replace(base, appreciation=0.0, market_return=0.1), cap_gains_tax=0.188)
+    best = optimal_exits(matrix)
+    assert list(best["Strategy"]) == STRATEGIES
+    np.testing.assert_array_equal(best["Best Exit Year"], matrix.to_numpy().argmax(axis=0))
+    np.testing.assert_allclose(best["Final Wealth"], matrix.to_numpy().max(axis=0))
+    # With flat prices and a strong market, holding the rentals is not worth it all the way
+    assert (best["Best Exit Year"][:2] < 25).all()
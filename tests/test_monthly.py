@@ -0,0 +1,97 @@
+"""Closed-form amortization and the monthly engine against month-by-month loops."""
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from april_sound import STRATEGIES, run_scenario
+from april_sound.monthly import PMI_LTV_LIMIT, amortize, run_monthly
+
+
+def loop_amortize(loan, annual_rate, term_years, months):
+    """Level payment, interest and balance one month at a time."""
+    r, n = annual_rate / 12, int(term_years * 12)
+    level = loan / n if r == 0 else loan * r / (1 - (1 + r) ** -n)
+    payment, interest, balance = [0.0], [0.0], [loan]
+    for m in range(1, months + 1):
+        owed = balance[-1]
+        paid = level if m <= n else 0.0
+        payment.append(paid)
+        interest.append(owed * r)
+        balance.append(max(owed * (1 + r) - paid, 0.0))
+    return np.array(payment), np.array(interest), np.array(balance)
+
+
+@pytest.mark.parametrize("loan, rate, term", [(250000, 0.065, 30), (180000, 0.0, 15), (300000, 0.04, 10)])
+def test_amortize_matches_loop(loan, rate, term):
+    for actual, expected in zip(amortize(loan, rate, term, 300), loop_amortize(loan, rate, term, 300)):
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-6)
+
+
+def test_amortize_known_payment():
+    payment, interest, balance = amortize(250000, 0.065, 30, 360)
+    assert payment[1] == pytest.approx(1580.17, abs=0.005)
+    assert interest[1] == pytest.approx(250000 * 0.065 / 12)
+    assert balance[-1] == pytest.approx(0, abs=1e-6)
+
+
+def test_zero_rate_repays_straight_line():
+    payment, interest, balance = amortize(120000, 0.0, 10, 120)
+    np.testing.assert_allclose(payment[1:], 1000.0)
+    np.testing.assert_allclose(interest, 0.0)
+    np.testing.assert_allclose(balance, 120000 - 1000.0 * np.arange(121), atol=1e-9)
+
+
+def test_term_shorter_than_horizon_stops_payments():
+    payment, interest, balance = amortize(100000, 0.05, 10, 300)
+    assert (payment[1:121] > 0).all()
+    np.testing.assert_array_equal(payment[121:], 0.0)
+    np.testing.assert_allclose(balance[120:], 0.0, atol=1e-6)
+    np.testing.assert_allclose(interest[121:], 0.0, atol=1e-9)
+
+
+def test_pmi_stops_at_ltv_limit(base):
+    params = replace(base, market_return=0.0)
+    loan = dict(loan_balance=340000, mortgage_rate=0.065, term_years=30)
+    with_pmi = run_monthly(**params.engine_inputs(), **loan, pmi_rate=0.01)
+    without = run_monthly(**params.engine_inputs(), **loan, pmi_rate=0.0)
+    # PMI is not deductible, so with no market growth it is the monthly drop in cash
+    pmi = -np.diff(with_pmi["cash"][:, 0] - without["cash"][:, 0])
+
+    _, _, balance = amortize(340000, 0.065, 30, 300)
+    opening = balance[:-1]
+    expected = np.where(opening > PMI_LTV_LIMIT * params.val_asis, opening * 0.01 / 12, 0.0)
+    np.testing.assert_allclose(pmi, expected, atol=1e-6)
+    last = np.flatnonzero(expected)[-1]
+    assert 0 < last < 299 and opening[last + 1] <= PMI_LTV_LIMIT * params.val_asis
+    # The refurbished value is high enough that the loan never needs PMI there
+    np.testing.assert_allclose(with_pmi["cash"][:, 1], without["cash"][:, 1])
+
+
+def test_batched_inputs_match_scalar_calls(base):
+    loans = np.array([0.0, 200000, 300000])[:, None]
+    rates = np.array([0.0, 0.05])
+    inputs = base.engine_inputs()
+    batch = run_monthly(**inputs, loan_balance=loans, mortgage_rate=rates, term_years=20, pmi_rate=0.005)
+    assert batch["wealth"].shape == (3, 2, 301, len(STRATEGIES))
+    for i, loan in enumerate(loans[:, 0]):
+        for j, rate in enumerate(rates):
+            single = run_monthly(**inputs, loan_balance=loan, mortgage_rate=rate, term_years=20, pmi_rate=0.005)
+            for name, arr in single.items():
+                np.testing.assert_allclose(batch[name][i, j], arr, rtol=1e-12, err_msg=name)
+
+
+def test_no_loan_matches_annual_engine_at_year_ends(base):
+    annual = run_scenario(base)
+    monthly = run_monthly(**base.engine_inputs())
+    year_ends = monthly["wealth"][::12]
+    # Values and the sell strategies compound to the same year-end figures
+    np.testing.assert_allclose(monthly["values"][::12, 0], annual["Property Value (As-Is)"], rtol=1e-12)
+    np.testing.assert_allclose(year_ends[:, 2:], annual[STRATEGIES[2:]], rtol=1e-12)
+    np.testing.assert_allclose(monthly["balance"], 0.0)
+
+    # Without growth or vacancy the monthly timing drops out and the rent strategies agree too
+    flat = replace(base, market_return=0.0, appreciation=0.0, vacancy_rate=0.0)
+    np.testing.assert_allclose(
+        run_monthly(**flat.engine_inputs())["wealth"][::12], run_scenario(flat)[STRATEGIES], rtol=1e-12,
+    )
@@ -0,0 +1,35 @@
+"""Coarse-to-fine refurb optimizer against a brute-force grid."""
+import numpy as np
+import pytest
+
+from april_sound.engine import STRATEGIES
+from april_sound.optimizer import UpliftCurve, candidate_grid, optimize_refurb
+
+
+def test_uplift_curve_anchored_at_base_budget(base):
+    curve = UpliftCurve.from_params(base, doubling_gain=0.4)
+    assert curve.at(0) == pytest.approx((base.val_asis, base.rent_asis))
+    assert curve.at(base.refurb) == pytest.approx((base.val_ref, base.rent_ref))
+    # Doubling the budget adds doubling_gain of the base uplift
+    val_ref, _ = curve.at(2 * base.refurb)
+    assert val_ref - base.val_ref == pytest.approx(0.4 * (base.val_ref - base.val_asis))
+
+
+@pytest.mark.parametrize("objective", ["wealth", "irr"])
+@pytest.mark.parametrize("doubling_gain", [0.3, 0.7])
+def test_optimizer_matches_brute_force(base, objective, doubling_gain):
+    curve = UpliftCurve.from_params(base, doubling_gain=doubling_gain)
+    best = optimize_refurb(base, curve, cap_gains_tax=0.15, objective=objective, max_spend=150000)
+
+    spends = np.linspace(0, 150000, 3001)
+    grid = candidate_grid(base, curve, spends, 0.15, objective)
+    i, exit_year, strategy = np.unravel_index(np.nanargmax(grid), grid.shape)
+    assert best["value"] >= grid[i, exit_year, strategy] - 1e-9 * abs(grid[i, exit_year, strategy])
+    assert best["value"] == pytest.approx(grid[i, exit_year, strategy], rel=1e-4)
+    assert best["strategy"] == STRATEGIES[strategy]
+    if best["strategy"] in ("Refurb & Rent", "Refurb & Sell"):
+        assert best["spend"] == pytest.approx(spends[i], abs=150)
+
+    # The reported optimum reproduces its own objective value
+    check = candidate_grid(base, curve, [best["spend"]], 0.15, objective)[0, best["exit_year"], STRATEGIES.index(best["strategy"])]
+    assert check == pytest.approx(best["value"])
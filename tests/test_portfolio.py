@@ -0,0 +1,30 @@
+"""Portfolio CSV validation and ranking."""
+import io
+
+import numpy as np
+import pytest
+
+from april_sound.portfolio import evaluate_portfolio, load_properties, property_ranking
+
+HEADER = "property,val_asis,val_ref,rent_asis,rent_ref,refurb,building_value,rent_asis_low\n"
+
+
+def test_blank_required_cell_names_property_and_column():
+    csv = HEADER + "A,300000,400000,2000,2500,50000,200000,\nB,300000,,2000,2500,50000,200000,1800\n"
+    with pytest.raises(ValueError, match="'val_ref' for property 'B'"):
+        load_properties(io.StringIO(csv))
+
+
+def test_blank_range_cell_falls_back_to_base():
+    properties = load_properties(io.StringIO(HEADER + "A,300000,400000,2000,2500,50000,200000,\n"))
+    assert properties.loc[0, "rent_asis_low"] == 2000
+    assert properties.loc[0, "val_asis_high"] == 300000
+
+
+def test_ranking_reports_best_of_each_scenario(base):
+    csv = HEADER + "A,300000,400000,2000,2500,50000,200000,1200\nB,200000,260000,1900,2300,40000,150000,1900\n"
+    properties = load_properties(io.StringIO(csv))
+    wealth = evaluate_portfolio(base, properties)
+    ranking = property_ranking(properties, wealth).set_index("Property").loc[properties["property"]]
+    np.testing.assert_allclose(ranking["Best (Low)"], wealth[0, :, -1, :].max(axis=-1))
+    np.testing.assert_allclose(ranking["Best (High)"], wealth[2, :, -1, :].max(axis=-1))
@@ -0,0 +1,40 @@
+"""Quasi-random range sampling and the PERT / triangular quantiles."""
+import warnings
+
+import numpy as np
+import pytest
+
+from april_sound.sampling import latin_hypercube, pert_quantile, sample_ranges, sobol, triangular_quantile
+
+U = (np.arange(1000) + 0.5) / 1000
+
+
+@pytest.mark.parametrize("quantile", [pert_quantile, triangular_quantile])
+@pytest.mark.parametrize("low, mode, high", [(100, 100, 200), (100, 200, 200), (100, 130, 200)])
+def test_quantiles_finite_for_mode_at_bounds(quantile, low, mode, high):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        values = quantile(U, low, mode, high)
+    assert np.isfinite(values).all()
+    assert (np.diff(values) >= 0).all()
+    assert values.min() >= low and values.max() <= high
+
+
+@pytest.mark.parametrize("low, mode, high", [(100, 100, 200), (100, 200, 200), (100, 130, 200)])
+def test_pert_mean(low, mode, high):
+    assert pert_quantile(U, low, mode, high).mean() == pytest.approx((low + 4 * mode + high) / 6, rel=1e-3)
+
+
+def test_sample_ranges_with_mode_at_bounds():
+    # The comp prefill can give low == base or base == high
+    samples = sample_ranges({"val_asis": (365000, 365000, 375000), "rent_asis": (2600, 3100, 3100)}, n=1024)
+    for values in samples.values():
+        assert np.isfinite(values).all()
+
+
+@pytest.mark.parametrize("points", [sobol(1024, 5, seed=3), latin_hypercube(1024, 5, seed=3)])
+def test_unit_points_fill_each_stratum(points):
+    assert ((points > 0) & (points < 1)).all()
+    # 1024 points put exactly 64 in each of 16 equal strata per dimension
+    counts = np.apply_along_axis(np.bincount, 0, (points * 16).astype(int), minlength=16)
+    assert (counts == 64).all()
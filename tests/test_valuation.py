@@ -0,0 +1,49 @@
+"""k-d tree neighbors and weighted quantiles of the comp valuation."""
+import numpy as np
+import pytest
+
+from april_sound.comps import CompStore
+from april_sound.valuation import CompValuer, KDTree, weighted_quantiles
+
+
+@pytest.mark.parametrize("n, k, leaf_size", [(1, 3, 16), (40, 8, 4), (5000, 10, 16)])
+def test_kdtree_matches_brute_force(n, k, leaf_size):
+    rng = np.random.default_rng(n)
+    points = rng.normal(size=(n, 6))
+    # Grades are integers, so ties along a dimension are common
+    points[:, 3] = rng.integers(0, 3, n)
+    tree = KDTree(points, leaf_size=leaf_size)
+    for query in rng.normal(size=(25, 6)):
+        distances, rows = tree.query(query, k)
+        expected = np.sort(np.sqrt(((points - query) ** 2).sum(axis=1)))[:k]
+        np.testing.assert_allclose(distances, expected)
+        np.testing.assert_allclose(np.sqrt(((points[rows] - query) ** 2).sum(axis=1)), distances)
+        assert len(set(rows.tolist())) == len(rows)
+
+
+def test_weighted_quantiles_equal_weights_are_hazen():
+    np.testing.assert_allclose(weighted_quantiles([4, 1, 3, 2], np.ones(4), (0.25, 0.5, 0.75)), [1.5, 2.5, 3.5])
+    np.testing.assert_allclose(
+        weighted_quantiles([1, 2, 3, 4], np.ones(4), (0.25, 0.5, 0.75)),
+        np.quantile([1, 2, 3, 4], (0.25, 0.5, 0.75), method="hazen"),
+    )
+
+
+def test_weighted_quantiles_follow_weights():
+    values = [100.0, 200.0, 300.0]
+    assert weighted_quantiles(values, [1, 1000, 1], (0.5,))[0] == pytest.approx(200.0)
+    # Moving weight toward the high value raises every quantile
+    light, heavy = weighted_quantiles(values, [1, 1, 1]), weighted_quantiles(values, [1, 1, 5])
+    assert (heavy >= light).all() and heavy[1] > light[1]
+
+
+def test_estimates_are_ordered_and_use_nearest_comps():
+    valuer = CompValuer(CompStore.from_file())
+    low, base, high = valuer.estimate("sale", 1824, 3, 2.5, "Renovated", "Open Water")
+    assert low <= base <= high
+    # The nearest renovated open water sales are the two identical units
+    assert set(valuer.neighbors("sale", 1824, 3, 2.5, "Renovated", "Open Water")["address"][:2]) == {
+        "143 April Point Dr S", "137 April Point Dr S",
+    }
+    with pytest.raises(ValueError, match="Unknown condition"):
+        valuer.estimate("sale", 1824, 3, 2.5, "Mint", "Open Water")